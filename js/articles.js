@@ -3,23 +3,41 @@
 // Articles database - loaded from JSON file
 let articlesData = [];
 
+// Shard manifest written by html_generator.generate_article_shards()
+let shardManifest = null;
+
+/**
+ * Get the path of the json folder relative to the current page
+ * @returns {string} Path ending with a slash
+ */
+function getJsonBasePath() {
+    const currentPath = window.location.pathname;
+    const isInCategory = currentPath.includes('/category/');
+    const isInArticle = currentPath.includes('/articles/');
+    return (isInCategory || isInArticle) ? '../json/' : 'json/';
+}
+
+/**
+ * Fetch and parse a JSON file
+ * @param {string} path - File path
+ * @param {Object} options - fetch() options
+ * @returns {Promise<*>} Parsed JSON
+ */
+async function fetchJson(path, options = {}) {
+    const response = await fetch(path, options);
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    return response.json();
+}
+
 /**
  * Load articles data from JSON file
  * @returns {Promise<Array>} Promise that resolves to articles array
  */
 async function loadArticlesData() {
     try {
-        // Determine the correct path based on current location
-        const currentPath = window.location.pathname;
-        const isInCategory = currentPath.includes('/category/');
-        const isInArticle = currentPath.includes('/articles/');
-        const jsonPath = (isInCategory || isInArticle) ? '../json/articles.json' : 'json/articles.json';
-        
-        const response = await fetch(jsonPath);
-        if (!response.ok) {
-            throw new Error(`HTTP error! status: ${response.status}`);
-        }
-        const data = await response.json();
+        const data = await fetchJson(`${getJsonBasePath()}articles.json`);
         articlesData = data;
         return data;
     } catch (error) {
@@ -30,6 +48,44 @@ async function loadArticlesData() {
     }
 }
 
+/**
+ * Load the shard manifest (small, revalidated on every load since it changes with each publish)
+ * @returns {Promise<Object|null>} Manifest, or null if shards are unavailable
+ */
+async function loadShardManifest() {
+    try {
+        shardManifest = await fetchJson(`${getJsonBasePath()}shards/manifest.json`, { cache: 'no-cache' });
+    } catch (error) {
+        console.warn('Article shards unavailable, falling back to articles.json:', error);
+        shardManifest = null;
+    }
+    return shardManifest;
+}
+
+/**
+ * Load one content-hashed shard listed in the manifest
+ * @param {string} filename - Shard filename from the manifest
+ * @returns {Promise<*>} Shard contents
+ */
+async function loadShard(filename) {
+    return fetchJson(`${getJsonBasePath()}shards/${filename}`);
+}
+
+/**
+ * Bucket holding an article's related articles (FNV-1a, mirrored by related_bucket() in html_generator.py)
+ * @param {string} articleId - Article ID
+ * @param {number} bucketCount - Number of related shards
+ * @returns {number} Bucket index
+ */
+function relatedBucket(articleId, bucketCount) {
+    let hash = 0x811c9dc5;
+    for (const byte of new TextEncoder().encode(articleId)) {
+        hash ^= byte;
+        hash = Math.imul(hash, 0x01000193) >>> 0;
+    }
+    return hash % bucketCount;
+}
+
 // Categories configuration
 const categoriesConfig = {
     'technology': { name: 'Technology', slug: 'technology' },
@@ -149,9 +205,28 @@ function initializeArticlePage(articleId) {
  * Load related articles for the current article
  * @param {Object} currentArticle - Current article object
  */
-function loadRelatedArticles(currentArticle) {
+async function loadRelatedArticles(currentArticle) {
     const relatedGrid = document.getElementById('related-articles-grid');
-    if (!relatedGrid) return;
+    // Article pages ship with their related articles already rendered at build time
+    if (!relatedGrid || relatedGrid.dataset.prerendered) return;
+    
+    // Precomputed related articles from the article's related shard
+    if (shardManifest && shardManifest.related.length) {
+        try {
+            const bucket = relatedBucket(currentArticle.id, shardManifest.related.length);
+            const shard = await loadShard(shardManifest.related[bucket]);
+            if (shard[currentArticle.id]) {
+                relatedGrid.innerHTML = shard[currentArticle.id].map(article => createArticleCard(article, '../')).join('');
+                return;
+            }
+        } catch (error) {
+            console.error('Error loading related articles shard:', error);
+        }
+    }
+    
+    if (!articlesData.length) {
+        await loadArticlesData();
+    }
     
     // Get articles from the same category, excluding current article
     const relatedArticles = articlesData
@@ -192,15 +267,64 @@ function getLatestArticles(limit = 9) {
 }
 
 /**
- * Get featured articles sorted by date
+ * Get featured articles in the order of json/featured.json
  * @param {number} limit - Number of articles to return
- * @returns {Array} Array of featured articles
+ * @returns {Promise<Array>} Array of featured articles
  */
-function getFeaturedArticles(limit = 9) {
-    return articlesData
-        .filter(article => article.featured === true)
-        .sort((a, b) => parseFormattedDate(b.date) - parseFormattedDate(a.date))
-        .slice(0, limit);
+async function getFeaturedArticles(limit = 9) {
+    try {
+        const featured = await fetchJson(`${getJsonBasePath()}featured.json`, { cache: 'no-cache' });
+        return featured.ids
+            .map(id => getArticleById(id))
+            .filter(article => article)
+            .slice(0, limit);
+    } catch (error) {
+        console.error('Error loading featured articles:', error);
+        return [];
+    }
+}
+
+// sizes of card images, matching the grid columns (CARD_IMAGE_SIZES in python/html_generator.py)
+const cardImageSizes = '(max-width: 768px) 100vw, (max-width: 992px) 50vw, 400px';
+
+/**
+ * Build a srcset from an article's image variants ({id}.webp at full width, {id}-640w.webp below it)
+ * @param {Object} article - Article object with image_widths
+ * @param {string} imagesPath - Path of the images folder
+ * @param {string} ext - Image format extension
+ * @returns {string} srcset value
+ */
+function buildImageSrcset(article, imagesPath, ext) {
+    const stem = article.image.replace(/\.[^.]+$/, '');
+    return article.image_widths
+        .map(width => width === article.image_width
+            ? `${imagesPath}${stem}.${ext} ${width}w`
+            : `${imagesPath}${stem}-${width}w.${ext} ${width}w`)
+        .join(', ');
+}
+
+/**
+ * Create card image HTML, with srcset and reserved dimensions when the article has image variants
+ * @param {Object} article - Article object
+ * @param {string} imagesPath - Path of the images folder
+ * @param {string} alt - Alt text
+ * @returns {string} HTML string for the card image
+ */
+function createCardImage(article, imagesPath, alt) {
+    const src = `${imagesPath}${article.image}`;
+    if (!article.image_widths || !article.image_widths.length) {
+        return `<img src="${src}" alt="${alt}" loading="lazy">`;
+    }
+    
+    const img = `<img src="${src}" srcset="${buildImageSrcset(article, imagesPath, 'webp')}" sizes="${cardImageSizes}" ` +
+        `width="${article.image_width}" height="${article.image_height}" alt="${alt}" loading="lazy">`;
+    if (!(article.image_formats || []).includes('avif')) {
+        return img;
+    }
+    return `<picture>
+                    <source type="image/avif" srcset="${buildImageSrcset(article, imagesPath, 'avif')}" sizes="${cardImageSizes}">
+                    ${img}
+                </picture>`;
 }
 
 /**
@@ -210,7 +334,7 @@ function getFeaturedArticles(limit = 9) {
  * @returns {string} HTML string for article card
  */
 function createArticleCard(article, basePath = '') {
-    const imagePath = basePath ? `${basePath}images/${article.image}` : `images/${article.image}`;
+    const imagesPath = `${basePath}images/`;
     const articleUrl = basePath ? `${basePath}${article.url}` : article.url;
     
     // Truncate title to 60 characters and excerpt to 150 characters
@@ -220,7 +344,7 @@ function createArticleCard(article, basePath = '') {
     return `
         <article class="article-card">
             <div class="article-card__image">
-                <img src="${imagePath}" alt="${truncatedTitle}" loading="lazy">
+                ${createCardImage(article, imagesPath, truncatedTitle)}
             </div>
             <div class="article-card__content">
                 <div class="article-card__meta">
@@ -274,13 +398,41 @@ function createComingSoonCard(category, title, excerpt) {
 
 // Global variables for pagination
 let currentCategoryArticles = [];
+let currentCategorySlug = null;
+let categoryArticleCount = 0;
+let categoryShardsLoaded = 0;
 let displayedArticlesCount = 0;
 const articlesPerPage = 9; // 3 rows × 3 columns
 
+/**
+ * Make sure at least count category articles are loaded, fetching further category shards as needed
+ * @param {number} count - Number of articles needed
+ */
+async function ensureCategoryArticles(count) {
+    const shardInfo = shardManifest && shardManifest.categories[currentCategorySlug];
+    if (!shardInfo) return;
+    
+    try {
+        while (currentCategoryArticles.length < Math.min(count, categoryArticleCount) &&
+               categoryShardsLoaded < shardInfo.pages.length) {
+            const page = await loadShard(shardInfo.pages[categoryShardsLoaded]);
+            currentCategoryArticles.push(...page);
+            categoryShardsLoaded++;
+        }
+    } catch (error) {
+        // A shard from an outdated manifest may be gone; use the full list instead
+        console.error('Error loading category shard, falling back to articles.json:', error);
+        shardManifest = null;
+        await loadArticlesData();
+        currentCategoryArticles = getArticlesByCategory(categoriesConfig[currentCategorySlug].name);
+        categoryArticleCount = currentCategoryArticles.length;
+    }
+}
+
 /**
  * Initialize category page with 1x3 structure and load more functionality
  */
-function initializeCategoryPage() {
+async function initializeCategoryPage() {
     // Get current category from URL
     const currentPath = window.location.pathname;
     const categoryMatch = currentPath.match(/\/category\/([^.]+)\.html/);
@@ -295,14 +447,24 @@ function initializeCategoryPage() {
     const categoryName = categoryConfig.name;
     const articlesGrid = document.querySelector('.articles-grid');
     
-    if (!articlesGrid) return;
-    
-    // Get articles for this category
-    currentCategoryArticles = getArticlesByCategory(categoryName);
-    const articleCount = currentCategoryArticles.length;
+    // Pre-rendered pages already list their articles and link to the next page
+    if (!articlesGrid || articlesGrid.dataset.prerendered) return;
     
     // Reset displayed count
     displayedArticlesCount = 0;
+    currentCategorySlug = categorySlug;
+    
+    // Get articles for this category, from its shards when available
+    if (shardManifest) {
+        const shardInfo = shardManifest.categories[categorySlug];
+        currentCategoryArticles = [];
+        categoryArticleCount = shardInfo ? shardInfo.count : 0;
+        categoryShardsLoaded = 0;
+        await ensureCategoryArticles(articlesPerPage);
+    } else {
+        currentCategoryArticles = getArticlesByCategory(categoryName);
+        categoryArticleCount = currentCategoryArticles.length;
+    }
     
     // Clear existing content
     articlesGrid.innerHTML = '';
@@ -321,7 +483,7 @@ function initializeCategoryPage() {
  * Load more articles for category page
  */
 function loadMoreCategoryArticles(categoryName, articlesGrid) {
-    const articleCount = currentCategoryArticles.length;
+    const articleCount = categoryArticleCount;
     let cardsHTML = '';
     let articlesToShow = Math.min(articlesPerPage, articleCount - displayedArticlesCount);
     
@@ -394,7 +556,7 @@ function loadMoreCategoryArticles(categoryName, articlesGrid) {
  * Update load more button visibility and functionality
  */
 function updateLoadMoreButton(categoryName, articlesGrid) {
-    const articleCount = currentCategoryArticles.length;
+    const articleCount = categoryArticleCount;
     const hasMoreArticles = displayedArticlesCount < articleCount;
     
     // Remove existing load more container
@@ -415,17 +577,16 @@ function updateLoadMoreButton(categoryName, articlesGrid) {
             Load More Articles
         `;
         
-        loadMoreBtn.addEventListener('click', function() {
+        loadMoreBtn.addEventListener('click', async function() {
             // Add loading state
             loadMoreBtn.classList.add('loading');
             loadMoreBtn.disabled = true;
             
-            // Simulate loading delay for better UX
-            setTimeout(() => {
-                loadMoreCategoryArticles(categoryName, articlesGrid);
-                loadMoreBtn.classList.remove('loading');
-                loadMoreBtn.disabled = false;
-            }, 500);
+            // Fetch the next category shard(s) before rendering
+            await ensureCategoryArticles(displayedArticlesCount + articlesPerPage);
+            loadMoreCategoryArticles(categoryName, articlesGrid);
+            loadMoreBtn.classList.remove('loading');
+            loadMoreBtn.disabled = false;
         });
         
         loadMoreContainer.appendChild(loadMoreBtn);
@@ -440,10 +601,10 @@ function updateLoadMoreButton(categoryName, articlesGrid) {
 /**
  * Initialize index page with featured articles
  */
-function initializeIndexPage() {
+async function initializeIndexPage() {
     const articlesGrid = document.querySelector('.articles-grid');
     
-    if (!articlesGrid) return;
+    if (!articlesGrid || articlesGrid.dataset.prerendered) return;
     
     // Check if we're on the index page
     const currentPath = window.location.pathname;
@@ -451,7 +612,21 @@ function initializeIndexPage() {
     
     if (!isIndexPage) return;
     
-    const featuredArticles = getFeaturedArticles(9);
+    // The featured shard holds exactly what getFeaturedArticles(9) would return
+    let featuredArticles = null;
+    if (shardManifest) {
+        try {
+            featuredArticles = await loadShard(shardManifest.featured);
+        } catch (error) {
+            console.error('Error loading featured shard, falling back to articles.json:', error);
+        }
+    }
+    if (!featuredArticles) {
+        if (!articlesData.length) {
+            await loadArticlesData();
+        }
+        featuredArticles = await getFeaturedArticles(9);
+    }
     const totalArticles = featuredArticles.length;
     
     let cardsHTML = '';
@@ -510,7 +685,7 @@ function updateSearchFunctionality() {
     
     if (!searchInput || !searchResults) return;
     
-    searchInput.addEventListener('input', (e) => {
+    searchInput.addEventListener('input', async (e) => {
         const query = e.target.value.toLowerCase().trim();
         
         if (query.length < 2) {
@@ -519,6 +694,11 @@ function updateSearchFunctionality() {
             return;
         }
         
+        // Search needs every article, so the full list is only fetched once someone searches
+        if (!articlesData.length) {
+            await loadArticlesData();
+        }
+        
         const filteredArticles = articlesData.filter(article => 
             article.title.toLowerCase().includes(query) ||
             article.excerpt.toLowerCase().includes(query) ||
@@ -554,13 +734,20 @@ function updateSearchFunctionality() {
  * Initialize articles functionality based on current page
  */
 async function initializeArticles() {
-    // Load articles data first
-    await loadArticlesData();
+    updateSearchFunctionality();
+    
+    // Pages without article listings don't need any article data
+    if (!document.querySelector('.articles-grid:not([data-prerendered])')) return;
+    
+    // Load the shard manifest first; articles.json is only the fallback
+    const manifest = await loadShardManifest();
+    if (!manifest) {
+        await loadArticlesData();
+    }
     
     // Initialize based on current page
-    initializeCategoryPage();
-    initializeIndexPage();
-    updateSearchFunctionality();
+    await initializeCategoryPage();
+    await initializeIndexPage();
 }
 
 // Initialize when DOM is loaded
@@ -578,6 +765,9 @@ if (typeof module !== 'undefined' && module.exports) {
     module.exports = {
         articlesData,
         loadArticlesData,
+        loadShardManifest,
+        loadShard,
+        relatedBucket,
         categoriesConfig,
         truncateText,
         getArticlesByCategory,
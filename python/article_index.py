@@ -0,0 +1,189 @@
+"""
+Article keyword/id index
+Keeps the ids, lowercase keywords, titles and dates of json/articles.json in a small SQLite table so
+"is this keyword already covered?" doesn't need the whole article list parsed
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+# Get the directory where this script is located
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Get the project root directory (parent of python directory)
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+ARTICLES_PATH = os.path.join(PROJECT_ROOT, 'json', 'articles.json')
+# Kept outside temp/ so html_generator.clear_temp_folder() doesn't wipe it
+DEFAULT_INDEX_PATH = os.path.join(PROJECT_ROOT, '.cache', 'article_index.sqlite3')
+# Bump when the table layout changes so existing index files get rebuilt
+INDEX_VERSION = "3"
+
+def file_signature(path):
+    """Return a "size:mtime_ns" string for a file, or None if it doesn't exist"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+def file_digest(path):
+    """Return the SHA-256 of a file's bytes, or None if it doesn't exist"""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+class ArticleIndex:
+    """
+    Persistent id/keyword/title/date index of articles.json.
+
+    The index remembers which version of articles.json it describes (size and
+    mtime, then content hash) and rebuilds itself only when the file changed
+    behind its back, e.g. after a git pull.
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_PATH, articles_path=ARTICLES_PATH):
+        self.path = path
+        self.articles_path = articles_path
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        if self._meta('version') != INDEX_VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS articles")
+            self.conn.execute("DELETE FROM meta")
+            self._set_meta('version', INDEX_VERSION)
+        self.conn.executescript(
+            """CREATE TABLE IF NOT EXISTS articles (
+                id TEXT PRIMARY KEY,
+                keyword TEXT,
+                title TEXT,
+                date TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_articles_keyword ON articles (keyword);"""
+        )
+        self.conn.commit()
+        self.sync()
+
+    def _meta(self, key):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def _record_source(self, signature, digest):
+        self._set_meta('signature', signature)
+        self._set_meta('digest', digest)
+
+    def sync(self):
+        """Rebuild the index if articles.json no longer matches the version it was built from"""
+        with self.lock:
+            signature = file_signature(self.articles_path)
+            if signature is not None and signature == self._meta('signature'):
+                return
+
+            # A fresh checkout changes the mtime but not the content
+            digest = file_digest(self.articles_path)
+            if digest is not None and digest == self._meta('digest'):
+                self._record_source(signature, digest)
+                self.conn.commit()
+                return
+
+            self._rebuild(signature, digest)
+
+    def _row(self, article):
+        return (article.get('id'), (article.get('keyword') or '').lower() or None, article.get('title'), article.get('date'))
+
+    def _rebuild(self, signature, digest):
+        articles = []
+        if digest is not None:
+            with open(self.articles_path, 'r', encoding='utf-8') as f:
+                articles = json.load(f)
+
+        self.conn.execute("DELETE FROM articles")
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO articles (id, keyword, title, date) VALUES (?, ?, ?, ?)",
+            [self._row(article) for article in articles if article.get('id')]
+        )
+        self._record_source(signature, digest)
+        self.conn.commit()
+        print(f"Rebuilt article index from articles.json ({len(articles)} articles)")
+
+    def has_keyword(self, keyword):
+        """True if an article already covers this keyword (case-insensitive)"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT 1 FROM articles WHERE keyword = ? LIMIT 1", (keyword.lower(),)
+            ).fetchone()
+        return row is not None
+
+    def has_id(self, article_id):
+        """True if an article with this id is already published"""
+        with self.lock:
+            row = self.conn.execute("SELECT 1 FROM articles WHERE id = ?", (article_id,)).fetchone()
+        return row is not None
+
+    def keywords_and_titles(self):
+        """Return (id, keyword, title, date) for every indexed article"""
+        with self.lock:
+            return self.conn.execute("SELECT id, keyword, title, date FROM articles").fetchall()
+
+    def __contains__(self, keyword):
+        # Lets the index stand in for the old lowercase keyword set
+        return self.has_keyword(keyword)
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def add_articles(self, records):
+        """
+        Add newly published records, after articles.json has been rewritten with them.
+
+        Args:
+            records (list): Article records with id and keyword
+        """
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO articles (id, keyword, title, date) VALUES (?, ?, ?, ?)",
+                [self._row(record) for record in records]
+            )
+            self._record_source(file_signature(self.articles_path), file_digest(self.articles_path))
+            self.conn.commit()
+
+    def mark_synced(self):
+        """Accept the current articles.json after a rewrite that kept every id and keyword (e.g. image fields)"""
+        with self.lock:
+            self._record_source(file_signature(self.articles_path), file_digest(self.articles_path))
+            self.conn.commit()
+
+    def close(self):
+        """Close the underlying database"""
+        with self.lock:
+            self.conn.close()
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_article_index():
+    """
+    Return the process-wide article index, or None if it can't be opened.
+
+    The index path can be changed with ARTICLE_INDEX_PATH.
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            try:
+                _index = ArticleIndex(os.getenv('ARTICLE_INDEX_PATH', DEFAULT_INDEX_PATH))
+            except Exception as e:
+                # Callers fall back to reading articles.json directly
+                print(f"Warning: article index unavailable: {e}")
+                return None
+        return _index
@@ -0,0 +1,122 @@
+"""
+Article metadata store
+Reads and writes json/articles.json as one transaction: changes are made to the
+loaded list in memory and saved once, through a temp file that is fsynced and then
+renamed over the old file, so a crash never leaves a half-written articles.json
+"""
+
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+# Get the directory where this script is located
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Get the project root directory (parent of python directory)
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+ARTICLES_PATH = os.path.join(PROJECT_ROOT, 'json', 'articles.json')
+# Ordered ids of the home page's featured articles, kept out of the article records
+FEATURED_PATH = os.path.join(PROJECT_ROOT, 'json', 'featured.json')
+
+def compact_path(path):
+    """Path of the compact copy of a JSON file (articles.json -> articles.min.json)"""
+    root, ext = os.path.splitext(path)
+    return f"{root}.min{ext}"
+
+def compact_copy_enabled():
+    """Whether to also write the compact copy (ARTICLES_COMPACT_COPY=1)"""
+    return os.getenv('ARTICLES_COMPACT_COPY', '0') == '1'
+
+def write_text_atomic(path, text):
+    """
+    Replace a file with new text so readers see either the old or the new file.
+
+    The text goes to a temp file in the same directory, is fsynced, and is then
+    moved over the target with os.replace().
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    # Persist the rename itself (not supported on Windows)
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+def load_articles(path=ARTICLES_PATH):
+    """Load the article list, or an empty list if the file doesn't exist yet"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+def save_articles(articles, path=ARTICLES_PATH, compact=None):
+    """
+    Save the article list atomically.
+
+    Args:
+        articles (list): Article records
+        path (str): Pretty-printed file to write (indent=4, as before)
+        compact (bool): Also write a compact copy next to it (default: ARTICLES_COMPACT_COPY)
+
+    Returns:
+        bool: True if the pretty file changed
+    """
+    text = json.dumps(articles, indent=4, ensure_ascii=False)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            changed = f.read() != text
+    except FileNotFoundError:
+        changed = True
+    if changed:
+        write_text_atomic(path, text)
+
+    if compact if compact is not None else compact_copy_enabled():
+        write_text_atomic(compact_path(path), json.dumps(articles, separators=(',', ':'), ensure_ascii=False))
+    return changed
+
+@contextmanager
+def transaction(path=ARTICLES_PATH, compact=None):
+    """
+    Load the article list for an update and save it once when the block ends.
+
+    The list is yielded for in-place changes; nothing is written if the block
+    raises, and the file isn't touched when the content didn't change.
+    """
+    articles = load_articles(path)
+    yield articles
+    save_articles(articles, path, compact)
+
+def load_featured_ids(path=FEATURED_PATH):
+    """Load the ordered featured article ids, or an empty list if there is no manifest yet"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('ids', [])
+    except FileNotFoundError:
+        return []
+
+def save_featured_ids(ids, path=FEATURED_PATH):
+    """Save the ordered featured article ids atomically; returns True if they changed"""
+    if load_featured_ids(path) == ids:
+        return False
+    write_text_atomic(path, json.dumps({"ids": ids}, indent=4, ensure_ascii=False))
+    return True
@@ -0,0 +1,188 @@
+"""
+Stage checkpoints for resumable pipeline runs
+Each article run keeps a manifest (stage name, inputs hash, output paths, status) so a
+retried workflow resumes from the first incomplete stage instead of starting over
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime, timedelta
+
+# Get the directory where this script is located
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Get the project root directory (parent of python directory)
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+# Kept outside temp/ so html_generator.clear_temp_folder() doesn't wipe it
+RUNS_DIR = os.path.join(PROJECT_ROOT, '.cache', 'runs')
+
+# Unfinished runs are given up after this many workflow runs or this long, so a stage
+# that fails every time (e.g. a blocked image prompt) can't hold the pipeline forever
+MAX_ATTEMPTS = int(os.getenv('CHECKPOINT_MAX_ATTEMPTS', '3'))
+RUN_TTL_HOURS = float(os.getenv('CHECKPOINT_TTL_HOURS', '24'))
+
+def hash_inputs(*values):
+    """Hash stage inputs (strings, bytes or JSON-serializable values) into a short hex digest"""
+    digest = hashlib.sha256()
+    for value in values:
+        if isinstance(value, bytes):
+            digest.update(value)
+        elif isinstance(value, str):
+            digest.update(value.encode('utf-8'))
+        else:
+            digest.update(json.dumps(value, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()[:16]
+
+class RunCheckpoint:
+    """Checkpoint manifest for one article run, keyed by article id"""
+
+    def __init__(self, run_key, runs_dir=RUNS_DIR):
+        self.run_key = run_key
+        self.run_dir = os.path.join(runs_dir, run_key)
+        self.manifest_path = os.path.join(self.run_dir, 'manifest.json')
+        self.manifest = self._load()
+
+    def _load(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return self._new_manifest()
+        except json.JSONDecodeError:
+            print(f"Warning: ignoring corrupt checkpoint manifest {self.manifest_path}")
+            return self._new_manifest()
+
+    def _new_manifest(self):
+        # The run that creates the checkpoint is its first attempt
+        return {"run_key": self.run_key, "started_at": datetime.now().isoformat(), "attempts": 1, "stages": {}}
+
+    def _save(self):
+        os.makedirs(self.run_dir, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+
+    def path(self, filename):
+        """Path of an artifact stored alongside the manifest"""
+        os.makedirs(self.run_dir, exist_ok=True)
+        return os.path.join(self.run_dir, filename)
+
+    def is_complete(self, stage, inputs_hash):
+        """True if the stage finished with the same inputs and all its outputs still exist"""
+        entry = self.manifest["stages"].get(stage)
+        if not entry or entry.get("status") != "complete" or entry.get("inputs_hash") != inputs_hash:
+            return False
+        return all(os.path.exists(os.path.join(PROJECT_ROOT, path)) for path in entry.get("outputs", []))
+
+    def mark_complete(self, stage, inputs_hash, outputs=()):
+        """Record a finished stage and the files it produced (stored relative to the project root)"""
+        self.manifest["stages"][stage] = {
+            "status": "complete",
+            "inputs_hash": inputs_hash,
+            "outputs": [os.path.relpath(path, PROJECT_ROOT) for path in outputs],
+            "finished_at": datetime.now().isoformat()
+        }
+        self._save()
+
+    def mark_failed(self, stage, inputs_hash, error):
+        """Record a failed stage so the next run knows where to resume"""
+        self.manifest["stages"][stage] = {
+            "status": "failed",
+            "inputs_hash": inputs_hash,
+            "outputs": [],
+            "error": str(error),
+            "finished_at": datetime.now().isoformat()
+        }
+        self._save()
+
+    @property
+    def attempts(self):
+        """Number of workflow runs that have worked on this article so far"""
+        return self.manifest.get("attempts", 1)
+
+    def started_at(self):
+        """When the run was started (the manifest's mtime for checkpoints from before it was recorded)"""
+        started_at = self.manifest.get("started_at")
+        if started_at:
+            return datetime.fromisoformat(started_at)
+        return datetime.fromtimestamp(os.path.getmtime(self.manifest_path))
+
+    def record_attempt(self):
+        """Count another workflow run resuming this article"""
+        self.manifest["attempts"] = self.attempts + 1
+        self.manifest.setdefault("started_at", self.started_at().isoformat())
+        self._save()
+
+    def abandon_reason(self, max_attempts=MAX_ATTEMPTS, ttl_hours=RUN_TTL_HOURS, now=None):
+        """Why the run should no longer be resumed, or None if it still should be"""
+        if self.attempts >= max_attempts:
+            return f"{self.attempts} attempts"
+        age = (now or datetime.now()) - self.started_at()
+        if age > timedelta(hours=ttl_hours):
+            return f"started {age.total_seconds() / 3600:.0f}h ago"
+        return None
+
+    def last_error(self):
+        """Error of the last failed stage, if any"""
+        for stage, entry in self.manifest["stages"].items():
+            if entry.get("status") == "failed":
+                return f"{stage}: {entry.get('error')}"
+        return None
+
+    def write_json(self, filename, data):
+        """Store a JSON artifact in the run directory and return its path"""
+        path = self.path(filename)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        return path
+
+    def read_json(self, filename):
+        """Load a JSON artifact from the run directory"""
+        with open(self.path(filename), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def write_text(self, filename, text):
+        """Store a text artifact in the run directory and return its path"""
+        path = self.path(filename)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+    def read_text(self, filename):
+        """Load a text artifact from the run directory"""
+        with open(self.path(filename), 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def remove(self):
+        """Delete the run directory once the article has been published"""
+        shutil.rmtree(self.run_dir, ignore_errors=True)
+
+def find_incomplete_runs(runs_dir=RUNS_DIR, max_attempts=MAX_ATTEMPTS, ttl_hours=RUN_TTL_HOURS, now=None):
+    """
+    Return checkpoints of runs that were started but never published, oldest first.
+
+    Runs that already had max_attempts attempts or are older than ttl_hours are
+    deleted instead of being returned.
+    """
+    if not os.path.isdir(runs_dir):
+        return []
+
+    runs = []
+    for run_key in os.listdir(runs_dir):
+        if not os.path.isfile(os.path.join(runs_dir, run_key, 'manifest.json')):
+            continue
+        run = RunCheckpoint(run_key, runs_dir)
+        reason = run.abandon_reason(max_attempts, ttl_hours, now)
+        if reason:
+            error = run.last_error()
+            print(f"Giving up on unfinished article run {run_key} ({reason})" + (f", last error: {error}" if error else ""))
+            run.remove()
+            continue
+        runs.append(run)
+
+    runs.sort(key=lambda run: os.path.getmtime(run.manifest_path))
+    return runs
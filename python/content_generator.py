@@ -1,12 +1,12 @@
+import asyncio
 import json
 import os
 import re
 import sys
-import time
 from datetime import datetime
 from dotenv import load_dotenv
-from google import genai
 from google.genai import types
+from gemini_client import generate_text_async, get_async_client, run_coroutine
 
 # Load environment variables
 load_dotenv()
@@ -16,6 +16,19 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 # Get the project root directory (parent of python directory)
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 
+# Categories an article can be filed under
+ALLOWED_CATEGORIES = [
+    "Technology", "Lifestyle", "Business", "Innovation", 
+    "News", "Health", "Entertainment", "Finance", 
+    "Science", "Travel", "Food", "Sports"
+]
+
+# Limits enforced on generated articles
+MAX_TITLE_LENGTH = 60
+MAX_EXCERPT_LENGTH = 150
+KEYWORD_COUNT_TARGET = 9
+KEYWORD_COUNT_TOLERANCE = 4
+
 def fetch_trend_name():
     """
     Fetch the keyword key's value from temp/keyword_selection.json
@@ -35,7 +48,7 @@ def fetch_trend_name():
         print("Error: Invalid JSON format in keyword_selection.json")
         return ""
 
-def generate_article_title(keyword):
+async def generate_article_title_async(keyword):
     """
     Generate an SEO-friendly article title using Gemini API with Google Search capabilities
     
@@ -45,16 +58,12 @@ def generate_article_title(keyword):
     Returns:
         str: Generated SEO-friendly title containing the keyword
     """
-    # Get Gemini API key from environment
-    GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+    # Get the shared Gemini client
+    client = get_async_client()
     
-    if not GEMINI_API_KEY:
-        print("Error: GEMINI_API_KEY not found in environment variables")
+    if not client:
         return ""
     
-    # Configure the client
-    client = genai.Client(api_key=GEMINI_API_KEY)
-    
     # Define the grounding tool for real-time search
     grounding_tool = types.Tool(
         google_search=types.GoogleSearch()
@@ -85,18 +94,19 @@ def generate_article_title(keyword):
     
     try:
         # Make the request
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=prompt,
-            config=config,
-        )
-        
-        return response.text.strip()
+        return await generate_text_async(client, "gemini-2.5-flash", prompt, config)
     except Exception as e:
         print(f"Error generating title: {e}")
+        raise
+
+def generate_article_title(keyword):
+    """Synchronous wrapper around generate_article_title_async; exits on API errors"""
+    try:
+        return run_coroutine(generate_article_title_async(keyword))
+    except Exception:
         sys.exit(1)
 
-def categorize_article(keyword, title):
+async def categorize_article_async(keyword, title):
     """
     Categorize the generated article using Gemini API
     
@@ -107,16 +117,12 @@ def categorize_article(keyword, title):
     Returns:
         str: Selected category from the predefined list
     """
-    # Get Gemini API key from environment
-    GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+    # Get the shared Gemini client
+    client = get_async_client()
     
-    if not GEMINI_API_KEY:
-        print("Error: GEMINI_API_KEY not found in environment variables")
+    if not client:
         return "News"  # Default fallback
     
-    # Configure the client
-    client = genai.Client(api_key=GEMINI_API_KEY)
-    
     # Create a prompt for categorization
     prompt = f"""
     Based on the keyword "{keyword}" and title "{title}", categorize this article under EXACTLY ONE of these categories:
@@ -145,21 +151,10 @@ def categorize_article(keyword, title):
     
     try:
         # Make the request
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=prompt,
-        )
-        
-        category = response.text.strip()
+        category = await generate_text_async(client, "gemini-2.5-flash", prompt)
         
         # Validate the category is in our allowed list
-        allowed_categories = [
-            "Technology", "Lifestyle", "Business", "Innovation", 
-            "News", "Health", "Entertainment", "Finance", 
-            "Science", "Travel", "Food", "Sports"
-        ]
-        
-        if category in allowed_categories:
+        if category in ALLOWED_CATEGORIES:
             return category
         else:
             return "News"  # Default fallback
@@ -168,6 +163,10 @@ def categorize_article(keyword, title):
         print(f"Error categorizing article: {e}")
         return "News"  # Default fallback
 
+def categorize_article(keyword, title):
+    """Synchronous wrapper around categorize_article_async"""
+    return run_coroutine(categorize_article_async(keyword, title))
+
 def get_current_date():
     """
     Get current system date in the required format
@@ -182,7 +181,7 @@ def get_current_date():
         print(f"Error getting current date: {e}")
         return datetime.now().strftime("%d %B %Y")
 
-def generate_article_excerpt(keyword, title):
+async def generate_article_excerpt_async(keyword, title):
     """
     Generate an SEO-friendly article excerpt using Gemini API with Google Search capabilities
     
@@ -193,16 +192,12 @@ def generate_article_excerpt(keyword, title):
     Returns:
         str: Generated SEO-friendly excerpt containing the keyword
     """
-    # Get Gemini API key from environment
-    GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+    # Get the shared Gemini client
+    client = get_async_client()
     
-    if not GEMINI_API_KEY:
-        print("Error: GEMINI_API_KEY not found in environment variables")
+    if not client:
         return ""
     
-    # Configure the client
-    client = genai.Client(api_key=GEMINI_API_KEY)
-    
     # Define the grounding tool for real-time search
     grounding_tool = types.Tool(
         google_search=types.GoogleSearch()
@@ -240,18 +235,19 @@ def generate_article_excerpt(keyword, title):
     
     try:
         # Make the request
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=prompt,
-            config=config,
-        )
-        
-        return response.text.strip()
+        return await generate_text_async(client, "gemini-2.5-flash", prompt, config)
     except Exception as e:
         print(f"Error generating excerpt: {e}")
+        raise
+
+def generate_article_excerpt(keyword, title):
+    """Synchronous wrapper around generate_article_excerpt_async; exits on API errors"""
+    try:
+        return run_coroutine(generate_article_excerpt_async(keyword, title))
+    except Exception:
         sys.exit(1)
 
-def generate_article_content(keyword, title, excerpt):
+async def generate_article_content_async(keyword, title, excerpt):
     """
     Generate a complete SEO-optimized article using Gemini API with Google Search capabilities
     
@@ -263,16 +259,12 @@ def generate_article_content(keyword, title, excerpt):
     Returns:
         str: Generated production-ready article content with proper HTML formatting
     """
-    # Get Gemini API key from environment
-    GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+    # Get the shared Gemini client
+    client = get_async_client()
     
-    if not GEMINI_API_KEY:
-        print("Error: GEMINI_API_KEY not found in environment variables")
+    if not client:
         return ""
     
-    # Configure the client
-    client = genai.Client(api_key=GEMINI_API_KEY)
-    
     # Define the grounding tool for real-time search
     grounding_tool = types.Tool(
         google_search=types.GoogleSearch()
@@ -323,17 +315,217 @@ def generate_article_content(keyword, title, excerpt):
     
     try:
         # Make the request
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=prompt,
-            config=config,
-        )
-        
-        return response.text.strip()
+        return await generate_text_async(client, "gemini-2.5-flash", prompt, config)
     except Exception as e:
         print(f"Error generating article: {e}")
+        raise
+
+def generate_article_content(keyword, title, excerpt):
+    """Synchronous wrapper around generate_article_content_async; exits on API errors"""
+    try:
+        return run_coroutine(generate_article_content_async(keyword, title, excerpt))
+    except Exception:
         sys.exit(1)
 
+async def generate_structured_article_async(keyword):
+    """
+    Generate title, category, excerpt and body in a single grounded Gemini call
+    
+    Google Search grounding can't be combined with response_schema on gemini-2.5-flash,
+    so the JSON schema is spelled out in the prompt and the reply is parsed locally.
+    
+    Args:
+        keyword (str): The main keyword for the article
+        
+    Returns:
+        dict: Parsed fields (title, category, excerpt, content), or an empty dict on failure
+    """
+    # Get the shared Gemini client
+    client = get_async_client()
+    
+    if not client:
+        return {}
+    
+    # Define the grounding tool for real-time search
+    grounding_tool = types.Tool(
+        google_search=types.GoogleSearch()
+    )
+    
+    # Configure generation settings
+    config = types.GenerateContentConfig(
+        tools=[grounding_tool]
+    )
+    
+    categories = ", ".join(ALLOWED_CATEGORIES)
+    
+    # Create one prompt covering every article field
+    prompt = f"""
+    Search for the latest news about "{keyword}" in Indian context and write a complete article package.
+    
+    Respond with ONLY a JSON object (no code fences, no explanations) matching this schema:
+    {{
+        "title": string,
+        "category": string,
+        "excerpt": string,
+        "content": string
+    }}
+    
+    title requirements:
+    - ONE compelling, SEO-friendly title containing the exact keyword: "{keyword}"
+    - STRICT LIMIT: Maximum {MAX_TITLE_LENGTH} characters only
+    - Make it clickable, Google Discover and AdSense friendly, avoid clickbait
+    
+    category requirements:
+    - EXACTLY ONE of: {categories}
+    - If unsure, use "News"
+    
+    excerpt requirements:
+    - Must contain the exact keyword: "{keyword}" (change its case if required)
+    - Do not repeat the title and do not use inverted commas
+    - STRICT LIMIT: Maximum {MAX_EXCERPT_LENGTH} characters only
+    - Summarize why this is newsworthy in India, with a curiosity element
+    
+    content requirements:
+    - STRICT LIMIT: MAXIMUM 300 words in simple, plain English for an Indian audience
+    - KEYWORD DENSITY: Include the keyword "{keyword}" exactly {KEYWORD_COUNT_TARGET} times
+    - Do not use inverted commas; change the case of the keyword if required
+    - Focus on why this keyword is trending in Indian news today
+    - Use Markdown heading syntax: ## for subheadings, ### for sub-subheadings
+    - Start directly with the opening paragraph, use 2-3 relevant subheadings and end with a conclusion section
+    - DO NOT include the title, excerpt, or any metadata in the content
+    - Make it production-ready with no meta text or placeholders
+    """
+    
+    try:
+        # Make the request
+        text = await generate_text_async(client, "gemini-2.5-flash", prompt, config)
+        
+        return parse_structured_article(text)
+    except Exception as e:
+        print(f"Error generating structured article: {e}")
+        return {}
+
+def parse_structured_article(text):
+    """
+    Parse the JSON object returned by the structured generation call
+    
+    Args:
+        text (str): Raw response text, possibly wrapped in a code fence
+        
+    Returns:
+        dict: Parsed fields, or an empty dict if the reply isn't a JSON object
+    """
+    if not text:
+        return {}
+    
+    # Strip code fences and any text around the outermost JSON object
+    start = text.find('{')
+    end = text.rfind('}')
+    if start == -1 or end <= start:
+        print("Error: Structured response did not contain a JSON object")
+        return {}
+    
+    try:
+        # Without a response schema the model often puts raw newlines inside the
+        # Markdown "content" string, which a strict parse rejects
+        data = json.loads(text[start:end + 1], strict=False)
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON in structured response: {e}")
+        return {}
+    
+    if not isinstance(data, dict):
+        return {}
+    
+    return {key: str(data.get(key, '')).strip() for key in ('title', 'category', 'excerpt', 'content')}
+
+def count_keyword(keyword, text):
+    """Count case-insensitive occurrences of the keyword in text"""
+    if not keyword:
+        return 0
+    return len(re.findall(re.escape(keyword.lower()), text.lower()))
+
+def validate_article_fields(keyword, fields):
+    """
+    Check generated fields against the article limits and keyword requirements
+    
+    Args:
+        keyword (str): The main keyword for the article
+        fields (dict): Generated title, category, excerpt and content
+        
+    Returns:
+        list: Names of the fields that failed validation
+    """
+    failed = []
+    
+    title = fields.get('title', '')
+    if not title or len(title) > MAX_TITLE_LENGTH or not count_keyword(keyword, title):
+        failed.append('title')
+    
+    if fields.get('category', '') not in ALLOWED_CATEGORIES:
+        failed.append('category')
+    
+    excerpt = fields.get('excerpt', '')
+    if not excerpt or len(excerpt) > MAX_EXCERPT_LENGTH or not count_keyword(keyword, excerpt):
+        failed.append('excerpt')
+    
+    content = fields.get('content', '')
+    keyword_count = count_keyword(keyword, content)
+    if not content or abs(keyword_count - KEYWORD_COUNT_TARGET) > KEYWORD_COUNT_TOLERANCE:
+        failed.append('content')
+    
+    return failed
+
+async def generate_article_structured_async(keyword):
+    """
+    Generate an article with one structured call, re-generating only invalid fields
+    
+    Args:
+        keyword (str): The main keyword for the article
+        
+    Returns:
+        dict: Generated article fields (keyword, title, category, date, excerpt, content)
+    """
+    print(f"Generating structured content for keyword: {keyword}")
+    
+    fields = await generate_structured_article_async(keyword)
+    failed = validate_article_fields(keyword, fields)
+    
+    if failed:
+        print(f"Structured response failed validation for: {', '.join(failed)}. Falling back to per-field calls...")
+    else:
+        print("Structured response passed validation")
+    
+    # Fall back to the dedicated calls for fields that failed validation
+    if 'title' in failed:
+        fields['title'] = await generate_article_title_async(keyword)
+    print(f"Generated Title: {fields['title']}")
+    
+    async def fallback_excerpt_and_content():
+        if 'excerpt' in failed:
+            fields['excerpt'] = await generate_article_excerpt_async(keyword, fields['title'])
+        if 'content' in failed:
+            fields['content'] = await generate_article_content_async(keyword, fields['title'], fields['excerpt'])
+    
+    async def fallback_category():
+        if 'category' in failed:
+            fields['category'] = await categorize_article_async(keyword, fields['title'])
+    
+    await asyncio.gather(fallback_category(), fallback_excerpt_and_content())
+    
+    print(f"Selected Category: {fields['category']}")
+    print(f"Generated Excerpt: {fields['excerpt']}")
+    print("Generated Article Content:")
+    print(fields['content'])
+    
+    return {
+        'keyword': keyword,
+        'title': fields['title'],
+        'category': fields['category'],
+        'date': get_current_date(),
+        'excerpt': fields['excerpt'],
+        'content': fields['content']
+    }
+
 def save_article_to_file(keyword, title, excerpt, content):
     """
     Save the generated article to temp/final.md with production-ready formatting
@@ -359,11 +551,39 @@ def save_article_to_file(keyword, title, excerpt, content):
             file.write(formatted_content)
         
         print("Article successfully saved to temp/final.md")
-        time.sleep(30)
         
     except Exception as e:
         print(f"Error saving article to file: {e}")
 
+def build_article_record(keyword, title, category, date, excerpt):
+    """
+    Build the article metadata record stored in keyword_selection.json
+    
+    Args:
+        keyword (str): The original keyword
+        title (str): The generated title
+        category (str): The selected category
+        date (str): The current date
+        excerpt (str): The generated excerpt
+        
+    Returns:
+        dict: Article metadata with the id derived from the title
+    """
+    # Generate ID from title (separated by -)
+    # Remove special characters and replace spaces with hyphens
+    article_id = re.sub(r'[^\w\s-]', '', title.lower())
+    article_id = re.sub(r'[-\s]+', '-', article_id).strip('-')
+    
+    return {
+        "id": article_id,
+        "keyword": keyword,
+        "title": title,
+        "category": category,
+        "date": date,
+        "url": f"articles/{article_id}.html",
+        "excerpt": excerpt
+    }
+
 def update_keyword_selection_json(keyword, title, category, date, excerpt):
     """
     Update temp/keyword_selection.json with the new article information
@@ -376,21 +596,7 @@ def update_keyword_selection_json(keyword, title, category, date, excerpt):
         excerpt (str): The generated excerpt
     """
     try:
-        # Generate ID from title (separated by -)
-        # Remove special characters and replace spaces with hyphens
-        article_id = re.sub(r'[^\w\s-]', '', title.lower())
-        article_id = re.sub(r'[-\s]+', '-', article_id).strip('-')
-        
-        # Create the new data structure
-        new_data = {
-            "id": article_id,
-            "keyword": keyword,
-            "title": title,
-            "category": category,
-            "date": date,
-            "url": f"articles/{article_id}.html",
-            "excerpt": excerpt
-        }
+        new_data = build_article_record(keyword, title, category, date, excerpt)
         
         # Ensure the temp directory exists
         temp_dir = os.path.join(PROJECT_ROOT, 'temp')
@@ -406,65 +612,53 @@ def update_keyword_selection_json(keyword, title, category, date, excerpt):
     except Exception as e:
         print(f"Error updating keyword_selection.json: {e}")
 
-def main():
-    """
-    Main function to orchestrate the content generation process
+async def generate_article_async(keyword):
     """
-    # Fetch the trend name
-    keyword = fetch_trend_name()
+    Generate title, category, excerpt and body for a keyword concurrently
     
-    if not keyword:
-        print("No keyword found. Exiting.")
-        return
+    The title is generated first since every other call depends on it. Categorization
+    then runs alongside the excerpt and content calls, and the shared rate limiter
+    only delays a request when the Gemini quota actually requires it.
     
+    Args:
+        keyword (str): The main keyword for the article
+        
+    Returns:
+        dict: Generated article fields (keyword, title, category, date, excerpt, content)
+    """
     print(f"Generating content for keyword: {keyword}")
     
     # Generate title
     print("Generating article title...")
-    title = generate_article_title(keyword)
+    title = await generate_article_title_async(keyword)
     print(f"Generated Title: {title}")
     
-    # Wait 30 seconds before next API call
-    print("Waiting 30 seconds before next API call...")
-    time.sleep(30)
-    
-    # Categorize article
-    print("Categorizing article...")
-    category = categorize_article(keyword, title)
-    print(f"Selected Category: {category}")
-    
     # Get current date
     print("Fetching current date...")
     current_date = get_current_date()
     print(f"Current Date: {current_date}")
     
-    # Wait 30 seconds before next API call
-    print("Waiting 30 seconds before next API call...")
-    time.sleep(30)
-    
-    # Generate excerpt
-    print("Generating article excerpt...")
-    excerpt = generate_article_excerpt(keyword, title)
-    print(f"Generated Excerpt: {excerpt}")
+    async def excerpt_and_content():
+        # Generate excerpt, then the article content that uses it as context
+        print("Generating article excerpt...")
+        excerpt = await generate_article_excerpt_async(keyword, title)
+        print(f"Generated Excerpt: {excerpt}")
+        
+        print("Generating article content...")
+        content = await generate_article_content_async(keyword, title, excerpt)
+        return excerpt, content
     
-    # Wait 30 seconds before next API call
-    print("Waiting 30 seconds before next API call...")
-    time.sleep(30)
+    # Categorize article while the excerpt and content are generated
+    print("Categorizing article...")
+    category, (excerpt, article_content) = await asyncio.gather(
+        categorize_article_async(keyword, title),
+        excerpt_and_content()
+    )
+    print(f"Selected Category: {category}")
     
-    # Generate article content
-    print("Generating article content...")
-    article_content = generate_article_content(keyword, title, excerpt)
     print("Generated Article Content:")
     print(article_content)
     
-    # Save article to file
-    print("Saving article to temp/final.md...")
-    save_article_to_file(keyword, title, excerpt, article_content)
-    
-    # Update keyword_selection.json with new structure
-    print("Updating temp/keyword_selection.json...")
-    update_keyword_selection_json(keyword, title, category, current_date, excerpt)
-    
     return {
         'keyword': keyword,
         'title': title,
@@ -474,5 +668,50 @@ def main():
         'content': article_content
     }
 
+def generate_article(keyword, mode=None):
+    """
+    Generate title, category, excerpt and body for a keyword
+    
+    Args:
+        keyword (str): The main keyword for the article
+        mode (str): "separate" for one call per field or "structured" for a single
+            JSON call; defaults to the CONTENT_GENERATION_MODE environment variable
+        
+    Returns:
+        dict: Generated article fields (keyword, title, category, date, excerpt, content)
+    """
+    mode = mode or os.getenv('CONTENT_GENERATION_MODE', 'separate')
+    generator = generate_article_structured_async if mode == 'structured' else generate_article_async
+    
+    try:
+        return run_coroutine(generator(keyword))
+    except Exception as e:
+        print(f"Error generating article for '{keyword}': {e}")
+        print("Exiting due to article generation failure.")
+        sys.exit(1)
+
+def main():
+    """
+    Main function to orchestrate the content generation process
+    """
+    # Fetch the trend name
+    keyword = fetch_trend_name()
+    
+    if not keyword:
+        print("No keyword found. Exiting.")
+        return
+    
+    article = generate_article(keyword)
+    
+    # Save article to file
+    print("Saving article to temp/final.md...")
+    save_article_to_file(keyword, article['title'], article['excerpt'], article['content'])
+    
+    # Update keyword_selection.json with new structure
+    print("Updating temp/keyword_selection.json...")
+    update_keyword_selection_json(keyword, article['title'], article['category'], article['date'], article['excerpt'])
+    
+    return article
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""
+Cached ChromeDriver resolution
+Avoids ChromeDriverManager().install()'s network version lookup on every run by
+remembering the resolved driver binary and only re-checking after a TTL
+"""
+
+import json
+import os
+import re
+import subprocess
+import time
+from webdriver_manager.chrome import ChromeDriverManager
+from webdriver_manager.core.driver_cache import DriverCacheManager
+
+# Get the directory where this script is located
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Get the project root directory (parent of python directory)
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+# Stored under .cache/ so the workflow's actions/cache step keeps the binary between runs
+DRIVER_CACHE_DIR = os.path.join(PROJECT_ROOT, '.cache', 'webdriver')
+DRIVER_METADATA_PATH = os.path.join(DRIVER_CACHE_DIR, 'chromedriver.json')
+DEFAULT_VERSION_TTL_HOURS = 24
+
+def _load_metadata():
+    try:
+        with open(DRIVER_METADATA_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def _save_metadata(path, version, pinned_version):
+    os.makedirs(DRIVER_CACHE_DIR, exist_ok=True)
+    with open(DRIVER_METADATA_PATH, 'w', encoding='utf-8') as f:
+        json.dump({"path": path, "version": version, "pinned_version": pinned_version, "checked_at": time.time()}, f, indent=2)
+
+def driver_version(path):
+    """Version a chromedriver binary reports, e.g. "139.0.7258.154", or None if it can't be run"""
+    try:
+        result = subprocess.run([path, '--version'], capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = re.search(r'ChromeDriver (\d+(?:\.\d+)+)', result.stdout)
+    return match.group(1) if match else None
+
+def _version_matches(version, pinned_version):
+    """Whether a resolved driver version satisfies CHROMEDRIVER_VERSION (a full version or a prefix like "139")"""
+    if pinned_version is None:
+        return True
+    return bool(version) and (version == pinned_version or version.startswith(pinned_version + '.'))
+
+def invalidate_cached_driver():
+    """Forget the cached driver, e.g. after Chrome refused it, so the next lookup resolves it again"""
+    try:
+        os.remove(DRIVER_METADATA_PATH)
+    except FileNotFoundError:
+        pass
+
+def get_chromedriver_path(ttl_hours=None, force_check=False):
+    """
+    Return a ChromeDriver binary path, downloading or re-checking it only when needed.
+
+    Resolution order:
+    1. CHROMEDRIVER_PATH, if set and the file exists (pins an exact binary)
+    2. The cached binary, if its version was checked within the TTL
+    3. ChromeDriverManager().install(), pinned to CHROMEDRIVER_VERSION if set
+    4. A stale cached binary, if the version check itself fails
+
+    Args:
+        ttl_hours (float): Hours between version checks (default: CHROMEDRIVER_TTL_HOURS or 24)
+        force_check (bool): Skip both caches and resolve the driver for the installed
+            Chrome again, e.g. after the cached one failed to start a session
+
+    Returns:
+        str: Path to the chromedriver executable
+    """
+    pinned_path = os.getenv('CHROMEDRIVER_PATH')
+    if pinned_path and os.path.isfile(pinned_path):
+        print(f"Using pinned ChromeDriver: {pinned_path}")
+        return pinned_path
+
+    if ttl_hours is None:
+        ttl_hours = float(os.getenv('CHROMEDRIVER_TTL_HOURS', DEFAULT_VERSION_TTL_HOURS))
+
+    metadata = _load_metadata()
+    cached_path = metadata.get('path')
+    cached_ok = bool(cached_path) and os.path.isfile(cached_path)
+    pinned_version = os.getenv('CHROMEDRIVER_VERSION') or None
+
+    if cached_ok and not force_check and _version_matches(metadata.get('version'), pinned_version):
+        age_hours = (time.time() - metadata.get('checked_at', 0)) / 3600
+        if age_hours < ttl_hours:
+            print(f"Using cached ChromeDriver (checked {age_hours:.1f}h ago): {cached_path}")
+            return cached_path
+
+    try:
+        manager = ChromeDriverManager(
+            driver_version=pinned_version,
+            # valid_range=0 makes webdriver-manager download again instead of reusing its copy
+            cache_manager=DriverCacheManager(root_dir=DRIVER_CACHE_DIR, valid_range=0 if force_check else max(1, int(ttl_hours // 24)))
+        )
+        path = manager.install()
+        version = driver_version(path)
+        print(f"Resolved ChromeDriver {version or 'unknown version'}: {path}")
+        _save_metadata(path, version, pinned_version)
+        return path
+    except Exception as e:
+        if cached_ok and not force_check:
+            print(f"ChromeDriver version check failed ({e}), using cached binary: {cached_path}")
+            return cached_path
+        raise
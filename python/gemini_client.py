@@ -0,0 +1,244 @@
+"""
+Shared Gemini client provider
+Creates one genai.Client per process so every stage reuses the same HTTP connection
+pool (keep-alive) instead of opening a new connection and TLS handshake per request.
+Async calls from synchronous code go through run_coroutine(), which keeps one event
+loop for the whole process so the async client is shared the same way.
+"""
+
+import asyncio
+import atexit
+import os
+import threading
+from dotenv import load_dotenv
+from google import genai
+from google.genai import types
+from rate_limiter import estimate_tokens, get_rate_limiter
+from response_cache import cache_key, get_response_cache
+
+# Load environment variables
+load_dotenv()
+
+# Defaults for every request, overridable with GEMINI_TIMEOUT / GEMINI_RETRY_ATTEMPTS
+DEFAULT_TIMEOUT_SECONDS = 120
+DEFAULT_RETRY_ATTEMPTS = 3
+
+# Transient HTTP statuses worth retrying
+RETRY_STATUS_CODES = [408, 429, 500, 502, 503, 504]
+
+_lock = threading.Lock()
+_client = None
+_async_client = None
+_async_loop = None
+_loop = None
+# Closes of superseded async clients still in flight (kept so they aren't garbage collected)
+_closing = set()
+
+def http_options(timeout=None, attempts=None):
+    """
+    Build HTTP options with timeout and retry settings.
+
+    Args:
+        timeout (float): Request timeout in seconds (default: GEMINI_TIMEOUT or 120)
+        attempts (int): Total attempts including the first one (default: GEMINI_RETRY_ATTEMPTS or 3)
+
+    Returns:
+        types.HttpOptions: Options usable on the client or on a single request config
+    """
+    if timeout is None:
+        timeout = float(os.getenv('GEMINI_TIMEOUT', DEFAULT_TIMEOUT_SECONDS))
+    if attempts is None:
+        attempts = int(os.getenv('GEMINI_RETRY_ATTEMPTS', DEFAULT_RETRY_ATTEMPTS))
+
+    return types.HttpOptions(
+        timeout=int(timeout * 1000),  # milliseconds
+        retry_options=types.HttpRetryOptions(
+            attempts=attempts,
+            initial_delay=2.0,
+            max_delay=60.0,
+            http_status_codes=RETRY_STATUS_CODES
+        )
+    )
+
+def _create_client():
+    api_key = os.getenv('GEMINI_API_KEY')
+    if not api_key:
+        print("Error: GEMINI_API_KEY not found in environment variables")
+        return None
+    return genai.Client(api_key=api_key, http_options=http_options())
+
+def get_client():
+    """
+    Return the process-wide Gemini client, creating it on first use.
+
+    Returns:
+        genai.Client: Shared client, or None if GEMINI_API_KEY is not set
+    """
+    global _client
+    with _lock:
+        if _client is None:
+            _client = _create_client()
+        return _client
+
+def get_async_client():
+    """
+    Return the async Gemini client for the running event loop.
+
+    The async connection pool is bound to the event loop that created it, so a new
+    one is made only when called from a different loop than before; the previous
+    client is then closed. Code that goes through run_coroutine() always runs on
+    the same loop and so always gets the same client.
+
+    Returns:
+        AsyncClient: Shared client.aio, or None if GEMINI_API_KEY is not set
+    """
+    global _async_client, _async_loop
+    loop = asyncio.get_running_loop()
+    with _lock:
+        if _async_client is None or _async_loop is not loop:
+            if _async_client is not None:
+                task = loop.create_task(_close_async_client(_async_client))
+                _closing.add(task)
+                task.add_done_callback(_closing.discard)
+            client = _create_client()
+            _async_client = client.aio if client else None
+            _async_loop = loop
+        return _async_client
+
+async def _close_async_client(client):
+    try:
+        await client.aclose()
+    except Exception as e:
+        # Its event loop may already be closed; the connections go with it
+        print(f"Warning: could not close previous Gemini async client: {e}")
+
+def run_coroutine(coro):
+    """
+    Run a coroutine to completion on the process-wide event loop.
+
+    Use this instead of asyncio.run() from synchronous code: asyncio.run() makes and
+    closes a new loop per call, which would create a new async client (and
+    connection pool) for every call.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+    global _loop
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+        loop = _loop
+    return loop.run_until_complete(coro)
+
+def close():
+    """Close the shared clients and the process-wide event loop (registered to run at exit)"""
+    global _client, _async_client, _async_loop, _loop
+    with _lock:
+        client, async_client, async_loop, loop = _client, _async_client, _async_loop, _loop
+        _client = _async_client = _async_loop = _loop = None
+
+    if async_client is not None and async_loop is not None and not async_loop.is_closed() and not async_loop.is_running():
+        async_loop.run_until_complete(_close_async_client(async_client))
+    if loop is not None and not loop.is_closed() and not loop.is_running():
+        loop.close()
+    if client is not None:
+        client.close()
+
+atexit.register(close)
+
+def request_config(config=None, timeout=None, attempts=None):
+    """
+    Attach per-call timeout and retry settings to a generation config.
+
+    Args:
+        config (types.GenerateContentConfig): Existing config, or None
+        timeout (float): Timeout in seconds for this call only
+        attempts (int): Retry attempts for this call only
+
+    Returns:
+        types.GenerateContentConfig: The config to pass to generate_content
+    """
+    if timeout is None and attempts is None:
+        return config
+
+    config = config.model_copy() if config else types.GenerateContentConfig()
+    config.http_options = http_options(timeout, attempts)
+    return config
+
+def _cached(model, prompt, config):
+    cache = get_response_cache()
+    if not cache:
+        return None, None, None
+    key = cache_key(model, prompt, config)
+    value = cache.get(key)
+    if value is not None:
+        print(f"Using cached {model} response")
+    return cache, key, value
+
+def generate_text(client, model, prompt, config=None):
+    """
+    Generate text through the response cache and the shared rate limiter.
+
+    Args:
+        client (genai.Client): Client from get_client()
+        model (str): Model name
+        prompt (str): Prompt text
+        config (types.GenerateContentConfig): Optional generation config
+
+    Returns:
+        str: Stripped response text
+    """
+    cache, key, cached = _cached(model, prompt, config)
+    if cached is not None:
+        return cached
+
+    get_rate_limiter().wait(estimate_tokens(prompt))
+    response = client.models.generate_content(model=model, contents=prompt, config=config)
+    text = (response.text or "").strip()
+    if cache and text:
+        cache.put(key, text)
+    return text
+
+def generate_image_data(client, model, prompt, config=None):
+    """
+    Generate an image through the response cache and the shared rate limiter.
+
+    Args:
+        client (genai.Client): Client from get_client()
+        model (str): Image generation model name
+        prompt (str): Prompt text
+        config (types.GenerateContentConfig): Generation config with the IMAGE modality
+
+    Returns:
+        bytes: Encoded image data, or None if the response holds no image
+    """
+    cache, key, cached = _cached(model, prompt, config)
+    if cached is not None:
+        return cached
+
+    get_rate_limiter().wait(estimate_tokens(prompt))
+    response = client.models.generate_content(model=model, contents=prompt, config=config)
+    for part in response.candidates[0].content.parts:
+        if part.text is not None:
+            print(f"Image generation response: {part.text}")
+        elif part.inline_data is not None:
+            if cache:
+                cache.put(key, part.inline_data.data)
+            return part.inline_data.data
+    return None
+
+async def generate_text_async(client, model, prompt, config=None):
+    """Async version of generate_text() for clients from get_async_client()"""
+    cache, key, cached = _cached(model, prompt, config)
+    if cached is not None:
+        return cached
+
+    await get_rate_limiter().acquire(estimate_tokens(prompt))
+    response = await client.models.generate_content(model=model, contents=prompt, config=config)
+    text = (response.text or "").strip()
+    if cache and text:
+        cache.put(key, text)
+    return text
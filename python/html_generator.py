@@ -1,15 +1,54 @@
+import hashlib
+import html
+import inspect
 import json
 import os
+import re
 import shutil
 from datetime import datetime
 import markdown
 from PIL import Image
+import article_index
+import article_store
+import image_pipeline
+import related_articles
+import sitemaps
+import template_engine
 
 # Get the directory where this script is located
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 # Get the project root directory (parent of python directory)
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 
+# Article sources (markdown, or the body HTML of articles published before sources were kept, as .body)
+CONTENT_DIR = os.path.join(PROJECT_ROOT, 'content')
+
+# Pre-partitioned JSON read by js/articles.js instead of the whole articles.json
+SHARDS_DIR = os.path.join(PROJECT_ROOT, 'json', 'shards')
+SHARD_PAGE_SIZE = 9  # matches articlesPerPage in js/articles.js
+FEATURED_COUNT = 9
+RELATED_COUNT = 3
+RELATED_ARTICLES_PER_BUCKET = 32
+# Fields createArticleCard() needs; keyword stays in articles.json only
+SHARD_FIELDS = ('id', 'title', 'category', 'date', 'image', 'image_width', 'image_height',
+                'image_widths', 'image_formats', 'url', 'excerpt')
+
+# sizes of the responsive images: cards fill the grid columns, the article image the 800px column
+CARD_IMAGE_SIZES = "(max-width: 768px) 100vw, (max-width: 992px) 50vw, 400px"
+ARTICLE_IMAGE_SIZES = "(max-width: 800px) 100vw, 800px"
+
+# Pre-rendered listings of index.html and category/*.html sit between these markers
+LISTING_START = '<!-- articles:start -->'
+LISTING_END = '<!-- articles:end -->'
+LISTING_PAGE_SIZE = 9  # matches articlesPerPage in js/articles.js
+# Cards in the first row of the home page grid at desktop width, loaded eagerly
+HOME_FIRST_ROW = 3
+
+# Related-articles graph, baked into the article pages between these markers
+RELATED_INDEX_PATH = os.path.join(PROJECT_ROOT, 'json', 'related.json')
+RELATED_START = '<!-- related:start -->'
+RELATED_END = '<!-- related:end -->'
+
 def read_id_from_keyword_selection():
     """Read the id value from temp/keyword_selection.json"""
     keyword_selection_path = os.path.join(PROJECT_ROOT, 'temp', 'keyword_selection.json')
@@ -24,25 +63,6 @@ def read_id_from_keyword_selection():
         print("Error: Invalid JSON in keyword_selection.json")
         return None
 
-def resize_final_image():
-    """Resize temp/final.jpg to 1200x630px and save it with the same name in the same location"""
-    image_path = os.path.join(PROJECT_ROOT, 'temp', 'final.jpg')
-    
-    try:
-        # Open the image
-        with Image.open(image_path) as img:
-            # Resize to 1200x630px
-            resized_img = img.resize((1200, 630), Image.Resampling.LANCZOS)
-            
-            # Save the resized image with the same name and location
-            resized_img.save(image_path, 'JPEG', quality=95)
-            print(f"Successfully resized {image_path} to 1200x630px")
-            
-    except FileNotFoundError:
-        print(f"Error: {image_path} not found")
-    except Exception as e:
-        print(f"Error resizing image: {str(e)}")
-
 def rename_final_md_to_id(article_id):
     """Rename temp/final.md to temp/{id}.md"""
     if not article_id:
@@ -88,251 +108,66 @@ def generate_html_from_markdown(article_id):
         print(f"Error reading markdown file: {e}")
         return False
     
+    html_template = render_article_html(article_id, article_data, md_content)
+    if not write_article_html(article_id, html_template):
+        return False
+    return save_article_source(article_id, md_content)
+
+def render_article_html(article_id, article_data, md_content, related_html=None):
+    """Render the complete article page for the given metadata and markdown body"""
     # Convert markdown to HTML
     md = markdown.Markdown()
     html_content = md.convert(md_content)
+    return render_article_page(article_id, article_data, html_content, related_html)
+
+def render_article_page(article_id, article_data, html_content, related_html=None):
+    """Render the complete article page for the given metadata and HTML body"""
+    # Filled in by update_related_articles() once the article is published
+    if related_html is None:
+        related_html = render_related_section([])
     
     # Extract keywords for meta tags
     keywords = article_data.get('keyword', '').split()
-    keywords_str = ', '.join(keywords[:4])  # Limit to 4 keywords
-    
-    # Generate the complete HTML
-    html_template = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0, shrink-to-fit=no">
-    <meta name="description" content="{article_data.get('excerpt', '')}">
-    <meta name="keywords" content="{keywords_str}">
-    <meta name="author" content="OmniTrends">
-    <meta name="robots" content="index, follow, max-snippet:-1, max-image-preview:large, max-video-preview:-1">
-    <meta name="googlebot" content="index, follow">
-    <meta name="theme-color" content="#2563eb">
-    <meta name="mobile-web-app-capable" content="yes">
-    <meta name="apple-mobile-web-app-capable" content="yes">
-    <meta name="apple-mobile-web-app-status-bar-style" content="default">
-    <meta name="apple-mobile-web-app-title" content="{article_data.get('title', '')} - OmniTrends">
-    <meta name="format-detection" content="telephone=no">
-    
-    <!-- Open Graph / Facebook -->
-    <meta property="og:type" content="article">
-    <meta property="og:url" content="https://omnitrends.github.io/articles/{article_id}.html">
-    <meta property="og:title" content="{article_data.get('title', '')}">
-    <meta property="og:description" content="{article_data.get('excerpt', '')}">
-    <meta property="og:image" content="https://omnitrends.github.io/images/{article_id}.webp">
-    <meta property="og:image:width" content="1200">
-    <meta property="og:image:height" content="630">
-    
-    <!-- Twitter -->
-    <meta property="twitter:card" content="summary_large_image">
-    <meta property="twitter:url" content="https://omnitrends.github.io/articles/{article_id}.html">
-    <meta property="twitter:title" content="{article_data.get('title', '')}">
-    <meta property="twitter:description" content="{article_data.get('excerpt', '')}">
-    <meta property="twitter:image" content="https://omnitrends.github.io/images/{article_id}.webp">
-    
-    <!-- Favicon -->
-    <link rel="icon" type="image/x-icon" href="../favicon.ico">
-    
-    <!-- Manifest -->
-    <link rel="manifest" href="../json/manifest.json">
-    
-    <!-- Google Fonts -->
-    <link rel="preconnect" href="https://fonts.googleapis.com">
-    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap" rel="stylesheet">
-    
-    <!-- Performance optimizations -->
-    <link rel="dns-prefetch" href="//fonts.googleapis.com">
-    <link rel="dns-prefetch" href="//fonts.gstatic.com">
-    
-    <!-- CSS -->
-    <link rel="stylesheet" href="../css/style.css">
-    
-    <title>{article_data.get('title', '')} | OmniTrends</title>
-    
-    <!-- JSON-LD Structured Data -->
-    <script type="application/ld+json">
-    {{
-        "@context": "https://schema.org",
-        "@type": "Article",
-        "headline": "{article_data.get('title', '')}",
-        "description": "{article_data.get('excerpt', '')}",
-        "image": "https://omnitrends.github.io/images/{article_id}.webp",
-        "author": {{
-            "@type": "Organization",
-            "name": "OmniTrends"
-        }},
-        "publisher": {{
-            "@type": "Organization",
-            "name": "OmniTrends",
-            "logo": {{
-                "@type": "ImageObject",
-                "url": "https://omnitrends.github.io/images/logo.png"
-            }}
-        }},
-        "datePublished": "{article_data.get('date', datetime.now().strftime('%Y-%m-%d'))}",
-        "dateModified": "{article_data.get('date', datetime.now().strftime('%Y-%m-%d'))}",
-        "mainEntityOfPage": {{
-            "@type": "WebPage",
-            "@id": "https://omnitrends.github.io/articles/{article_id}.html"
-        }},
-        "articleSection": "{article_data.get('category', '')}"
-    }}
-    </script>
-</head>
-<body>
-    <!-- Header -->
-    <header class="header">
-        <nav class="nav container">
-            <div class="nav__brand">
-                <a href="../index.html" class="nav__logo">
-                    <div class="site-logo">OmniTrends</div>
-                </a>
-            </div>
-            
-            <div class="nav__menu" id="nav-menu">
-                <ul class="nav__list">
-                    <li class="nav__item">
-                        <a href="../index.html" class="nav__link">Home</a>
-                    </li>
-                    <li class="nav__item nav__dropdown">
-                        <a href="#" class="nav__link nav__dropdown-toggle">Categories <span class="nav__arrow">▼</span></a>
-                        <ul class="nav__dropdown-menu">
-                            <li><a href="../category/technology.html" class="nav__dropdown-link">Technology</a></li>
-                            <li><a href="../category/lifestyle.html" class="nav__dropdown-link">Lifestyle</a></li>
-                            <li><a href="../category/business.html" class="nav__dropdown-link">Business</a></li>
-                            <li><a href="../category/innovation.html" class="nav__dropdown-link">Innovation</a></li>
-                            <li><a href="../category/news.html" class="nav__dropdown-link">News</a></li>
-                            <li><a href="../category/health.html" class="nav__dropdown-link">Health</a></li>
-                            <li><a href="../category/entertainment.html" class="nav__dropdown-link">Entertainment</a></li>
-                            <li><a href="../category/finance.html" class="nav__dropdown-link">Finance</a></li>
-                            <li><a href="../category/science.html" class="nav__dropdown-link">Science</a></li>
-                            <li><a href="../category/travel.html" class="nav__dropdown-link">Travel</a></li>
-                            <li><a href="../category/food.html" class="nav__dropdown-link">Food</a></li>
-                            <li><a href="../category/sports.html" class="nav__dropdown-link">Sports</a></li>
-                        </ul>
-                    </li>
-                    <li class="nav__item nav__dropdown">
-                        <a href="#" class="nav__link nav__dropdown-toggle">Pages <span class="nav__arrow">▼</span></a>
-                        <ul class="nav__dropdown-menu">
-                            <li><a href="../pages/about.html" class="nav__dropdown-link">About</a></li>
-                            <li><a href="../pages/contact.html" class="nav__dropdown-link">Contact</a></li>
-                            <li><a href="../pages/privacy.html" class="nav__dropdown-link">Privacy Policy</a></li>
-                            <li><a href="../pages/terms.html" class="nav__dropdown-link">Terms & Conditions</a></li>
-                            <li><a href="../pages/disclaimer.html" class="nav__dropdown-link">Disclaimer</a></li>
-                        </ul>
-                    </li>
-                </ul>
-            </div>
-            
-            <div class="nav__toggle" id="nav-toggle">
-                <span></span>
-                <span></span>
-                <span></span>
-            </div>
-        </nav>
-    </header>
-
-    <!-- Article Header -->
-    <section class="article-header">
-        <div class="container">
-            <div class="article-header__content">
-                <div class="article-meta">
-                    <a href="../category/{article_data.get('category', '').lower()}.html" class="article-category">{article_data.get('category', '')}</a>
-                    <span class="article-date" id="article-date">{article_data.get('date', '')}</span>
-                </div>
-                <h1 class="article-title">{article_data.get('title', '')}</h1>
-                <p class="article-description">{article_data.get('excerpt', '')}</p>
-            </div>
-        </div>
-    </section>
+    
+    context = {
+        "base_path": "../",
+        "article_id": article_id,
+        "title": article_data.get('title', ''),
+        "description": article_data.get('excerpt', ''),
+        "keywords": ', '.join(keywords[:4]),  # Limit to 4 keywords
+        "og_type": "article",
+        "page_url": f"{template_engine.SITE_URL}/articles/{article_id}.html",
+        "image_url": f"{template_engine.SITE_URL}/images/{article_id}.webp",
+        "category": article_data.get('category', ''),
+        "date": article_data.get('date', ''),
+        "date_published": article_data.get('date', datetime.now().strftime('%Y-%m-%d')),
+        "image_sizes": ARTICLE_IMAGE_SIZES,
+        "image_width": article_data.get('image_width'),
+        "image_height": article_data.get('image_height'),
+        "content": html_content,
+        "related_html": related_html
+    }
+    context["image_srcset"], context["image_avif_srcset"] = image_srcsets(article_id, article_data, "../images/")
+    html_template = template_engine.render('article.html', context)
+    return html_template
 
-    <!-- Article Content -->
-    <main class="article-content">
-        <div class="container">
-            <article class="article">
-                <div class="article__image">
-                    <img src="../images/{article_id}.webp" alt="{article_data.get('title', '')}" loading="lazy">
-                </div>
-                
-                <div class="article__body">
-                    {html_content}
-                </div>
-
-                <div class="article__footer">
-                    <div class="article__tags">
-                        <span class="tag">{article_data.get('category', '')}</span>
-                        <span class="tag">Trends</span>
-                        <span class="tag">News</span>
-                    </div>
-                </div>
-            </article>
-        </div>
-    </main>
+def render_version():
+    """
+    Hash of the page markup built in Python: the render helpers' code and the
+    constants they use. template_engine.template_version() only covers the
+    template files, so rebuilds combine both to tell when pages are out of date.
+    """
+    digest = hashlib.sha256()
+    for func in (render_article_html, render_article_page, image_srcsets, truncate_text, render_card_image,
+                 render_article_card, render_related_section, image_pipeline.image_filename, image_pipeline.srcset):
+        digest.update(inspect.getsource(func).encode('utf-8') + b'\0')
+    constants = [CARD_IMAGE_SIZES, ARTICLE_IMAGE_SIZES, RELATED_START, RELATED_END, image_pipeline.IMAGE_SIZE,
+                 markdown.__version__]
+    digest.update(json.dumps(constants).encode('utf-8'))
+    return digest.hexdigest()[:16]
 
-    <!-- Footer -->
-    <footer class="footer">
-        <div class="container">
-            <div class="footer__content">
-                <div class="footer__section">
-                    <h3 class="footer__title">OmniTrends</h3>
-                    <p class="footer__description">Your source for the latest trends, insights, and discoveries across technology, lifestyle, and innovation.</p>
-                </div>
-                
-                <div class="footer__section">
-                    <h4 class="footer__subtitle">Quick Links</h4>
-                    <ul class="footer__links">
-                        <li><a href="../index.html">Home</a></li>
-                        <li><a href="../pages/about.html">About</a></li>
-                        <li><a href="../pages/contact.html">Contact</a></li>
-                        <li><a href="../pages/privacy.html">Privacy Policy</a></li>
-                        <li><a href="../pages/terms.html">Terms & Conditions</a></li>
-                        <li><a href="../pages/disclaimer.html">Disclaimer</a></li>
-                    </ul>
-                </div>
-                
-                <div class="footer__section">
-                    <h4 class="footer__subtitle">Categories</h4>
-                    <ul class="footer__links">
-                        <li><a href="../category/technology.html">Technology</a></li>
-                        <li><a href="../category/lifestyle.html">Lifestyle</a></li>
-                        <li><a href="../category/business.html">Business</a></li>
-                        <li><a href="../category/innovation.html">Innovation</a></li>
-                        <li><a href="../category/news.html">News</a></li>
-                        <li><a href="../category/health.html">Health</a></li>
-                        <li><a href="../category/entertainment.html">Entertainment</a></li>
-                        <li><a href="../category/finance.html">Finance</a></li>
-                        <li><a href="../category/science.html">Science</a></li>
-                        <li><a href="../category/travel.html">Travel</a></li>
-                        <li><a href="../category/food.html">Food</a></li>
-                        <li><a href="../category/sports.html">Sports</a></li>
-                    </ul>
-                </div>
-            </div>
-            
-            <div class="footer__bottom">
-                <p>&copy; 2025 OmniTrends. All rights reserved.</p>
-            </div>
-        </div>
-    </footer>
-
-    <!-- JavaScript -->
-    <script src="../js/articles.js"></script>
-    <script src="../js/main.js"></script>
-    <script>
-        // Update the article date display
-        document.addEventListener('DOMContentLoaded', function() {{
-            const articleDate = document.getElementById('article-date');
-            if (articleDate) {{
-                const date = new Date('{article_data.get('date', '')}');
-                const options = {{ year: 'numeric', month: 'long', day: 'numeric' }};
-                articleDate.textContent = date.toLocaleDateString('en-US', options);
-            }}
-        }});
-    </script>
-</body>
-</html>'''
-    
+def write_article_html(article_id, html_template):
+    """Save a rendered article page to articles/{id}.html"""
     # Ensure articles directory exists
     articles_dir = os.path.join(PROJECT_ROOT, 'articles')
     os.makedirs(articles_dir, exist_ok=True)
@@ -348,60 +183,63 @@ def generate_html_from_markdown(article_id):
         print(f"Error writing HTML file: {e}")
         return False
 
+def save_article_source(article_id, md_content):
+    """Keep the article markdown in content/{id}.md so the page can be rebuilt later"""
+    os.makedirs(CONTENT_DIR, exist_ok=True)
+    source_path = os.path.join(CONTENT_DIR, f'{article_id}.md')
+    try:
+        with open(source_path, 'w', encoding='utf-8') as f:
+            f.write(md_content)
+        return True
+    except Exception as e:
+        print(f"Error writing article source: {e}")
+        return False
+
 def process_image_files(article_id):
-    """Rename temp/final.jpg to temp/{id}.jpg, convert to webp, and copy to images/"""
+    """Publish temp/final.png (written by image_generator.py) as the article's images"""
     if not article_id:
         print("Error: No article ID provided")
         return False
     
-    # Step 1: Rename temp/final.jpg to temp/{id}.jpg
-    source_jpg = os.path.join(PROJECT_ROOT, 'temp', 'final.jpg')
-    temp_jpg = os.path.join(PROJECT_ROOT, 'temp', f'{article_id}.jpg')
-    
-    try:
-        if os.path.exists(source_jpg):
-            shutil.move(source_jpg, temp_jpg)
-            print(f"Renamed final.jpg to {article_id}.jpg")
-        else:
-            print("Error: temp/final.jpg not found")
-            return False
-    except Exception as e:
-        print(f"Error renaming JPG file: {e}")
+    source_png = os.path.join(PROJECT_ROOT, 'temp', 'final.png')
+    if not os.path.exists(source_png):
+        print("Error: temp/final.png not found")
         return False
     
-    # Step 2: Convert temp/{id}.jpg to temp/{id}.webp
-    temp_webp = os.path.join(PROJECT_ROOT, 'temp', f'{article_id}.webp')
-    
     try:
-        with Image.open(temp_jpg) as img:
-            # Convert to RGB if necessary (for JPEG compatibility)
-            if img.mode in ('RGBA', 'LA', 'P'):
-                img = img.convert('RGB')
-            
-            # Save as WebP with high quality
-            img.save(temp_webp, 'WEBP', quality=85, optimize=True)
-            print(f"Converted {article_id}.jpg to {article_id}.webp")
+        with Image.open(source_png) as image:
+            return save_article_image(image, article_id)
     except Exception as e:
-        print(f"Error converting to WebP: {e}")
+        print(f"Error reading {source_png}: {e}")
         return False
+
+def save_article_image(image, article_id, formats=None):
+    """
+    Resize an in-memory PIL image once per srcset width and encode each size once
+    into images/ ({id}.webp at 1200x630px, {id}-640w.webp and so on below it).
     
-    # Step 3: Copy temp/{id}.webp to images/{id}.webp
-    # Ensure images directory exists
-    images_dir = os.path.join(PROJECT_ROOT, 'images')
-    os.makedirs(images_dir, exist_ok=True)
-    
-    final_webp = os.path.join(PROJECT_ROOT, 'images', f'{article_id}.webp')
+    Args:
+        image (PIL.Image): Generated image
+        article_id (str): Article id
+        formats (list): Formats to write (default: image_pipeline.output_formats())
+        
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    if not article_id:
+        print("Error: No article ID provided")
+        return False
     
     try:
-        shutil.copy2(temp_webp, final_webp)
-        print(f"Copied {article_id}.webp to images folder")
+        paths = image_pipeline.process_article_image(image, article_id, tuple(formats or image_pipeline.output_formats()))
+        print(f"Saved {len(paths)} image files for {article_id} to images folder")
         return True
     except Exception as e:
-        print(f"Error copying WebP to images folder: {e}")
+        print(f"Error saving article image: {e}")
         return False
 
 def update_articles_json():
-    """Copy element from temp/keyword_selection.json to top of json/articles.json"""
+    """Copy element from temp/keyword_selection.json to top of json/articles.json and feature it"""
     # Read the new article data
     keyword_selection_path = os.path.join(PROJECT_ROOT, 'temp', 'keyword_selection.json')
     try:
@@ -411,73 +249,98 @@ def update_articles_json():
         print(f"Error reading keyword_selection.json: {e}")
         return False
     
-    # Read existing articles.json
-    articles_path = os.path.join(PROJECT_ROOT, 'json', 'articles.json')
-    try:
-        with open(articles_path, 'r', encoding='utf-8') as f:
-            articles = json.load(f)
-    except FileNotFoundError:
-        articles = []
-    except Exception as e:
-        print(f"Error reading articles.json: {e}")
-        return False
+    return publish_articles([new_article])
+
+def insert_article(new_article):
+    """Add an article record to the top of json/articles.json"""
+    return insert_articles([new_article])
+
+def add_new_articles(articles, new_articles, index):
+    """
+    Put new records at the top of the article list, keeping their order.
     
-    # Check if article already exists (avoid duplicates)
-    article_exists = any(article.get('id') == new_article.get('id') for article in articles)
+    Records whose id is already published (or repeated in new_articles) are skipped.
     
-    if not article_exists:
-        # Add new article to the top of the list
-        articles.insert(0, new_article)
-        
-        # Save updated articles.json
-        # Ensure json directory exists
-        json_dir = os.path.join(PROJECT_ROOT, 'json')
-        os.makedirs(json_dir, exist_ok=True)
-        
-        try:
-            with open(articles_path, 'w', encoding='utf-8') as f:
-                json.dump(articles, f, indent=4, ensure_ascii=False)
-            print("Updated articles.json with new article")
-            return True
-        except Exception as e:
-            print(f"Error writing articles.json: {e}")
-            return False
+    Returns:
+        list: The records that were added
+    """
+    # Skip articles that already exist (avoid duplicates), using the id index when available
+    if index:
+        is_published = index.has_id
     else:
-        print("Article already exists in articles.json")
-        return True
-
-def update_featured_articles():
-    """Ensure only top 9 articles are featured in json/articles.json"""
-    articles_path = os.path.join(PROJECT_ROOT, 'json', 'articles.json')
+        is_published = {article.get('id') for article in articles}.__contains__
     
+    to_add = []
+    added_ids = set()
+    for new_article in new_articles:
+        if new_article.get('id') in added_ids or is_published(new_article.get('id')):
+            print(f"Article already exists in articles.json: {new_article.get('id')}")
+            continue
+        added_ids.add(new_article.get('id'))
+        to_add.append(new_article)
+    
+    articles[0:0] = to_add
+    return to_add
+
+def publish_articles(new_articles):
+    """
+    Add article records to the top of json/articles.json in a single atomic write,
+    and put them at the front of the featured manifest.
+    """
+    index = article_index.get_article_index()
+    # Featured status lives in json/featured.json, not in the records
+    new_articles = [{key: value for key, value in record.items() if key != 'featured'} for record in new_articles]
     try:
-        with open(articles_path, 'r', encoding='utf-8') as f:
-            articles = json.load(f)
+        with article_store.transaction() as articles:
+            to_add = add_new_articles(articles, new_articles, index)
     except Exception as e:
-        print(f"Error reading articles.json: {e}")
+        print(f"Error updating articles.json: {e}")
         return False
     
-    # Update featured status - only top 9 should be featured
-    for i, article in enumerate(articles):
-        if i < 9:
-            article['featured'] = True
-        else:
-            article['featured'] = False
-    
-    # Save updated articles.json
-    # Ensure json directory exists
-    json_dir = os.path.join(PROJECT_ROOT, 'json')
-    os.makedirs(json_dir, exist_ok=True)
+    if to_add:
+        print(f"Updated articles.json with {len(to_add)} new article(s)")
+        if index:
+            index.add_articles(to_add)
+    return feature_articles([record['id'] for record in to_add])
+
+def insert_articles(new_articles):
+    """Add article records to the top of json/articles.json in a single rewrite"""
+    index = article_index.get_article_index()
+    try:
+        with article_store.transaction() as articles:
+            to_add = add_new_articles(articles, new_articles, index)
+    except Exception as e:
+        print(f"Error updating articles.json: {e}")
+        return False
     
+    if to_add:
+        print(f"Updated articles.json with {len(to_add)} new article(s)")
+        if index:
+            index.add_articles(to_add)
+    return True
+
+def feature_articles(article_ids):
+    """Put newly published articles at the front of json/featured.json, keeping the top 9"""
     try:
-        with open(articles_path, 'w', encoding='utf-8') as f:
-            json.dump(articles, f, indent=4, ensure_ascii=False)
-        print("Updated featured articles (top 9 are now featured)")
+        featured = list(dict.fromkeys(article_ids + article_store.load_featured_ids()))
+        article_store.save_featured_ids(featured[:FEATURED_COUNT])
         return True
     except Exception as e:
-        print(f"Error writing articles.json: {e}")
+        print(f"Error updating featured.json: {e}")
         return False
 
+def update_featured_articles():
+    """Reset json/featured.json to the top 9 articles of json/articles.json"""
+    try:
+        articles = article_store.load_articles()
+        article_store.save_featured_ids([article['id'] for article in articles[:FEATURED_COUNT]])
+    except Exception as e:
+        print(f"Error updating featured.json: {e}")
+        return False
+    
+    print("Updated featured articles (top 9 are now featured)")
+    return True
+
 def clear_temp_folder():
     """Clear all files from the temp folder"""
     temp_folder = os.path.join(PROJECT_ROOT, 'temp')
@@ -495,80 +358,574 @@ def clear_temp_folder():
         return False
 
 def generate_sitemap():
-    """Generate sitemap.xml for Google Search Console"""
-    base_url = "https://omnitrends.github.io"
-    sitemap_content = ['<?xml version="1.0" encoding="UTF-8"?>']
-    sitemap_content.append('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">')
-    
-    # Add index.html
-    sitemap_content.append('  <url>')
-    sitemap_content.append(f'    <loc>{base_url}/index.html</loc>')
-    sitemap_content.append(f'    <lastmod>{datetime.now().strftime("%Y-%m-%d")}</lastmod>')
-    sitemap_content.append('    <changefreq>daily</changefreq>')
-    sitemap_content.append('    <priority>1.0</priority>')
-    sitemap_content.append('  </url>')
-    
-    # Add 404.html
-    sitemap_content.append('  <url>')
-    sitemap_content.append(f'    <loc>{base_url}/404.html</loc>')
-    sitemap_content.append(f'    <lastmod>{datetime.now().strftime("%Y-%m-%d")}</lastmod>')
-    sitemap_content.append('    <changefreq>monthly</changefreq>')
-    sitemap_content.append('    <priority>0.1</priority>')
-    sitemap_content.append('  </url>')
-    
-    # Add pages from pages folder
-    pages_folder = os.path.join(PROJECT_ROOT, 'pages')
+    """Update sitemap.xml and the Google News sitemap for Google Search Console"""
+    return sitemaps.build_sitemaps()
+
+def parse_article_date(date_str):
+    """Parse a "30 August 2025" article date, returning datetime.min for anything else"""
+    return related_articles.parse_article_date(date_str) or datetime.min
+
+def related_bucket(article_id, bucket_count):
+    """FNV-1a hash of the id's UTF-8 bytes modulo bucket_count (mirrored by relatedBucket() in js/articles.js)"""
+    value = 0x811c9dc5
+    for byte in article_id.encode('utf-8'):
+        value ^= byte
+        value = (value * 0x01000193) & 0xffffffff
+    return value % bucket_count
+
+def truncate_text(text, max_length):
+    """Truncate text with an ellipsis, like truncateText() in js/articles.js"""
+    if not text or len(text) <= max_length:
+        return text
+    return text[:max_length].strip() + '...'
+
+def image_srcsets(article_id, article, prefix):
+    """
+    srcset values for an article's image variants.
+    
+    Returns:
+        tuple: (WebP srcset, AVIF srcset), each None when the record has no such variants
+    """
+    widths = article.get('image_widths')
+    if not widths:
+        return None, None
+    formats = article.get('image_formats', ['webp'])
+    avif_srcset = image_pipeline.srcset(prefix, article_id, widths, 'avif') if 'avif' in formats else None
+    return image_pipeline.srcset(prefix, article_id, widths, 'webp'), avif_srcset
+
+def render_card_image(article, base_path, alt, lazy=True, fetchpriority=None):
+    """
+    Render the card image the same way as createCardImage() in js/articles.js.
+    
+    Images above the fold should pass lazy=False (and the LCP candidate
+    fetchpriority="high") so the browser doesn't hold them back until layout.
+    """
+    image = article.get('image', '')
+    src = f"{base_path}images/{image}"
+    loading = ' loading="lazy"' if lazy else ''
+    if fetchpriority:
+        loading += f' fetchpriority="{fetchpriority}"'
+    webp_srcset, avif_srcset = image_srcsets(os.path.splitext(image)[0], article, f"{base_path}images/")
+    if not webp_srcset:
+        return f'<img src="{src}" alt="{alt}"{loading}>'
+    
+    img = (f'<img src="{src}" srcset="{webp_srcset}" sizes="{CARD_IMAGE_SIZES}" '
+           f'width="{article.get("image_width")}" height="{article.get("image_height")}" alt="{alt}"{loading}>')
+    if not avif_srcset:
+        return img
+    return f"""<picture>
+                            <source type="image/avif" srcset="{avif_srcset}" sizes="{CARD_IMAGE_SIZES}">
+                            {img}
+                        </picture>"""
+
+def render_article_card(article, base_path='../', lazy=True, fetchpriority=None):
+    """Render the same card markup as createArticleCard() in js/articles.js"""
+    title = html.escape(truncate_text(article.get('title', ''), 60))
+    excerpt = html.escape(truncate_text(article.get('excerpt', ''), 150))
+    article_url = f"{base_path}{article.get('url', '')}"
+    return f"""
+                <article class="article-card">
+                    <div class="article-card__image">
+                        {render_card_image(article, base_path, title, lazy, fetchpriority)}
+                    </div>
+                    <div class="article-card__content">
+                        <div class="article-card__meta">
+                            <span class="article-card__category">{article.get('category', '')}</span>
+                            <time class="article-card__date" datetime="{article.get('date', '')}">{article.get('date', '')}</time>
+                        </div>
+                        <h3 class="article-card__title">
+                            <a href="{article_url}">{title}</a>
+                        </h3>
+                        <p class="article-card__excerpt">{excerpt}</p>
+                        <a href="{article_url}" class="article-card__link">Read More</a>
+                    </div>
+                </article>"""
+
+def render_related_section(related):
+    """Render the pre-built related articles section of an article page"""
+    if not related:
+        return f"{RELATED_START}\n    {RELATED_END}"
+    
+    cards = ''.join(render_article_card(article) for article in related)
+    return f"""{RELATED_START}
+    <section class="featured related-articles">
+        <div class="container">
+            <h2 class="section__title">Related Articles</h2>
+            <div class="articles-grid" id="related-articles-grid" data-prerendered="true">{cards}
+            </div>
+        </div>
+    </section>
+    {RELATED_END}"""
+
+def replace_related_section(page_html, section_html):
+    """Swap the related section of an article page, adding it after </main> on older pages"""
+    start = page_html.find(RELATED_START)
+    end = page_html.find(RELATED_END)
+    if start != -1 and end != -1:
+        return page_html[:start] + section_html + page_html[end + len(RELATED_END):]
+    
+    main_end = page_html.find('</main>')
+    if main_end == -1:
+        return None
+    main_end += len('</main>')
+    return f"{page_html[:main_end]}\n\n    {section_html}{page_html[main_end:]}"
+
+def load_related_index():
+    """Load json/related.json as {article id: [related ids]}"""
     try:
-        for filename in os.listdir(pages_folder):
-            if filename.endswith('.html'):
-                sitemap_content.append('  <url>')
-                sitemap_content.append(f'    <loc>{base_url}/pages/{filename}</loc>')
-                sitemap_content.append(f'    <lastmod>{datetime.now().strftime("%Y-%m-%d")}</lastmod>')
-                sitemap_content.append('    <changefreq>monthly</changefreq>')
-                sitemap_content.append('    <priority>0.5</priority>')
-                sitemap_content.append('  </url>')
+        with open(RELATED_INDEX_PATH, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        ids = data['ids']
+        return {ids[row]: [ids[other] for other in related] for row, related in enumerate(data['related'])}
+    except (FileNotFoundError, KeyError, IndexError, json.JSONDecodeError):
+        return {}
+
+def update_related_articles():
+    """
+    Recompute the related-articles graph for every article.
+    
+    Saves the graph to json/related.json (ids listed once, related articles as
+    positions in that list) and rewrites the related section of every article
+    page whose rendered section changed: a different set of related articles, or
+    a related article whose title, excerpt or image changed.
+    """
+    articles_path = os.path.join(PROJECT_ROOT, 'json', 'articles.json')
+    try:
+        with open(articles_path, 'r', encoding='utf-8') as f:
+            articles = json.load(f)
     except Exception as e:
-        print(f"Error reading pages folder: {e}")
+        print(f"Error reading articles.json: {e}")
+        return False
     
-    # Add articles from articles folder
-    articles_folder = os.path.join(PROJECT_ROOT, 'articles')
     try:
-        for filename in os.listdir(articles_folder):
-            if filename.endswith('.html'):
-                sitemap_content.append('  <url>')
-                sitemap_content.append(f'    <loc>{base_url}/articles/{filename}</loc>')
-                sitemap_content.append(f'    <lastmod>{datetime.now().strftime("%Y-%m-%d")}</lastmod>')
-                sitemap_content.append('    <changefreq>weekly</changefreq>')
-                sitemap_content.append('    <priority>0.8</priority>')
-                sitemap_content.append('  </url>')
+        graph = related_articles.compute_related_graph(articles, RELATED_COUNT)
+        by_id = {article['id']: article for article in articles}
+        
+        updated = 0
+        for article_id, related_ids in graph.items():
+            page_path = os.path.join(PROJECT_ROOT, 'articles', f'{article_id}.html')
+            if not os.path.exists(page_path):
+                continue
+            with open(page_path, 'r', encoding='utf-8') as f:
+                page_html = f.read()
+            
+            # Compare the rendered cards, not the ids, so edits to related articles show up too
+            new_html = replace_related_section(page_html, render_related_section([by_id[other] for other in related_ids]))
+            if new_html and new_html != page_html:
+                with open(page_path, 'w', encoding='utf-8') as f:
+                    f.write(new_html)
+                updated += 1
+        
+        ids = [article['id'] for article in articles]
+        positions = {article_id: row for row, article_id in enumerate(ids)}
+        data = {
+            "top_k": RELATED_COUNT,
+            "ids": ids,
+            "related": [[positions[other] for other in graph[article_id]] for article_id in ids]
+        }
+        article_store.write_text_atomic(RELATED_INDEX_PATH, json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+        
+        print(f"Updated related articles ({updated} article pages changed)")
+        return True
     except Exception as e:
-        print(f"Error reading articles folder: {e}")
+        print(f"Error updating related articles: {e}")
+        return False
+
+def select_featured(records):
+    """
+    Pick the home page's featured articles, in json/featured.json order.
+    
+    Args:
+        records (list): Article records (or shard records) to pick from
+    
+    Returns:
+        list: Up to FEATURED_COUNT records
+    """
+    by_id = {record['id']: record for record in records}
+    featured = [by_id[article_id] for article_id in article_store.load_featured_ids() if article_id in by_id]
+    return featured[:FEATURED_COUNT]
+
+def group_by_category(records, categories):
+    """
+    Group records by category slug, keeping articles.json order like getArticlesByCategory().
+    
+    Every category of categories.json gets an entry, even without articles.
+    """
+    slugs = {category['name'].lower(): category['slug'] for category in categories}
+    by_category = {slug: [] for slug in slugs.values()}
+    for record in records:
+        category = (record.get('category') or '').lower()
+        by_category.setdefault(slugs.get(category, category), []).append(record)
+    return by_category
+
+def paginate_from_oldest(records, page_size):
+    """
+    Split newest-first records into pages cut from the oldest end.
+    
+    Every page except the first (newest) one holds exactly page_size records, so
+    publishing an article only changes the first page, or adds a page when the
+    first one was full.
+    
+    Returns:
+        list: Pages of records, newest page first
+    """
+    total = len(records)
+    starts = list(range(total % page_size, total, page_size))
+    if total % page_size:
+        starts.insert(0, 0)
+    return [records[start:end] for start, end in zip(starts, starts[1:] + [total])]
+
+def split_listing(records, page_size):
+    """
+    Split newest-first records into a category's landing page and archive pages.
+    
+    The landing page always shows the newest page_size records. Archive pages hold
+    exactly page_size records each, cut from the oldest end and numbered from it
+    (archive page 1 holds the oldest records), so once written an archive page
+    never changes. Newer records that don't fill an archive page yet are only on
+    the landing page, and a page that is entirely on the landing page isn't
+    archived until the next record pushes it off.
+    
+    Returns:
+        tuple: (landing page records, archive pages oldest first)
+    """
+    total = len(records)
+    archive_count = (total - 1) // page_size if total else 0
+    archive = [records[total - number * page_size:total - (number - 1) * page_size] for number in range(1, archive_count + 1)]
+    return records[:page_size], archive
+
+def write_shard(name, data, written):
+    """Write a shard under a content-hashed filename and return that filename"""
+    payload = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    filename = f"{name}.{hashlib.sha256(payload).hexdigest()[:10]}.json"
+    path = os.path.join(SHARDS_DIR, filename)
+    # Same name means same content, so existing shards are left untouched
+    if not os.path.exists(path):
+        with open(path, 'wb') as f:
+            f.write(payload)
+    written.add(filename)
+    return filename
+
+def generate_article_shards():
+    """
+    Split json/articles.json into small content-hashed shards for the frontend.
     
-    # Add category pages
-    category_folder = os.path.join(PROJECT_ROOT, 'category')
+    Writes to json/shards/:
+    - featured.{hash}.json: the featured articles shown on the home page
+    - {category}-{page}.{hash}.json: each category's articles, newest page first in the
+      manifest and at most SHARD_PAGE_SIZE per page
+    - related-{bucket}.{hash}.json: related articles (from json/related.json) keyed by
+      article id, with ids spread over buckets by related_bucket()
+    - manifest.json: the current filename of every shard
+    
+    Shards listed in neither the new nor the previous manifest are deleted.
+    """
+    articles_path = os.path.join(PROJECT_ROOT, 'json', 'articles.json')
+    categories_path = os.path.join(PROJECT_ROOT, 'json', 'categories.json')
     try:
-        for filename in os.listdir(category_folder):
-            if filename.endswith('.html'):
-                sitemap_content.append('  <url>')
-                sitemap_content.append(f'    <loc>{base_url}/category/{filename}</loc>')
-                sitemap_content.append(f'    <lastmod>{datetime.now().strftime("%Y-%m-%d")}</lastmod>')
-                sitemap_content.append('    <changefreq>weekly</changefreq>')
-                sitemap_content.append('    <priority>0.6</priority>')
-                sitemap_content.append('  </url>')
+        with open(articles_path, 'r', encoding='utf-8') as f:
+            articles = json.load(f)
+        with open(categories_path, 'r', encoding='utf-8') as f:
+            categories = json.load(f).get('categories', [])
     except Exception as e:
-        print(f"Error reading category folder: {e}")
+        print(f"Error reading articles for shards: {e}")
+        return False
     
-    sitemap_content.append('</urlset>')
+    try:
+        os.makedirs(SHARDS_DIR, exist_ok=True)
+        written = set()
+        records = [{field: article.get(field) for field in SHARD_FIELDS} for article in articles]
+        
+        manifest = {
+            "page_size": SHARD_PAGE_SIZE,
+            "featured": write_shard('featured', select_featured(records), written),
+            "categories": {},
+            "related": []
+        }
+        
+        for slug, category_records in group_by_category(records, categories).items():
+            # Shards are numbered from the oldest page, so their names don't move either
+            page_records = paginate_from_oldest(category_records, SHARD_PAGE_SIZE)
+            pages = [
+                write_shard(f"{slug}-{len(page_records) - index}", page, written)
+                for index, page in enumerate(page_records)
+            ]
+            manifest["categories"][slug] = {"count": len(category_records), "pages": pages}
+        
+        # Related articles from the precomputed graph, bucketed so the manifest doesn't
+        # grow with every article
+        related_index = load_related_index()
+        records_by_id = {record['id']: record for record in records}
+        
+        bucket_count = 1
+        while bucket_count * RELATED_ARTICLES_PER_BUCKET < len(records):
+            bucket_count *= 2
+        buckets = [{} for _ in range(bucket_count)]
+        for record in records:
+            related = [records_by_id[other] for other in related_index.get(record['id'], []) if other in records_by_id]
+            buckets[related_bucket(record['id'], bucket_count)][record['id']] = related
+        manifest["related"] = [write_shard(f"related-{index}", bucket, written) for index, bucket in enumerate(buckets)]
+        
+        # Swap in the new manifest, then drop shards nothing refers to anymore. Shards of the
+        # previous manifest are kept one more generation for browsers still holding it.
+        manifest_path = os.path.join(SHARDS_DIR, 'manifest.json')
+        keep = set(written)
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+            keep.add(previous['featured'])
+            keep.update(previous['related'])
+            for info in previous['categories'].values():
+                keep.update(info['pages'])
+        except (FileNotFoundError, KeyError, json.JSONDecodeError):
+            pass
+        
+        tmp_path = f"{manifest_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, manifest_path)
+        
+        removed = 0
+        for filename in os.listdir(SHARDS_DIR):
+            if filename != 'manifest.json' and filename not in keep:
+                os.remove(os.path.join(SHARDS_DIR, filename))
+                removed += 1
+        
+        print(f"Generated {len(written)} article shards ({removed} stale shards removed)")
+        return True
+    except Exception as e:
+        print(f"Error generating article shards: {e}")
+        return False
+
+# Placeholder cards for short listings, like createComingSoonCard() in js/articles.js
+FEATURED_COMING_SOON = [
+    ('More Featured Content Coming Soon', 'Stay tuned for more featured articles covering the latest trends across technology, lifestyle, and innovation.'),
+    ('Exciting Featured Articles', 'Discover upcoming featured content that will keep you informed about the latest developments in various industries.'),
+    ('Featured Insights & Trends', 'Get ready for fresh featured perspectives and expert analysis on topics that matter most to you.'),
+    ('Discover Featured Perspectives', 'More engaging featured content is on the way to help you stay ahead of the curve.'),
+    ('Stay Tuned for Featured Updates', "We're working on exciting new featured articles that will provide valuable insights and trends."),
+    ('Fresh Featured Content on the Way', 'Coming soon: comprehensive featured guides and analysis on trending topics.'),
+    ('New Featured Articles in Development', 'New featured content is being developed to bring you the latest industry insights.'),
+    ('Coming Soon: Featured Expert Analysis', 'Stay connected for upcoming featured articles featuring expert opinions and trend analysis.'),
+    ('More Featured Stories to Explore', 'More featured stories and insights are coming to help you discover the latest trends.')
+]
+
+def category_coming_soon(name):
+    """Placeholder (title, excerpt) pairs for a category with fewer than three articles"""
+    lower = name.lower()
+    return [
+        (f'{name} Articles Coming Soon', f'Stay tuned for exciting content about {lower} trends and insights.'),
+        (f'More {name} Content', f'Discover more insightful articles about {lower} trends and insights.'),
+        (f'Discover {name} Insights', f'Get ready for fresh perspectives on {lower} topics.')
+    ]
+
+def render_coming_soon_card(category, title, excerpt):
+    """Render the same placeholder card markup as createComingSoonCard() in js/articles.js"""
+    return f"""
+                <article class="article-card" style="opacity: 0.6;">
+                    <div class="article-card__image">
+                        <div style="height: 200px; background: linear-gradient(135deg, #f3f4f6 0%, #e5e7eb 100%); display: flex; align-items: center; justify-content: center; border-radius: var(--border-radius);">
+                            <span style="color: var(--text-light); font-size: var(--font-size-sm);">Articles coming soon</span>
+                        </div>
+                    </div>
+                    <div class="article-card__content">
+                        <div class="article-card__meta">
+                            <span class="article-card__category">{category}</span>
+                            <time class="article-card__date" datetime="2024-12-01">Coming Soon</time>
+                        </div>
+                        <h3 class="article-card__title">
+                            <a href="#" style="pointer-events: none;">{html.escape(truncate_text(title, 60))}</a>
+                        </h3>
+                        <p class="article-card__excerpt">{html.escape(truncate_text(excerpt, 150))}</p>
+                    </div>
+                </article>"""
+
+def category_page_href(slug, number, current):
+    """Link to archive page number (None: the landing page) of a category, relative to page current"""
+    if current is None:
+        return f'{slug}.html' if number is None else f'{slug}/page/{number}.html'
+    return f'../../{slug}.html' if number is None else f'{number}.html'
+
+def render_pagination(name, slug, page, archive_count):
+    """
+    Render the links between the pages of a category listing.
+    
+    Archive pages only link to the landing page and to older archive pages, which
+    never change, so an archive page stays byte-identical as newer ones are added.
+    
+    Args:
+        name (str): Category name, for the navigation label
+        slug (str): Category slug
+        page (int): Current archive page number, or None for the landing page
+        archive_count (int): Number of archive pages
+    """
+    if not archive_count:
+        return ''
+    
+    newest = archive_count if page is None else page
+    links = []
+    if page is None:
+        links.append('<span class="pagination__link pagination__link--active" aria-current="page">Latest</span>')
+    else:
+        links.append(f'<a href="{category_page_href(slug, None, page)}" class="pagination__link">Latest</a>')
+    for number in range(newest, 0, -1):
+        if number == page:
+            links.append(f'<span class="pagination__link pagination__link--active" aria-current="page">{number}</span>')
+        else:
+            links.append(f'<a href="{category_page_href(slug, number, page)}" class="pagination__link">{number}</a>')
+    older = archive_count if page is None else page - 1
+    if older:
+        links.append(f'<a href="{category_page_href(slug, older, page)}" class="pagination__link" rel="next">Older</a>')
+    
+    items = ''.join(f'\n                {link}' for link in links)
+    return f"""
+            <nav class="pagination" aria-label="{name} pages">{items}
+            </nav>"""
+
+def render_listing(cards_html, pagination_html=''):
+    """Render a pre-rendered articles grid (plus pagination) between the listing markers"""
+    return f"""{LISTING_START}
+            <div class="articles-grid" data-prerendered="true">{cards_html}
+            </div>{pagination_html}
+            {LISTING_END}"""
+
+def replace_listing(page_html, listing_html):
+    """
+    Swap the listing of a page.
+    
+    Pages that were never pre-rendered get their first, still empty articles grid
+    replaced. Returns None if the page has no articles grid.
+    """
+    start = page_html.find(LISTING_START)
+    end = page_html.find(LISTING_END)
+    if start != -1 and end != -1:
+        return page_html[:start] + listing_html + page_html[end + len(LISTING_END):]
+    
+    start = page_html.find('<div class="articles-grid">')
+    if start == -1:
+        return None
+    end = page_html.index('</div>', start) + len('</div>')
+    return page_html[:start] + listing_html + page_html[end:]
+
+def relocate_links(page_html, prefix):
+    """Prefix every relative href/src of a page, for a copy placed in a subfolder"""
+    return re.sub(
+        r'\b(href|src)="(?![a-z]+:|/|#)([^"]*)"',
+        lambda match: f'{match.group(1)}="{prefix}{match.group(2)}"',
+        page_html
+    )
+
+def write_if_changed(path, content):
+    """Write a text file unless it already has this content; returns True if it was written"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == content:
+                return False
+    except FileNotFoundError:
+        pass
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return True
+
+def generate_listing_pages():
+    """
+    Pre-render the article listings of index.html and the category pages.
+    
+    index.html gets its featured grid, with the first row loaded eagerly, and
+    category/{slug}.html the newest LISTING_PAGE_SIZE articles of the category.
+    Older articles go to archive pages category/{slug}/page/{n}.html, copies of
+    the category page linked from a pagination bar and numbered from the oldest
+    article (see split_listing()). Pages that no longer have articles are deleted.
+    """
+    articles_path = os.path.join(PROJECT_ROOT, 'json', 'articles.json')
+    categories_path = os.path.join(PROJECT_ROOT, 'json', 'categories.json')
+    try:
+        with open(articles_path, 'r', encoding='utf-8') as f:
+            articles = json.load(f)
+        with open(categories_path, 'r', encoding='utf-8') as f:
+            categories = json.load(f).get('categories', [])
+    except Exception as e:
+        print(f"Error reading articles for listing pages: {e}")
+        return False
     
-    # Save sitemap.xml
-    sitemap_path = os.path.join(PROJECT_ROOT, 'sitemap.xml')
     try:
-        with open(sitemap_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(sitemap_content))
-        print("Generated sitemap.xml successfully")
+        base_url = "https://omnitrends.github.io"
+        written = 0
+        
+        # Home page: featured articles, topped up with placeholders
+        featured = select_featured(articles)
+        # The first row is above the fold; its first image is usually the LCP element
+        cards = ''.join(
+            render_article_card(article, base_path='', lazy=position >= HOME_FIRST_ROW,
+                                fetchpriority='high' if position == 0 else None)
+            for position, article in enumerate(featured)
+        )
+        cards += ''.join(
+            render_coming_soon_card('Featured', *FEATURED_COMING_SOON[i % len(FEATURED_COMING_SOON)])
+            for i in range(FEATURED_COUNT - len(featured))
+        )
+        index_path = os.path.join(PROJECT_ROOT, 'index.html')
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index_html = f.read()
+        new_html = replace_listing(index_html, render_listing(cards))
+        if new_html and write_if_changed(index_path, new_html):
+            written += 1
+        
+        by_category = group_by_category(articles, categories)
+        for category in categories:
+            name, slug = category['name'], category['slug']
+            category_path = os.path.join(PROJECT_ROOT, 'category', f'{slug}.html')
+            if not os.path.exists(category_path):
+                continue
+            with open(category_path, 'r', encoding='utf-8') as f:
+                category_html = f.read()
+            
+            category_articles = by_category.get(slug, [])
+            landing, archive = split_listing(category_articles, LISTING_PAGE_SIZE)
+            pages_dir = os.path.join(PROJECT_ROOT, 'category', slug, 'page')
+            pages = [(None, landing)] + list(enumerate(archive, start=1))
+            
+            for number, page_articles in pages:
+                if number is None:
+                    base_path = '../'
+                    page_html = category_html
+                else:
+                    base_path = '../../../'
+                    page_html = relocate_links(category_html, '../../')
+                    page_html = page_html.replace(f'{base_url}/category/{slug}.html', f'{base_url}/category/{slug}/page/{number}.html')
+                    page_html = re.sub(r'<title>(.*?) - OmniTrends</title>', rf'<title>\1 - Page {number} - OmniTrends</title>', page_html, count=1)
+                
+                cards = ''.join(render_article_card(article, base_path=base_path) for article in page_articles)
+                if len(category_articles) < 3:
+                    cards += ''.join(
+                        render_coming_soon_card(name, *placeholder)
+                        for placeholder in category_coming_soon(name)[:3 - len(category_articles)]
+                    )
+                listing = render_listing(cards, render_pagination(name, slug, number, len(archive)))
+                new_html = replace_listing(page_html, listing)
+                if not new_html:
+                    print(f"No articles grid found in category/{slug}.html")
+                    break
+                
+                if number is None:
+                    target = category_path
+                else:
+                    os.makedirs(pages_dir, exist_ok=True)
+                    target = os.path.join(pages_dir, f'{number}.html')
+                if write_if_changed(target, new_html):
+                    written += 1
+            
+            # Archive pages beyond the current count
+            if os.path.isdir(pages_dir):
+                for filename in os.listdir(pages_dir):
+                    page_number = filename[:-len('.html')]
+                    if filename.endswith('.html') and (not page_number.isdigit() or int(page_number) > len(archive)):
+                        os.remove(os.path.join(pages_dir, filename))
+        
+        print(f"Generated listing pages ({written} pages changed)")
         return True
     except Exception as e:
-        print(f"Error writing sitemap.xml: {e}")
+        print(f"Error generating listing pages: {e}")
         return False
 
 def generate_robots_txt():
@@ -584,7 +941,8 @@ def generate_robots_txt():
         "",
         "Allow: /",
         "# Sitemap location",
-        "Sitemap: https://omnitrends.github.io/sitemap.xml"
+        "Sitemap: https://omnitrends.github.io/sitemap.xml",
+        "Sitemap: https://omnitrends.github.io/sitemap-news.xml"
     ]
     
     robots_path = os.path.join(PROJECT_ROOT, 'robots.txt')
@@ -624,27 +982,37 @@ def main():
         print("Failed to process image files. Exiting.")
         return False
     
-    # Step 5: Update articles.json
+    # Step 5: Update articles.json and the featured articles (only top 9)
     if not update_articles_json():
         print("Failed to update articles.json. Exiting.")
         return False
     
-    # Step 6: Update featured articles (only top 9)
-    if not update_featured_articles():
-        print("Failed to update featured articles. Exiting.")
+    # Step 6: Update the related articles graph and article pages
+    if not update_related_articles():
+        print("Failed to update related articles. Exiting.")
+        return False
+    
+    # Step 7: Generate the frontend JSON shards
+    if not generate_article_shards():
+        print("Failed to generate article shards. Exiting.")
+        return False
+    
+    # Step 8: Pre-render the home and category listings
+    if not generate_listing_pages():
+        print("Failed to generate listing pages. Exiting.")
         return False
     
-    # Step 7: Generate sitemap.xml
+    # Step 9: Generate sitemap.xml
     if not generate_sitemap():
         print("Failed to generate sitemap.xml. Exiting.")
         return False
     
-    # Step 8: Generate robots.txt
+    # Step 10: Generate robots.txt
     if not generate_robots_txt():
         print("Failed to generate robots.txt. Exiting.")
         return False
     
-    # Step 9: Clear temp folder
+    # Step 11: Clear temp folder
     if not clear_temp_folder():
         print("Failed to clear temp folder. Exiting.")
         return False
@@ -1,9 +1,9 @@
 import os
 import json
-import time
 import sys
-from google import genai
 from google.genai import types
+from gemini_client import generate_image_data, generate_text, get_client, request_config
+import image_pipeline
 from PIL import Image
 from io import BytesIO
 import base64
@@ -17,6 +17,9 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 # Get the project root directory (parent of python directory)
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 
+# Image generation is much slower than text, so give it a longer timeout
+IMAGE_TIMEOUT_SECONDS = 300
+
 def read_markdown_file(file_path):
     """
     Read the content of a markdown file.
@@ -50,8 +53,10 @@ def generate_image_prompt(article_content):
         str: Generated image prompt
     """
     try:
-        # Initialize Gemini client
-        client = genai.Client(api_key=os.getenv('GEMINI_API_KEY'))
+        # Get the shared Gemini client
+        client = get_client()
+        if not client:
+            sys.exit(1)
         
         # Create prompt for generating image description
         prompt = f"""
@@ -71,15 +76,14 @@ def generate_image_prompt(article_content):
         Generate only the image prompt, nothing else. Make it detailed and specific for best results.
         """
         
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=prompt,
-            config=types.GenerateContentConfig(
+        image_prompt = generate_text(
+            client,
+            "gemini-2.5-flash",
+            prompt,
+            types.GenerateContentConfig(
                 thinking_config=types.ThinkingConfig(thinking_budget=0)  # Disables thinking
             ),
         )
-        
-        image_prompt = response.text.strip()
         print(f"Generated image prompt: {image_prompt}")
         return image_prompt
         
@@ -99,29 +103,27 @@ def generate_image(prompt):
         PIL.Image: Generated image object
     """
     try:
-        # Initialize Gemini client
-        client = genai.Client(api_key=os.getenv('GEMINI_API_KEY'))
+        # Get the shared Gemini client
+        client = get_client()
+        if not client:
+            sys.exit(1)
         
         # Add size specification to the prompt
         full_prompt = f"{prompt}. Image size: 1200x630 pixels, high quality, professional look."
         
-        response = client.models.generate_content(
-            model="gemini-2.0-flash-preview-image-generation",
-            contents=full_prompt,
-            config=types.GenerateContentConfig(
-                response_modalities=['TEXT', 'IMAGE']
-            )
+        model = "gemini-2.0-flash-preview-image-generation"
+        config = types.GenerateContentConfig(
+            response_modalities=['TEXT', 'IMAGE']
+        )
+        
+        # Goes through the response cache, so an image generated by a failed run is reused
+        image_data = generate_image_data(
+            client, model, full_prompt, request_config(config, timeout=IMAGE_TIMEOUT_SECONDS)
         )
+        if image_data is not None:
+            print("Image generated successfully")
+            return Image.open(BytesIO(image_data))
         
-        # Extract image from response
-        for part in response.candidates[0].content.parts:
-            if part.text is not None:
-                print(f"Image generation response: {part.text}")
-            elif part.inline_data is not None:
-                image = Image.open(BytesIO(part.inline_data.data))
-                print("Image generated successfully")
-                return image
-                
         print("No image found in response")
         print("Exiting due to image generation failure.")
         sys.exit(1)
@@ -133,23 +135,20 @@ def generate_image(prompt):
 
 def save_image(image, output_path):
     """
-    Save the generated image to the specified path.
+    Save the generated image losslessly for html_generator.py to publish.
+    
+    Resizing and the WebP encode happen once, in image_pipeline, so this copy
+    keeps the generator's pixels untouched.
     
     Args:
         image (PIL.Image): Image object to save
-        output_path (str): Path where to save the image
+        output_path (str): Path where to save the image (.png)
         
     Returns:
         bool: True if successful, False otherwise
     """
     try:
-        # Resize image to exact requirements if needed
-        if image.size != (1200, 630):
-            image = image.resize((1200, 630), Image.Resampling.LANCZOS)
-            print(f"Resized image to 1200x630 pixels")
-        
-        # Save as JPEG
-        image.save(output_path, 'JPEG', quality=95)
+        image.save(output_path, 'PNG')
         print(f"Image saved successfully to: {output_path}")
         return True
         
@@ -179,9 +178,60 @@ def read_id_from_json(json_path):
         print(f"Error reading ID from JSON: {str(e)}")
         return None
 
+def add_image_metadata(data, id_value):
+    """
+    Add the image keys to an article metadata record.
+    
+    Args:
+        data (dict): Article metadata record
+        id_value (str): ID value to use for the image filename
+        
+    Returns:
+        dict: New record with keys in the articles.json order
+    """
+    data = dict(data)
+    
+    # Add image key after date and before url, followed by the sizes image_pipeline
+    # writes so pages can use srcset and reserve the image's space
+    # (featured status is kept in json/featured.json, not in the record)
+    data['image'] = f"{id_value}.webp"
+    data.update(image_pipeline.image_metadata(image_pipeline.output_formats()))
+    
+    # Reorder keys to match the required structure
+    ordered_data = {}
+    for key in ['id', 'keyword', 'title', 'category', 'date', 'image', 'image_width', 'image_height',
+                'image_widths', 'image_formats', 'url', 'excerpt']:
+        if key in data:
+            ordered_data[key] = data[key]
+    return ordered_data
+
+def create_article_image(article_content):
+    """
+    Generate the article image from its markdown content.
+    
+    Args:
+        article_content (str): Content of the article
+        
+    Returns:
+        PIL.Image: Generated image object
+    """
+    # Generate image prompt using Gemini
+    image_prompt = generate_image_prompt(article_content)
+    if not image_prompt:
+        print("Failed to generate image prompt. Exiting.")
+        sys.exit(1)
+    
+    # Generate image using Gemini
+    generated_image = generate_image(image_prompt)
+    if not generated_image:
+        print("Failed to generate image. Exiting.")
+        sys.exit(1)
+    
+    return generated_image
+
 def update_keyword_selection_json(json_path, id_value):
     """
-    Update the keyword_selection.json file with image and featured keys.
+    Update the keyword_selection.json file with the image key.
     
     Args:
         json_path (str): Path to the JSON file
@@ -195,22 +245,13 @@ def update_keyword_selection_json(json_path, id_value):
         with open(json_path, 'r', encoding='utf-8') as file:
             data = json.load(file)
         
-        # Add image key after date and before url
-        # Add featured key after excerpt (at the end)
-        data['image'] = f"{id_value}.webp"
-        data['featured'] = True
-        
-        # Reorder keys to match the required structure
-        ordered_data = {}
-        for key in ['id', 'keyword', 'title', 'category', 'date', 'image', 'url', 'excerpt', 'featured']:
-            if key in data:
-                ordered_data[key] = data[key]
+        ordered_data = add_image_metadata(data, id_value)
         
         # Write updated JSON data
         with open(json_path, 'w', encoding='utf-8') as file:
             json.dump(ordered_data, file, indent=2, ensure_ascii=False)
         
-        print(f"Updated JSON file with image: {id_value}.webp and featured: true")
+        print(f"Updated JSON file with image: {id_value}.webp")
         return True
         
     except Exception as e:
@@ -224,7 +265,7 @@ def main():
     # File paths
     markdown_path = os.path.join(PROJECT_ROOT, 'temp', 'final.md')
     json_path = os.path.join(PROJECT_ROOT, 'temp', 'keyword_selection.json')
-    output_image_path = os.path.join(PROJECT_ROOT, 'temp', 'final.jpg')
+    output_image_path = os.path.join(PROJECT_ROOT, 'temp', 'final.png')
     
     print("Starting image generation process...")
     
@@ -234,21 +275,8 @@ def main():
         print("Failed to read markdown file. Exiting.")
         return
     
-    # Step 2: Generate image prompt using Gemini
-    image_prompt = generate_image_prompt(article_content)
-    if not image_prompt:
-        print("Failed to generate image prompt. Exiting.")
-        sys.exit(1)
-    
-    # Wait 30 seconds before next API call
-    print("Waiting 30 seconds before image generation...")
-    time.sleep(30)
-    
-    # Step 3: Generate image using Gemini
-    generated_image = generate_image(image_prompt)
-    if not generated_image:
-        print("Failed to generate image. Exiting.")
-        sys.exit(1)
+    # Steps 2-3: Generate image prompt and image using Gemini
+    generated_image = create_article_image(article_content)
     
     # Step 4: Save image
     if not save_image(generated_image, output_image_path):
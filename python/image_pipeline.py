@@ -0,0 +1,190 @@
+"""
+Article image pipeline
+Turns the in-memory PIL image from image_generator.generate_image() into the
+published files under images/ in one pass: the image is decoded once, resized
+once per output size and encoded once per format, with no lossy intermediate
+files in between. Each article gets several widths for srcset (and AVIF next to
+WebP when enabled), resized and encoded in a thread pool since Pillow releases
+the GIL while it works.
+"""
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+import article_index
+import article_store
+
+# Get the directory where this script is located
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Get the project root directory (parent of python directory)
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+IMAGES_DIR = os.path.join(PROJECT_ROOT, 'images')
+IMAGE_SIZE = (1200, 630)
+# Widths written for srcset; the full width keeps the plain {id}.webp name used by og:image
+WIDTHS = (320, 640, 960, 1200)
+
+# Pillow format name and save options per file extension
+FORMATS = {
+    'webp': ('WEBP', {'quality': 85, 'optimize': True}),
+    'avif': ('AVIF', {'quality': 60}),
+    'jpg': ('JPEG', {'quality': 90, 'optimize': True, 'progressive': True})
+}
+DEFAULT_FORMATS = ('webp',)
+
+def avif_supported():
+    """Whether Pillow can write AVIF (built in since Pillow 11.2, or via the pillow-avif-plugin package)"""
+    try:
+        import pillow_avif  # noqa: F401 (registers the AVIF plugin on older Pillow)
+    except ImportError:
+        pass
+    Image.init()
+    return 'AVIF' in Image.SAVE
+
+def output_formats():
+    """Formats to publish: WebP, plus AVIF when IMAGE_AVIF=1 and Pillow supports it"""
+    if os.getenv('IMAGE_AVIF', '0') == '1':
+        if avif_supported():
+            return ('avif',) + DEFAULT_FORMATS
+        print("Warning: IMAGE_AVIF=1 but Pillow can't write AVIF, publishing WebP only")
+    return DEFAULT_FORMATS
+
+def variant_size(width):
+    """Size of a variant of the given width, keeping the 1200x630 aspect ratio"""
+    return width, round(width * IMAGE_SIZE[1] / IMAGE_SIZE[0])
+
+def image_filename(article_id, ext, width=IMAGE_SIZE[0]):
+    """Name of an output file in images/: {id}.webp at full width, {id}-640w.webp below it"""
+    if width == IMAGE_SIZE[0]:
+        return f"{article_id}.{ext}"
+    return f"{article_id}-{width}w.{ext}"
+
+def output_paths(article_id, formats=DEFAULT_FORMATS, widths=WIDTHS, output_dir=IMAGES_DIR):
+    """Paths of every file process_article_image() writes for an article"""
+    return [os.path.join(output_dir, image_filename(article_id, ext, width)) for width in widths for ext in formats]
+
+def image_metadata(formats=DEFAULT_FORMATS, widths=WIDTHS):
+    """
+    Image fields of an article record, so pages can build srcset and reserve space
+    for the image before it loads.
+    """
+    return {
+        "image_width": IMAGE_SIZE[0],
+        "image_height": IMAGE_SIZE[1],
+        "image_widths": list(widths),
+        "image_formats": list(formats)
+    }
+
+def srcset(prefix, article_id, widths, ext):
+    """srcset value listing every width of one format, e.g. "../images/x-320w.webp 320w, ..." """
+    return ', '.join(f"{prefix}{image_filename(article_id, ext, width)} {width}w" for width in widths)
+
+def prepare_image(image):
+    """Decode the image fully and convert it to RGB, once, before it is shared between threads"""
+    image.load()
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    return image
+
+def resize_image(image, size):
+    """Resize to an exact size (the generator doesn't always return 1200x630)"""
+    if image.size == size:
+        return image
+    return image.resize(size, Image.Resampling.LANCZOS)
+
+def encode_image(image, path, ext):
+    """Encode one output file, replacing any previous version atomically"""
+    pil_format, options = FORMATS[ext]
+    tmp_path = f"{path}.tmp"
+    try:
+        image.save(tmp_path, pil_format, **options)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+def write_variant(image, article_id, width, formats, output_dir):
+    """Resize once to one width and encode that size in every format"""
+    resized = resize_image(image, variant_size(width))
+    return [encode_image(resized, os.path.join(output_dir, image_filename(article_id, ext, width)), ext) for ext in formats]
+
+def process_article_image(image, article_id, formats=DEFAULT_FORMATS, widths=WIDTHS, output_dir=IMAGES_DIR, max_workers=None):
+    """
+    Write the published image files of an article from its generated image.
+
+    Every width is resized straight from the source image, once, and encoded once
+    per format.
+
+    Args:
+        image (PIL.Image): Generated image, straight from the generator
+        article_id (str): Article id, used for the file names
+        formats (tuple): File extensions to write, keys of FORMATS
+        widths (tuple): Widths to write (the full 1200px one included)
+        output_dir (str): Folder to write into (default: images/)
+        max_workers (int): Resize/encode threads when there are several widths (default: one per width)
+
+    Returns:
+        list: Paths of the files written
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    image = prepare_image(image)
+
+    if len(widths) > 1 and max_workers != 1:
+        with ThreadPoolExecutor(max_workers=max_workers or len(widths)) as pool:
+            results = list(pool.map(lambda width: write_variant(image, article_id, width, formats, output_dir), widths))
+    else:
+        results = [write_variant(image, article_id, width, formats, output_dir) for width in widths]
+    return [path for paths in results for path in paths]
+
+def backfill_variants(formats=None):
+    """
+    Write the missing variants of already published articles from their full-size
+    images/{id}.webp and add the image fields to their articles.json records.
+
+    Returns:
+        bool: True if every article had an image to work from
+    """
+    formats = formats or output_formats()
+    metadata = image_metadata(formats)
+    success = True
+    created = 0
+    keyword_index = article_index.get_article_index()
+    with article_store.transaction() as articles:
+        for index, article in enumerate(articles):
+            article_id = article['id']
+            source_path = os.path.join(IMAGES_DIR, image_filename(article_id, 'webp'))
+            if not os.path.exists(source_path):
+                print(f"Warning: no image for article {article_id}")
+                success = False
+                continue
+
+            if any(not os.path.exists(path) for path in output_paths(article_id, formats)):
+                with Image.open(source_path) as image:
+                    # The full-size WebP is the source; re-encoding it would only lose quality
+                    smaller = tuple(width for width in WIDTHS if width != IMAGE_SIZE[0])
+                    process_article_image(image, article_id, ('webp',), smaller)
+                    others = tuple(ext for ext in formats if ext != 'webp')
+                    if others:
+                        process_article_image(image, article_id, others)
+                created += 1
+
+            # Image fields go right after "image", as add_image_metadata() orders them
+            record = {}
+            for key, value in article.items():
+                if key not in metadata:
+                    record[key] = value
+                if key == 'image':
+                    record.update(metadata)
+            articles[index] = record
+
+    # Ids and keywords are unchanged, so the index only needs the new file version
+    if keyword_index:
+        keyword_index.mark_synced()
+    print(f"Wrote image variants for {created} of {len(articles)} articles")
+    return success
+
+if __name__ == "__main__":
+    sys.exit(0 if backfill_variants() else 1)
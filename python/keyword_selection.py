@@ -1,6 +1,10 @@
 import json
 import os
 import sys
+import article_index
+import keyword_similarity
+import related_articles
+import trend_history
 
 # Get the directory where this script is located
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -29,57 +33,201 @@ def save_json_file(file_path, data):
         print(f"Error saving file {file_path}: {e}")
         sys.exit(1)
 
-def main():
-    # Define file paths using PROJECT_ROOT
-    trends_file = os.path.join(PROJECT_ROOT, 'temp', 'latest_trends.json')
-    articles_file = os.path.join(PROJECT_ROOT, 'json', 'articles.json')
-    output_file = os.path.join(PROJECT_ROOT, 'temp', 'keyword_selection.json')
-    
-    # Load latest trends
-    print("Loading latest trends...")
-    trends_data = load_json_file(trends_file)
-    
-    # Load existing articles
-    print("Loading existing articles...")
-    articles_data = load_json_file(articles_file)
-    
-    # Extract existing keywords from articles.json
+def load_existing_keywords(articles_data):
+    """Return the set of lowercase keywords already covered in articles.json."""
     existing_keywords = set()
     for article in articles_data:
         if 'keyword' in article:
             existing_keywords.add(article['keyword'].lower())
+    return existing_keywords
+
+def load_keyword_lookup(articles_file):
+    """
+    Return a container answering "keyword already covered?" for lowercase keywords.
     
+    Uses the persistent article index, and only falls back to parsing the whole
+    of articles.json when the index can't be opened.
+    """
+    index = article_index.get_article_index()
+    if index:
+        print(f"Using article index ({len(index)} articles)")
+        return index
+    
+    print("Loading existing articles...")
+    existing_keywords = load_existing_keywords(load_json_file(articles_file))
     print(f"Found {len(existing_keywords)} existing keywords in articles.json")
+    return existing_keywords
+
+def load_similarity_index(articles_file, threshold=None):
+    """
+    Build the near-duplicate index over existing article keywords and titles.
+    
+    Args:
+        articles_file (str): Path to articles.json, read only if the article index is unavailable
+        threshold (float): Threshold that will be used (default: KEYWORD_SIMILARITY_THRESHOLD)
+        
+    Returns:
+        NearDuplicateIndex: The index, or None when fuzzy matching is disabled
+    """
+    if threshold is None:
+        threshold = keyword_similarity.get_threshold()
+    if threshold > 1:
+        return None
+    
+    index = article_index.get_article_index()
+    if index:
+        articles = index.keywords_and_titles()
+    else:
+        articles = [(article.get('id'), article.get('keyword'), article.get('title'), article.get('date'))
+                    for article in load_json_file(articles_file)]
+    return keyword_similarity.build_similarity_index(
+        (article_id, keyword, title, related_articles.parse_article_date(date))
+        for article_id, keyword, title, date in articles
+    )
+
+def find_near_duplicate(trend_name, similarity, threshold, seen, title_threshold=None):
+    """Return a description of the article or pending keyword a trend nearly duplicates, or None"""
+    if title_threshold is None:
+        title_threshold = keyword_similarity.get_title_threshold()
+    match = similarity.find_duplicate(trend_name, threshold, title_threshold)
+    if match:
+        return f"'{match[0]}' ({match[1]:.2f})"
+    for keyword in seen:
+        score = similarity.similarity(trend_name, keyword)
+        if score >= threshold:
+            return f"pending keyword '{keyword}' ({score:.2f})"
+    return None
+
+def select_keywords(trends_data, existing_keywords, limit=1, pending_keywords=(), similarity=None, threshold=None):
+    """
+    Find the highest ranked trends that don't match any existing keyword.
     
+    Args:
+        trends_data (dict): Parsed latest_trends.json payload
+        existing_keywords: Lowercase keywords already covered (a set, or an
+            ArticleIndex from load_keyword_lookup())
+        limit (int): Maximum number of trends to select
+        pending_keywords (iterable): Keywords of unpublished runs that also count as covered
+        similarity (NearDuplicateIndex): Also skip trends that nearly duplicate an
+            existing keyword or title (see load_similarity_index())
+        threshold (float): Cosine similarity to a keyword that counts as a near-duplicate
+            (default: KEYWORD_SIMILARITY_THRESHOLD or 0.53; titles use
+            KEYWORD_TITLE_SIMILARITY_THRESHOLD or 0.65)
+        
+    Returns:
+        list: Selected trend names in rank order (may be empty)
+    """
     # Sort trends by rank and check each one
     trends = trends_data.get('trends', [])
     trends_sorted = sorted(trends, key=lambda x: x.get('rank', float('inf')))
     
     print(f"Checking {len(trends_sorted)} trends starting from rank 1...")
     
-    # Find the first trend that doesn't match any existing keyword
+    selected = []
+    seen = {keyword.lower() for keyword in pending_keywords}
+    if threshold is None:
+        threshold = keyword_similarity.get_threshold()
+    
+    # Collect the first trends that don't match any existing keyword
     for trend in trends_sorted:
+        if len(selected) >= limit:
+            break
+        
         trend_name = trend.get('trend_name', '').lower()
         rank = trend.get('rank')
         
         print(f"Checking rank {rank}: '{trend['trend_name']}'")
         
         # Check if this trend_name matches any existing keyword
-        if trend_name not in existing_keywords:
-            # Found a trend that doesn't match any existing keyword
-            print(f"✓ Found unmatched trend at rank {rank}: '{trend['trend_name']}'")
-            
-            # Create the output data
-            output_data = {
-                "keyword": trend['trend_name']
-            }
-            
-            # Save to keyword_selection.json
-            save_json_file(output_file, output_data)
-            print("Program completed successfully.")
-            sys.exit(0)
-        else:
+        if trend_name in seen or trend_name in existing_keywords:
             print(f"  → Skipping (matches existing keyword)")
+            continue
+        
+        # Then check for near-duplicates of existing articles and of this batch
+        duplicate = find_near_duplicate(trend_name, similarity, threshold, seen) if similarity else None
+        if duplicate:
+            print(f"  → Skipping (near-duplicate of {duplicate})")
+            continue
+        
+        # Found a trend that doesn't match any existing keyword
+        print(f"✓ Found unmatched trend at rank {rank}: '{trend['trend_name']}'")
+        selected.append(trend['trend_name'])
+        seen.add(trend_name)
+    
+    return selected
+
+def rank_by_velocity(trends_data, hours=24):
+    """
+    Re-rank a trends payload by how fast each trend's volume rose in the recorded history.
+    
+    Args:
+        trends_data (dict): Parsed latest_trends.json payload
+        hours (float): Look-back window for the velocity
+        
+    Returns:
+        dict: Copy of the payload with ranks reassigned; unchanged if no history is available
+    """
+    history = trend_history.get_trend_history()
+    if not history:
+        return trends_data
+    
+    velocities = history.trend_velocities(hours)
+    if not velocities:
+        print("No trend history recorded yet, keeping volume ranking")
+        return trends_data
+    
+    def velocity(trend):
+        entry = velocities.get(trend_history.normalize_trend_name(trend.get('trend_name', '')))
+        return entry['velocity'] if entry else 0
+    
+    trends = sorted(trends_data.get('trends', []), key=lambda x: (-velocity(x), x.get('rank', float('inf'))))
+    ranked = [dict(trend, rank=index) for index, trend in enumerate(trends, 1)]
+    print(f"Ranked {len(ranked)} trends by volume velocity over the last {hours:g} hours")
+    return dict(trends_data, trends=ranked, sort_order=f"Descending by volume velocity ({hours:g}h)")
+
+def select_keyword(trends_data, existing_keywords, similarity=None):
+    """
+    Find the highest ranked trend that doesn't match any existing keyword.
+    
+    Args:
+        trends_data (dict): Parsed latest_trends.json payload
+        existing_keywords (set): Lowercase keywords already covered
+        similarity (NearDuplicateIndex): Optional near-duplicate index
+        
+    Returns:
+        str: The selected trend name, or None if every trend is covered
+    """
+    selected = select_keywords(trends_data, existing_keywords, limit=1, similarity=similarity)
+    return selected[0] if selected else None
+
+def main():
+    # Define file paths using PROJECT_ROOT
+    trends_file = os.path.join(PROJECT_ROOT, 'temp', 'latest_trends.json')
+    articles_file = os.path.join(PROJECT_ROOT, 'json', 'articles.json')
+    output_file = os.path.join(PROJECT_ROOT, 'temp', 'keyword_selection.json')
+    
+    # Load latest trends
+    print("Loading latest trends...")
+    trends_data = load_json_file(trends_file)
+    if os.getenv('KEYWORD_RANK_BY', 'volume') == 'velocity':
+        trends_data = rank_by_velocity(trends_data)
+    
+    # Look up existing keywords through the article index
+    existing_keywords = load_keyword_lookup(articles_file)
+    similarity = load_similarity_index(articles_file)
+    
+    keyword = select_keyword(trends_data, existing_keywords, similarity)
+    
+    if keyword:
+        # Create the output data
+        output_data = {
+            "keyword": keyword
+        }
+        
+        # Save to keyword_selection.json
+        save_json_file(output_file, output_data)
+        print("Program completed successfully.")
+        sys.exit(0)
     
     # If we reach here, no unmatched trend was found
     print("No unmatched trends found. All trends already have corresponding articles.")
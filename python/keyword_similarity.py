@@ -0,0 +1,305 @@
+"""
+Near-duplicate keyword detection
+Scores a trend against every existing article keyword and title with character
+n-gram TF-IDF cosine similarity, using an inverted index so each lookup only
+touches the articles that share n-grams with the trend. A match also has to share
+an exact topic word (or, for "a vs b" fixtures, the same teams on both sides) and
+counts for less the older the article is, so recurring events can be covered again
+"""
+
+import math
+import os
+import re
+from collections import Counter
+from datetime import datetime
+import numpy as np
+
+# Calibrated on labelled trend/article pairs from the published articles (see
+# tests/test_keyword_similarity.py): trends are scored against stored keywords, and
+# against titles only with a stricter threshold since headlines add words of their own
+DEFAULT_THRESHOLD = 0.53
+TITLE_THRESHOLD = 0.65
+NGRAM_SIZE = 3
+
+# Matches against articles older than RECENT_DAYS lose half their score every HALF_LIFE_DAYS
+RECENT_DAYS = 1
+HALF_LIFE_DAYS = 3
+
+STOPWORDS = frozenset({
+    'a', 'an', 'and', 'at', 'by', 'for', 'from', 'in', 'is', 'of', 'on', 'the', 'to', 'with',
+    'how', 'what', 'why', 'today', 'live', 'latest', 'news', 'update', 'updates', 'new',
+    'vs', 'v', 'versus'
+})
+# Words around the teams of a fixture ("... national cricket team match scorecard")
+FIXTURE_FILLER = STOPWORDS | {
+    'match', 'scorecard', 'score', 'highlights', 'timeline', 'national', 'team', 'cricket',
+    'football', 'club', 'fc', 'f', 'c', 'cf'
+}
+# Words that don't identify a topic on their own: two trends sharing only these
+# ("nsdl share price" / "bse share price") are about different things
+GENERIC_TOKENS = FIXTURE_FILLER | {
+    'share', 'shares', 'price', 'prices', 'stock', 'rate', 'rates', 'result', 'results',
+    'india', 'indian', '2025', '2026'
+}
+FIXTURE_SEPARATOR = re.compile(r' (?:vs|v|versus) ')
+# A headline's fixture ends at the first punctuation mark ("West Indies vs Pakistan: Fans ...")
+CLAUSE_SEPARATOR = re.compile(r'[:!?|;,\u2013\u2014]| - ')
+
+def normalize_text(text):
+    """Lowercase, replace punctuation with spaces and collapse whitespace"""
+    return re.sub(r'\s+', ' ', re.sub(r'[^\w\s]', ' ', (text or '').lower())).strip()
+
+def char_ngrams(text, size=NGRAM_SIZE):
+    """Count the character n-grams of a text, padded so word boundaries count too"""
+    padded = f" {normalize_text(text)} "
+    return Counter(padded[i:i + size] for i in range(len(padded) - size + 1))
+
+class KeywordSimilarityIndex:
+    """TF-IDF index (character n-grams by default) over article keywords and titles"""
+
+    def __init__(self, entries, analyzer=char_ngrams):
+        """
+        Args:
+            entries (list): (label, text) pairs, e.g. (article id, keyword) and
+                (article id, title); a label may appear several times
+            analyzer (callable): Turns a text into a Counter of terms (default: character n-grams)
+        """
+        self.analyzer = analyzer
+        labels = []
+        doc_counts = []
+        for label, text in entries:
+            counts = analyzer(text)
+            if counts:
+                labels.append(label)
+                doc_counts.append(counts)
+
+        self.labels = labels
+        self.doc_count = len(doc_counts)
+
+        # Vocabulary and document frequencies
+        self.vocab = {}
+        df = []
+        for counts in doc_counts:
+            for gram in counts:
+                term_id = self.vocab.setdefault(gram, len(df))
+                if term_id == len(df):
+                    df.append(0)
+                df[term_id] += 1
+        self.idf = np.log((1 + self.doc_count) / (1 + np.asarray(df, dtype=np.float32))) + 1
+        self.unknown_idf = math.log(1 + self.doc_count) + 1
+
+        # Postings sorted by term: term_ids[i] occurs in doc_ids[i] with L2-normalized weight weights[i]
+        term_ids, doc_ids, weights = [], [], []
+        for doc_id, counts in enumerate(doc_counts):
+            ids = np.fromiter((self.vocab[gram] for gram in counts), dtype=np.int32, count=len(counts))
+            tfidf = np.fromiter(counts.values(), dtype=np.float32, count=len(counts)) * self.idf[ids]
+            term_ids.append(ids)
+            doc_ids.append(np.full(len(ids), doc_id, dtype=np.int32))
+            weights.append(tfidf / np.linalg.norm(tfidf))
+
+        if doc_counts:
+            term_ids = np.concatenate(term_ids)
+            order = np.argsort(term_ids, kind='stable')
+            self.doc_ids = np.concatenate(doc_ids)[order]
+            self.weights = np.concatenate(weights)[order]
+            self.offsets = np.searchsorted(term_ids[order], np.arange(len(df) + 1))
+        else:
+            self.doc_ids = np.zeros(0, dtype=np.int32)
+            self.weights = np.zeros(0, dtype=np.float32)
+            self.offsets = np.zeros(1, dtype=np.int64)
+
+    def __len__(self):
+        return self.doc_count
+
+    def vectorize(self, text):
+        """Return the L2-normalized TF-IDF vector of a text as {n-gram: weight}"""
+        counts = self.analyzer(text)
+        vector = {}
+        for gram, count in counts.items():
+            term_id = self.vocab.get(gram)
+            vector[gram] = count * (self.idf[term_id] if term_id is not None else self.unknown_idf)
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        return {gram: weight / norm for gram, weight in vector.items()} if norm else {}
+
+    def scores(self, text):
+        """Cosine similarity of text against every indexed entry, as a NumPy array"""
+        vector = self.vectorize(text)
+        known = [(self.vocab[gram], weight) for gram, weight in vector.items() if gram in self.vocab]
+        if not known or not self.doc_count:
+            return np.zeros(self.doc_count, dtype=np.float32)
+
+        # Gather the postings of every query n-gram and sum their products per entry
+        spans = [(self.offsets[term_id], self.offsets[term_id + 1], weight) for term_id, weight in known]
+        doc_ids = np.concatenate([self.doc_ids[start:end] for start, end, _ in spans])
+        products = np.concatenate([self.weights[start:end] * weight for start, end, weight in spans])
+        return np.bincount(doc_ids, weights=products, minlength=self.doc_count)
+
+    def most_similar(self, text, top_k=3):
+        """
+        Return the best matching labels for a text.
+
+        Returns:
+            list: (label, score) pairs, best first, one per label
+        """
+        scores = self.scores(text)
+        if not len(scores):
+            return []
+
+        # Take a few extra candidates since a label's keyword and title can both match
+        count = min(len(scores), top_k * 2)
+        candidates = np.argpartition(-scores, count - 1)[:count]
+        best = {}
+        for doc_id in candidates[np.argsort(-scores[candidates])]:
+            label = self.labels[doc_id]
+            if label not in best and scores[doc_id] > 0:
+                best[label] = float(scores[doc_id])
+        return list(best.items())[:top_k]
+
+    def find_duplicate(self, text, threshold=DEFAULT_THRESHOLD):
+        """Return (label, score) of the best match at or above threshold, or None"""
+        matches = self.most_similar(text, top_k=1)
+        if matches and matches[0][1] >= threshold:
+            return matches[0]
+        return None
+
+    def similarity(self, text_a, text_b):
+        """Cosine similarity of two texts, weighted with this index's IDF"""
+        vector_a = self.vectorize(text_a)
+        vector_b = self.vectorize(text_b)
+        return sum(weight * vector_b.get(gram, 0.0) for gram, weight in vector_a.items())
+
+def topic_tokens(text):
+    """Words of a text that identify its topic"""
+    return set(normalize_text(text).split()) - GENERIC_TOKENS
+
+def fixture_sides(text):
+    """
+    Split an "a vs b" fixture into the topic words of each side.
+
+    Returns:
+        tuple: (frozenset, frozenset), or None if the text isn't a fixture
+    """
+    for clause in CLAUSE_SEPARATOR.split(text or ''):
+        sides = FIXTURE_SEPARATOR.split(f" {normalize_text(clause)} ")
+        if len(sides) == 2:
+            left, right = (frozenset(side.split()) - FIXTURE_FILLER for side in sides)
+            return (left, right) if left and right else None
+    return None
+
+def same_teams(sides_a, sides_b, exact=False):
+    """
+    Whether two fixtures have the same teams, in either order.
+
+    Teams match when one side's words are all in the other's ("mallorca" and
+    "rcd mallorca"), or only when they are identical with exact=True.
+    """
+    def side_matches(a, b):
+        return a == b if exact else a <= b or b <= a
+
+    (left_a, right_a), (left_b, right_b) = sides_a, sides_b
+    return ((side_matches(left_a, left_b) and side_matches(right_a, right_b)) or
+            (side_matches(left_a, right_b) and side_matches(right_a, left_b)))
+
+def same_topic(trend, text):
+    """
+    Whether a trend and an article keyword or title can be near-duplicates at all.
+
+    A fixture trend ("india vs pakistan") needs the same teams on both sides; any
+    other trend needs a topic word in common with the text.
+    """
+    trend_sides = fixture_sides(trend)
+    if trend_sides:
+        text_sides = fixture_sides(text)
+        return bool(text_sides) and same_teams(trend_sides, text_sides)
+    return bool(topic_tokens(trend) & topic_tokens(text))
+
+def recency_weight(published, now=None):
+    """Weight of a match against an article published at this time (1.0 if the date is unknown)"""
+    if published is None:
+        return 1.0
+    age_days = ((now or datetime.now()) - published).total_seconds() / 86400
+    if age_days <= RECENT_DAYS:
+        return 1.0
+    return 0.5 ** ((age_days - RECENT_DAYS) / HALF_LIFE_DAYS)
+
+class NearDuplicateIndex:
+    """Finds the article a trend nearly duplicates, from separate keyword and title indexes"""
+
+    def __init__(self, articles, now=None):
+        """
+        Args:
+            articles (iterable): (id, keyword, title, published datetime or None) tuples
+            now (datetime): Reference time for the recency decay (default: now)
+        """
+        articles = list(articles)
+        self.keywords = KeywordSimilarityIndex([(article_id, keyword) for article_id, keyword, _, _ in articles if keyword])
+        self.titles = KeywordSimilarityIndex([(article_id, title) for article_id, _, title, _ in articles if title])
+        self.texts = {article_id: (keyword, title) for article_id, keyword, title, _ in articles}
+        self.weights = {article_id: recency_weight(published, now) for article_id, _, _, published in articles}
+
+        # Exact fixtures, so "west indies vs pakistan" finds the long-form scorecard keyword too
+        self.fixtures = []
+        for article_id, keyword, title, _ in articles:
+            for text in (keyword, title):
+                sides = fixture_sides(text)
+                if sides:
+                    self.fixtures.append((sides, article_id))
+
+    def __len__(self):
+        return len(self.texts)
+
+    def find_duplicate(self, text, threshold=DEFAULT_THRESHOLD, title_threshold=TITLE_THRESHOLD):
+        """
+        Return (id, score) of the article a text nearly duplicates, or None.
+
+        A keyword scoring at or above threshold, or a title at or above
+        title_threshold, is a near-duplicate if the two share a topic (see
+        same_topic()). The same fixture always scores 1.0. Scores are multiplied
+        by the article's recency weight first.
+        """
+        candidates = []
+        sides = fixture_sides(text)
+        if sides:
+            candidates.extend((article_id, 1.0, threshold) for fixture, article_id in self.fixtures
+                              if same_teams(sides, fixture, exact=True))
+        for index, position, limit in ((self.keywords, 0, threshold), (self.titles, 1, title_threshold)):
+            for article_id, score in index.most_similar(text, top_k=5):
+                if same_topic(text, self.texts[article_id][position]):
+                    candidates.append((article_id, score, limit))
+
+        best = None
+        for article_id, score, limit in candidates:
+            score *= self.weights[article_id]
+            if score >= limit and (best is None or score > best[1]):
+                best = (article_id, score)
+        return best
+
+    def similarity(self, text_a, text_b):
+        """Similarity of a trend to another keyword (e.g. one picked earlier in the same run), 0.0 if their topics differ"""
+        sides_a, sides_b = fixture_sides(text_a), fixture_sides(text_b)
+        if sides_a and sides_b and same_teams(sides_a, sides_b, exact=True):
+            return 1.0
+        if not same_topic(text_a, text_b):
+            return 0.0
+        return self.keywords.similarity(text_a, text_b)
+
+def build_similarity_index(articles, now=None):
+    """
+    Build the near-duplicate index over article keywords and titles.
+
+    Args:
+        articles (iterable): (id, keyword, title, published datetime or None) tuples
+        now (datetime): Reference time for the recency decay (default: now)
+
+    Returns:
+        NearDuplicateIndex: Index labelled by article id
+    """
+    return NearDuplicateIndex(articles, now)
+
+def get_threshold():
+    """Similarity threshold from KEYWORD_SIMILARITY_THRESHOLD (a value above 1 disables fuzzy matching)"""
+    return float(os.getenv('KEYWORD_SIMILARITY_THRESHOLD', DEFAULT_THRESHOLD))
+
+def get_title_threshold():
+    """Threshold for matches against titles, from KEYWORD_TITLE_SIMILARITY_THRESHOLD"""
+    return float(os.getenv('KEYWORD_TITLE_SIMILARITY_THRESHOLD', TITLE_THRESHOLD))
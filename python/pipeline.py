@@ -0,0 +1,309 @@
+"""
+OmniTrends content pipeline
+Runs trends check, keyword selection, content, image and HTML generation in a
+single process, passing results between stages in memory instead of through temp/
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from PIL import Image
+
+import checkpoints
+import trends_check
+import keyword_selection
+import content_generator
+import image_generator
+import image_pipeline
+import html_generator
+
+# Get the directory where this script is located
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Get the project root directory (parent of python directory)
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+TEMP_DIR = os.path.join(PROJECT_ROOT, 'temp')
+
+@dataclass
+class ArticleDraft:
+    """State of one article as it moves through the pipeline"""
+    keyword: str
+    record: dict = field(default_factory=dict)
+    content: str = ""
+    image: object = None
+    checkpoint: object = None
+
+    @property
+    def article_id(self):
+        return self.record.get('id')
+
+class StageTimer:
+    """Collect wall-clock time per pipeline stage"""
+
+    def __init__(self):
+        self.timings = []
+
+    def run(self, name, func, *args, **kwargs):
+        """Run one stage, record its duration and return its result"""
+        print(f"\n=== Stage: {name} ===")
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timings.append((name, elapsed))
+            print(f"=== Stage {name} finished in {elapsed:.2f}s ===")
+
+    def report(self):
+        """Print a per-stage timing summary"""
+        total = sum(elapsed for _, elapsed in self.timings)
+        print("\n" + "="*50)
+        print("PIPELINE TIMINGS")
+        print("="*50)
+        for name, elapsed in self.timings:
+            share = (elapsed / total * 100) if total else 0
+            print(f"{name:<20} {elapsed:>10.2f}s {share:>6.1f}%")
+        print("-"*50)
+        print(f"{'Total':<20} {total:>10.2f}s")
+
+def write_temp_json(filename, data):
+    """Write a debugging artifact to temp/"""
+    os.makedirs(TEMP_DIR, exist_ok=True)
+    path = os.path.join(TEMP_DIR, filename)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    print(f"Wrote {path}")
+
+def run_trends_stage(backend=None, slices=None, max_workers=4):
+    """Fetch the latest trends and return the latest_trends.json payload"""
+    scraper = None
+    try:
+        scraper, trends_data = trends_check.fetch_trends(backend, slices=slices, max_workers=max_workers)
+        scraper.display_results(trends_data)
+        scraper.record_history(trends_data)
+        return scraper.build_trends_payload(trends_data)
+    finally:
+        if scraper:
+            scraper.close()
+
+def run_keyword_stage(trends_payload, max_articles, pending_keywords=(), rank_by='volume', similarity_threshold=None):
+    """Pick the top trends that aren't already covered by an article or a pending run"""
+    if rank_by == 'velocity':
+        trends_payload = keyword_selection.rank_by_velocity(trends_payload)
+    articles_file = os.path.join(PROJECT_ROOT, 'json', 'articles.json')
+    existing_keywords = keyword_selection.load_keyword_lookup(articles_file)
+    similarity = keyword_selection.load_similarity_index(articles_file, similarity_threshold)
+    return keyword_selection.select_keywords(trends_payload, existing_keywords, limit=max_articles,
+                                             pending_keywords=pending_keywords, similarity=similarity,
+                                             threshold=similarity_threshold)
+
+def run_content_stage(draft, generation_mode):
+    """Generate the article text and metadata record"""
+    article = content_generator.generate_article(draft.keyword, mode=generation_mode)
+    draft.content = article['content']
+    draft.record = content_generator.build_article_record(
+        draft.keyword, article['title'], article['category'], article['date'], article['excerpt']
+    )
+    return draft
+
+def run_image_stage(draft):
+    """Generate the article image and add image metadata to the record"""
+    draft.image = image_generator.create_article_image(draft.content)
+    draft.record = image_generator.add_image_metadata(draft.record, draft.article_id)
+    return draft
+
+def run_render_stage(draft):
+    """Render the article page and store its image"""
+    article_id = draft.article_id
+
+    html = html_generator.render_article_html(article_id, draft.record, draft.content)
+    if not html_generator.write_article_html(article_id, html):
+        return False
+    if not html_generator.save_article_source(article_id, draft.content):
+        return False
+    return html_generator.save_article_image(draft.image, article_id, draft.record.get('image_formats'))
+
+def run_publish_stage(drafts):
+    """Update articles.json, featured articles, related articles, frontend shards, listing pages, sitemap and robots.txt once for the whole batch"""
+    if not html_generator.publish_articles([draft.record for draft in drafts]):
+        return False
+    if not html_generator.update_related_articles():
+        return False
+    if not html_generator.generate_article_shards():
+        return False
+    if not html_generator.generate_listing_pages():
+        return False
+    if not html_generator.generate_sitemap():
+        return False
+    if not html_generator.generate_robots_txt():
+        return False
+    return True
+
+def temp_filename(base, ext, index, batch):
+    """Name a temp/ artifact, numbering it when several articles are generated"""
+    return f"{base}.{ext}" if not batch else f"{base}_{index}.{ext}"
+
+def run_checkpointed(timer, draft, stage, index, inputs_hash, func, *args):
+    """Run a stage unless the draft's checkpoint shows it already completed with the same inputs"""
+    if draft.checkpoint.is_complete(stage, inputs_hash):
+        print(f"Skipping {stage}[{index}]: already completed in a previous run")
+        return None
+    try:
+        return timer.run(f"{stage}[{index}]", func, draft, *args)
+    except BaseException as e:
+        draft.checkpoint.mark_failed(stage, inputs_hash, e)
+        raise
+
+def resume_drafts(limit):
+    """Load drafts for article runs that an earlier workflow run started but never published"""
+    drafts = []
+    for checkpoint in checkpoints.find_incomplete_runs():
+        if len(drafts) >= limit:
+            break
+        try:
+            record = checkpoint.read_json('record.json')
+            content = checkpoint.read_text('content.md')
+        except (OSError, json.JSONDecodeError):
+            print(f"Discarding unusable checkpoint: {checkpoint.run_key}")
+            checkpoint.remove()
+            continue
+        checkpoint.record_attempt()
+        print(f"Resuming unfinished article run: {checkpoint.run_key} (attempt {checkpoint.attempts})")
+        drafts.append(ArticleDraft(keyword=record.get('keyword', ''), record=record, content=content, checkpoint=checkpoint))
+    return drafts
+
+def generate_draft(timer, draft, index, batch, write_temp, generation_mode):
+    """Run the content, image and render stages for one article, resuming from its checkpoint"""
+    if draft.checkpoint is None:
+        timer.run(f"content[{index}]", run_content_stage, draft, generation_mode)
+        if not draft.article_id:
+            print(f"No title was generated for '{draft.keyword}'")
+            return None
+
+        # The article id derived from the title is the run key from here on
+        draft.checkpoint = checkpoints.RunCheckpoint(draft.article_id)
+        outputs = [
+            draft.checkpoint.write_json('record.json', draft.record),
+            draft.checkpoint.write_text('content.md', draft.content)
+        ]
+        draft.checkpoint.mark_complete('content', checkpoints.hash_inputs(draft.keyword), outputs)
+        if write_temp:
+            write_temp_json(temp_filename('keyword_selection', 'json', index, batch), draft.record)
+            with open(os.path.join(TEMP_DIR, temp_filename('final', 'md', index, batch)), 'w', encoding='utf-8') as f:
+                f.write(f"{draft.content}\n")
+
+    checkpoint = draft.checkpoint
+    image_path = checkpoint.path('image.png')
+    image_inputs = checkpoints.hash_inputs(draft.content)
+    if run_checkpointed(timer, draft, 'image', index, image_inputs, run_image_stage) is None:
+        draft.image = Image.open(image_path)
+        draft.record = image_generator.add_image_metadata(draft.record, draft.article_id)
+    else:
+        # Keep a lossless copy so a later failure doesn't cost another image generation
+        draft.image.save(image_path, 'PNG')
+        checkpoint.write_json('record.json', draft.record)
+        checkpoint.mark_complete('image', image_inputs, [image_path])
+        if write_temp:
+            write_temp_json(temp_filename('keyword_selection', 'json', index, batch), draft.record)
+            image_generator.save_image(draft.image, os.path.join(TEMP_DIR, temp_filename('final', 'png', index, batch)))
+
+    render_inputs = checkpoints.hash_inputs(draft.record, draft.content, image_inputs)
+    rendered = run_checkpointed(timer, draft, 'render', index, render_inputs, run_render_stage)
+    if rendered is False:
+        checkpoint.mark_failed('render', render_inputs, "render failed")
+        print(f"Failed to render article: {draft.article_id}")
+        return None
+    if rendered:
+        checkpoint.mark_complete('render', render_inputs, [
+            os.path.join(PROJECT_ROOT, 'articles', f'{draft.article_id}.html'),
+            os.path.join(html_generator.CONTENT_DIR, f'{draft.article_id}.md')
+        ] + image_pipeline.output_paths(draft.article_id, draft.record.get('image_formats', ['webp'])))
+    return draft
+
+def main():
+    """Run the full content pipeline in one process"""
+    parser = argparse.ArgumentParser(description="Run the OmniTrends content pipeline in-process")
+    parser.add_argument('--max-articles', type=int, default=1,
+                        help="number of unmatched trends to turn into articles in this run")
+    parser.add_argument('--generation-mode', choices=['separate', 'structured'], default=None,
+                        help="one Gemini call per field, or a single structured call with per-field fallback")
+    parser.add_argument('--trends-backend', choices=['auto', 'rss', 'selenium'], default=None,
+                        help="where to read trends from (default: TRENDS_BACKEND or auto)")
+    parser.add_argument('--trends-geos', help="comma-separated region codes to scrape in parallel (default: TRENDS_GEOS or IN)")
+    parser.add_argument('--trends-hours', help="comma-separated time windows in hours (default: TRENDS_HOURS or 4)")
+    parser.add_argument('--trends-workers', type=int, default=4,
+                        help="maximum concurrent HTTP workers or browser tabs for multi-slice scraping")
+    parser.add_argument('--rank-by', choices=['volume', 'velocity'], default=os.getenv('KEYWORD_RANK_BY', 'volume'),
+                        help="pick keywords by current search volume or by volume growth in the trend history")
+    parser.add_argument('--similarity-threshold', type=float, default=None,
+                        help="skip trends this similar to an existing keyword (default: KEYWORD_SIMILARITY_THRESHOLD or 0.53; above 1 disables)")
+    parser.add_argument('--write-temp', action='store_true',
+                        help="also write the intermediate temp/ artifacts for debugging")
+    parser.add_argument('--no-resume', action='store_true',
+                        help="ignore checkpoints of unfinished runs and start fresh")
+    args = parser.parse_args()
+
+    if args.max_articles < 1:
+        parser.error("--max-articles must be at least 1")
+
+    batch = args.max_articles > 1
+    slices = trends_check.parse_slices(args.trends_geos, args.trends_hours)
+    timer = StageTimer()
+
+    try:
+        drafts = [] if args.no_resume else resume_drafts(args.max_articles)
+
+        remaining = args.max_articles - len(drafts)
+        if remaining > 0:
+            trends_payload = timer.run("trends", run_trends_stage, args.trends_backend, slices, args.trends_workers)
+            if args.write_temp:
+                write_temp_json('latest_trends.json', trends_payload)
+
+            pending_keywords = [draft.keyword for draft in drafts]
+            keywords = timer.run("keyword", run_keyword_stage, trends_payload, remaining, pending_keywords,
+                                 args.rank_by, args.similarity_threshold)
+            if keywords:
+                print(f"Selected {len(keywords)} keyword(s): {', '.join(keywords)}")
+            drafts.extend(ArticleDraft(keyword=keyword) for keyword in keywords)
+
+        if not drafts:
+            print("No unmatched trends found. All trends already have corresponding articles.")
+            return 1
+
+        ready = []
+        for index, draft in enumerate(drafts, 1):
+            print(f"\n##### Article {index}/{len(drafts)}: {draft.keyword} #####")
+            try:
+                draft = generate_draft(timer, draft, index, batch, args.write_temp, args.generation_mode)
+            except (Exception, SystemExit) as e:
+                # A single failed article shouldn't throw away the rest of the batch
+                if not batch:
+                    raise
+                print(f"Skipping '{draft.keyword}' after error: {e}")
+                continue
+            if draft:
+                ready.append(draft)
+
+        if not ready:
+            print("No articles were generated.")
+            return 1
+
+        if not timer.run("publish", run_publish_stage, ready):
+            print("Publishing failed.")
+            return 1
+
+        # Published articles no longer need their checkpoints
+        for draft in ready:
+            draft.checkpoint.remove()
+
+        print(f"\nPublished {len(ready)} article(s):")
+        for draft in ready:
+            print(f"  - {draft.article_id}")
+        return 0
+    finally:
+        timer.report()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Token-bucket rate limiter for Gemini API calls
+Only waits when the requests-per-minute or tokens-per-minute quota actually requires it
+"""
+
+import asyncio
+import os
+import threading
+import time
+
+# Default quota, matching the Gemini free tier for gemini-2.5-flash
+DEFAULT_REQUESTS_PER_MINUTE = 10
+DEFAULT_TOKENS_PER_MINUTE = 250000
+
+class TokenBucket:
+    """A bucket that refills continuously up to its capacity"""
+
+    def __init__(self, capacity, refill_per_second):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.level = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.refill_per_second)
+        self.updated = now
+
+    def reserve(self, amount):
+        """
+        Take amount from the bucket, going into debt if needed.
+
+        Returns:
+            float: Seconds the caller has to wait before the reservation is covered
+        """
+        self._refill()
+        # A single request larger than the bucket can never be covered, so cap it
+        amount = min(amount, self.capacity)
+        self.level -= amount
+        if self.level >= 0:
+            return 0.0
+        return -self.level / self.refill_per_second
+
+class RateLimiter:
+    """Combined requests-per-minute and tokens-per-minute limiter, safe across threads and tasks"""
+
+    def __init__(self, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE, tokens_per_minute=DEFAULT_TOKENS_PER_MINUTE):
+        self.requests = TokenBucket(requests_per_minute, requests_per_minute / 60.0)
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60.0)
+        self.lock = threading.Lock()
+
+    def reserve(self, tokens=0):
+        """Reserve quota for one request and return how long to wait before sending it"""
+        with self.lock:
+            delay = self.requests.reserve(1)
+            if tokens:
+                delay = max(delay, self.tokens.reserve(tokens))
+            return delay
+
+    def wait(self, tokens=0):
+        """Block until one request with the given token estimate fits in the quota"""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            print(f"Rate limit: waiting {delay:.1f} seconds before next API call...")
+            time.sleep(delay)
+
+    async def acquire(self, tokens=0):
+        """Async version of wait() that yields to other tasks while waiting"""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            print(f"Rate limit: waiting {delay:.1f} seconds before next API call...")
+            await asyncio.sleep(delay)
+
+def estimate_tokens(text):
+    """Rough token estimate for a prompt (about 4 characters per token)"""
+    return max(1, len(text) // 4)
+
+_rate_limiter = None
+
+def get_rate_limiter():
+    """
+    Return the process-wide Gemini rate limiter.
+
+    Quota is read once from GEMINI_RPM and GEMINI_TPM environment variables.
+    """
+    global _rate_limiter
+    if _rate_limiter is None:
+        rpm = float(os.getenv('GEMINI_RPM', DEFAULT_REQUESTS_PER_MINUTE))
+        tpm = float(os.getenv('GEMINI_TPM', DEFAULT_TOKENS_PER_MINUTE))
+        _rate_limiter = RateLimiter(rpm, tpm)
+    return _rate_limiter
@@ -0,0 +1,212 @@
+"""
+Full-site article rebuild
+Re-renders every articles/{id}.html from its stored source and the articles.json
+metadata with the current templates, skipping pages whose inputs haven't changed
+since the last rebuild and rendering the rest in a process pool
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import checkpoints
+import html_generator
+import template_engine
+
+# Get the directory where this script is located
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Get the project root directory (parent of python directory)
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+ARTICLES_PATH = os.path.join(PROJECT_ROOT, 'json', 'articles.json')
+ARTICLES_DIR = os.path.join(PROJECT_ROOT, 'articles')
+# Kept outside temp/ so html_generator.clear_temp_folder() doesn't wipe it
+MANIFEST_PATH = os.path.join(PROJECT_ROOT, '.cache', 'rebuild_manifest.json')
+
+# Metadata that is part of what an article says
+CONTENT_FIELDS = ('title', 'excerpt', 'keyword', 'category', 'date')
+# Metadata the article template uses; other fields (e.g. featured) don't affect the page
+PAGE_FIELDS = CONTENT_FIELDS + ('image_width', 'image_height', 'image_widths', 'image_formats')
+
+# How the article template wraps the body, used to recover the body of pages published
+# before their markdown was kept
+BODY_START = '<div class="article__body">\n                    '
+BODY_END = '\n                </div>\n\n                <div class="article__footer">'
+
+def extract_body_html(page_html):
+    """Cut the rendered body out of an article page, or return None if it isn't one"""
+    start = page_html.find(BODY_START)
+    if start == -1:
+        return None
+    start += len(BODY_START)
+    end = page_html.find(BODY_END, start)
+    if end == -1:
+        return None
+    return page_html[start:end]
+
+def load_article_source(article_id):
+    """
+    Load the source of an article page.
+
+    Markdown comes from content/{id}.md. Articles published before markdown was kept
+    have their body HTML cut out of the existing page once and saved as
+    content/{id}.body, so later rebuilds never read their own output. (Not .html:
+    content/ is served with the site, and HTML copies of every article body would
+    be crawled as duplicate pages.)
+
+    Returns:
+        tuple: (kind, text) with kind "markdown" or "html", or None if there is no source
+    """
+    md_path = os.path.join(html_generator.CONTENT_DIR, f'{article_id}.md')
+    body_path = os.path.join(html_generator.CONTENT_DIR, f'{article_id}.body')
+    for kind, path in (('markdown', md_path), ('html', body_path)):
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                return kind, f.read()
+
+    page_path = os.path.join(ARTICLES_DIR, f'{article_id}.html')
+    try:
+        with open(page_path, 'r', encoding='utf-8') as f:
+            body_html = extract_body_html(f.read())
+    except FileNotFoundError:
+        return None
+    if body_html is None:
+        return None
+
+    os.makedirs(html_generator.CONTENT_DIR, exist_ok=True)
+    with open(body_path, 'w', encoding='utf-8') as f:
+        f.write(body_html)
+    return 'html', body_html
+
+def content_hash(article):
+    """
+    Hash of what an article says: its stored source and CONTENT_FIELDS metadata.
+
+    Templates, image markup and the related articles section don't go into it, so
+    it only changes when the article itself is edited.
+
+    Returns:
+        str: The hash, or None if the article has no source
+    """
+    source = load_article_source(article['id'])
+    if source is None:
+        return None
+    return checkpoints.hash_inputs(source, {field: article.get(field) for field in CONTENT_FIELDS if field in article})
+
+def load_manifest():
+    """Load {article id: inputs hash} of the pages written by the last rebuild"""
+    try:
+        with open(MANIFEST_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_manifest(manifest):
+    """Save the inputs hashes, replacing the previous manifest atomically"""
+    os.makedirs(os.path.dirname(MANIFEST_PATH), exist_ok=True)
+    tmp_path = f"{MANIFEST_PATH}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, MANIFEST_PATH)
+
+def render_page(job):
+    """
+    Render and write one article page (runs in a worker process).
+
+    Returns:
+        tuple: (article id, True if the file changed)
+    """
+    article_id, article_data, kind, source, related_html = job
+    if kind == 'markdown':
+        page_html = html_generator.render_article_html(article_id, article_data, source, related_html)
+    else:
+        page_html = html_generator.render_article_page(article_id, article_data, source, related_html)
+    page_path = os.path.join(ARTICLES_DIR, f'{article_id}.html')
+    return article_id, html_generator.write_if_changed(page_path, page_html)
+
+def rebuild_articles(force=False, max_workers=None):
+    """
+    Re-render every published article with the current templates.
+
+    A page's inputs hash covers its source, the metadata in PAGE_FIELDS, its related
+    articles section, the template version and the version of the markup built in
+    Python (html_generator.render_version()). Pages whose hash matches the last
+    rebuild are skipped, and rendered pages are only written when their HTML changed.
+
+    Args:
+        force (bool): Render every page even if its inputs are unchanged
+        max_workers (int): Worker processes (default: one per CPU)
+
+    Returns:
+        bool: True if every article had a source to rebuild from
+    """
+    try:
+        with open(ARTICLES_PATH, 'r', encoding='utf-8') as f:
+            articles = json.load(f)
+    except Exception as e:
+        print(f"Error reading articles.json: {e}")
+        return False
+
+    try:
+        version = (template_engine.template_version(), html_generator.render_version())
+        related_index = html_generator.load_related_index()
+        by_id = {article['id']: article for article in articles}
+        previous = {} if force else load_manifest()
+
+        manifest = {}
+        jobs = []
+        missing = []
+        for article in articles:
+            article_id = article['id']
+            source = load_article_source(article_id)
+            if source is None:
+                missing.append(article_id)
+                continue
+
+            article_data = {field: article.get(field) for field in PAGE_FIELDS if field in article}
+            related = [by_id[other] for other in related_index.get(article_id, []) if other in by_id]
+            related_html = html_generator.render_related_section(related)
+            inputs_hash = checkpoints.hash_inputs(version, source, article_data, related_html)
+            manifest[article_id] = inputs_hash
+
+            page_path = os.path.join(ARTICLES_DIR, f'{article_id}.html')
+            if previous.get(article_id) == inputs_hash and os.path.exists(page_path):
+                continue
+            jobs.append((article_id, article_data, source[0], source[1], related_html))
+
+        if len(jobs) > 1 and max_workers != 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                results = list(pool.map(render_page, jobs, chunksize=16))
+        else:
+            results = [render_page(job) for job in jobs]
+        written = sum(1 for _, changed in results if changed)
+
+        save_manifest(manifest)
+
+        for article_id in missing:
+            print(f"Warning: no source for article {article_id}, page left as is")
+        print(f"Rebuilt {len(jobs)} of {len(articles)} articles ({written} pages changed, "
+              f"{len(articles) - len(jobs) - len(missing)} unchanged inputs skipped)")
+        return not missing
+    except Exception as e:
+        print(f"Error rebuilding articles: {e}")
+        return False
+
+def main():
+    """Rebuild the article pages from the command line"""
+    parser = argparse.ArgumentParser(description="Re-render every article page with the current templates")
+    parser.add_argument('--force', action='store_true',
+                        help="render every page, even if its inputs are unchanged since the last rebuild")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="number of worker processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    success = rebuild_articles(force=args.force, max_workers=args.workers)
+    print(f"Finished in {time.perf_counter() - start:.2f}s")
+    return 0 if success else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
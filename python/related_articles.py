@@ -0,0 +1,104 @@
+"""
+Related articles graph
+Scores every article against every other one by keyword/title token overlap,
+shared category and publication date, so related links can be baked into the
+article pages at build time instead of computed in the browser
+"""
+
+import re
+from collections import Counter
+from datetime import datetime
+import numpy as np
+from keyword_similarity import KeywordSimilarityIndex
+
+DEFAULT_TOP_K = 3
+
+# Score weights; token overlap dominates, category and recency break ties
+TOKEN_WEIGHT = 0.6
+CATEGORY_WEIGHT = 0.25
+RECENCY_WEIGHT = 0.15
+RECENCY_HALF_LIFE_DAYS = 30
+# Articles below this token similarity aren't related at all, whatever their category
+# or date; otherwise every new article would outscore older ones on recency alone
+# and push its way onto most pages
+MIN_TOKEN_SIMILARITY = 0.1
+
+# Words that appear in most generated titles and say nothing about the topic
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'how', 'in', 'is', 'it',
+    'its', 'of', 'on', 'or', 'the', 'this', 'to', 'what', 'who', 'why', 'will', 'with', 'vs',
+    'india', 'indias', 'indian'
+}
+
+def word_tokens(text):
+    """Count the topic words of a text (lowercase, punctuation and stopwords dropped)"""
+    words = re.findall(r'\w+', (text or '').lower().replace("'", ''))
+    return Counter(word for word in words if len(word) > 1 and word not in STOPWORDS)
+
+def parse_article_date(date_str):
+    """Parse a "30 August 2025" article date, returning None for anything else"""
+    try:
+        return datetime.strptime(date_str, "%d %B %Y")
+    except (TypeError, ValueError):
+        return None
+
+def compute_related_graph(articles, top_k=DEFAULT_TOP_K, min_similarity=MIN_TOKEN_SIMILARITY):
+    """
+    Find the top_k related articles of every article.
+
+    Token similarity is TF-IDF cosine over keyword + title words; every row of
+    the score matrix is computed with NumPy from the index's postings, plus a
+    same-category bonus and a recency bonus that halves every RECENCY_HALF_LIFE_DAYS.
+    Only articles with a token similarity of at least MIN_TOKEN_SIMILARITY are
+    candidates, so an article can have fewer than top_k related articles.
+
+    Args:
+        articles (list): Article records with id, keyword, title, category and date
+        top_k (int): Number of related articles per article
+        min_similarity (float): Token similarity an article needs to be related
+
+    Returns:
+        dict: article id -> list of related article ids, best first
+    """
+    count = len(articles)
+    if count < 2:
+        return {article['id']: [] for article in articles}
+
+    texts = [f"{article.get('keyword', '')} {article.get('title', '')}" for article in articles]
+    index = KeywordSimilarityIndex(list(enumerate(texts)), analyzer=word_tokens)
+    # Articles without any topic words aren't in the index, so map index entries back to rows
+    index_rows = np.array(index.labels, dtype=np.int64)
+
+    categories = [(article.get('category') or '').lower() for article in articles]
+    category_ids = np.unique(categories, return_inverse=True)[1]
+
+    dates = [parse_article_date(article.get('date')) for article in articles]
+    ordinals = np.array([date.toordinal() if date else 0 for date in dates], dtype=np.float64)
+    # Undated articles count as very old
+    known = ordinals[ordinals > 0]
+    ordinals[ordinals == 0] = known.min() - 365 if len(known) else 0
+
+    decay = np.log(2) / RECENCY_HALF_LIFE_DAYS
+    # Ties go to the smaller id, which doesn't change when other articles are published
+    id_order = np.argsort(np.argsort([article['id'] for article in articles], kind='stable'))
+    graph = {}
+
+    for row, article in enumerate(articles):
+        similarity = np.zeros(count, dtype=np.float64)
+        if len(index_rows):
+            similarity[index_rows] = index.scores(texts[row])
+        similarity[row] = 0
+        candidates = np.flatnonzero(similarity >= max(min_similarity, np.finfo(np.float64).eps))
+        if not len(candidates):
+            graph[article['id']] = []
+            continue
+
+        scores = TOKEN_WEIGHT * similarity[candidates]
+        scores += CATEGORY_WEIGHT * (category_ids[candidates] == category_ids[row])
+        scores += RECENCY_WEIGHT * np.exp(-decay * np.abs(ordinals[candidates] - ordinals[row]))
+
+        # Highest score first, smaller id first on ties
+        best = candidates[np.lexsort((id_order[candidates], -scores))[:top_k]]
+        graph[article['id']] = [articles[other]['id'] for other in best]
+
+    return graph
@@ -0,0 +1,135 @@
+"""
+Persistent Gemini response cache
+Stores responses in a single SQLite file keyed by a hash of model + prompt + config,
+so retries and re-runs of the same keyword skip calls that already completed
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Get the directory where this script is located
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Get the project root directory (parent of python directory)
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+# Kept outside temp/ so html_generator.clear_temp_folder() doesn't wipe it
+DEFAULT_CACHE_PATH = os.path.join(PROJECT_ROOT, '.cache', 'gemini_responses.sqlite3')
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 500
+
+def cache_key(model, prompt, config=None):
+    """
+    Build the content-addressed key for a request.
+
+    Args:
+        model (str): Model name
+        prompt (str): Prompt text
+        config: GenerateContentConfig (or None); HTTP options are ignored since
+            timeouts and retries don't change the response
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    config_json = ""
+    if config is not None:
+        config_json = config.model_dump_json(exclude_none=True, exclude={'http_options'})
+    payload = json.dumps([model, prompt, config_json], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class ResponseCache:
+    """Size-bounded LRU cache with a TTL, backed by SQLite"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl_seconds=DEFAULT_TTL_SECONDS, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)")
+        self.prune()
+
+    def get(self, key):
+        """Return the cached value (str or bytes) for key, or None if missing or expired"""
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.conn.commit()
+                return None
+            self.conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+            return value
+
+    def put(self, key, value):
+        """Store a str or bytes value, evicting the least recently used entries beyond max_entries"""
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            self.conn.execute(
+                """DELETE FROM responses WHERE key IN (
+                    SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )""",
+                (self.max_entries,)
+            )
+            self.conn.commit()
+
+    def prune(self):
+        """Drop expired entries"""
+        with self.lock:
+            self.conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+            self.conn.commit()
+
+    def close(self):
+        """Close the underlying database"""
+        with self.lock:
+            self.conn.close()
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_response_cache():
+    """
+    Return the process-wide response cache, or None when caching is disabled.
+
+    Configured with GEMINI_CACHE (set to 0 to disable), GEMINI_CACHE_PATH,
+    GEMINI_CACHE_TTL (seconds) and GEMINI_CACHE_MAX_ENTRIES.
+    """
+    global _cache
+    if os.getenv('GEMINI_CACHE', '1') == '0':
+        return None
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = ResponseCache(
+                    path=os.getenv('GEMINI_CACHE_PATH', DEFAULT_CACHE_PATH),
+                    ttl_seconds=float(os.getenv('GEMINI_CACHE_TTL', DEFAULT_TTL_SECONDS)),
+                    max_entries=int(os.getenv('GEMINI_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES))
+                )
+            except Exception as e:
+                # A broken cache must never stop content generation
+                print(f"Warning: response cache unavailable: {e}")
+                return None
+        return _cache
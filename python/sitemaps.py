@@ -0,0 +1,289 @@
+"""
+Sitemap builder
+Keeps a per-URL record (content hash and lastmod) in json/sitemap_state.json so
+that lastmod only moves when a page actually changes. Writes sitemap.xml (a sitemap
+index with per-month article sitemaps once the site nears the protocol limit) and
+a Google News sitemap of the articles published in the last 48 hours
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from xml.sax.saxutils import escape
+# html_generator imports this module too; only its attributes at call time are used here
+import html_generator
+import rebuild
+from related_articles import parse_article_date
+
+# Get the directory where this script is located
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Get the project root directory (parent of python directory)
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+BASE_URL = "https://omnitrends.github.io"
+SITE_NAME = "OmniTrends"
+STATE_PATH = os.path.join(PROJECT_ROOT, 'json', 'sitemap_state.json')
+SITEMAP_PATH = os.path.join(PROJECT_ROOT, 'sitemap.xml')
+NEWS_SITEMAP_PATH = os.path.join(PROJECT_ROOT, 'sitemap-news.xml')
+# Per-month sitemaps listed by sitemap.xml once it becomes an index
+SITEMAPS_DIR = os.path.join(PROJECT_ROOT, 'sitemaps')
+
+# The protocol allows 50,000 URLs per sitemap; switch to an index well before that
+# Bumped when the way pages are hashed changes (2: articles hash their content inputs)
+HASH_VERSION = 2
+MAX_URLS_PER_SITEMAP = 45000
+NEWS_WINDOW_HOURS = 48
+NEWS_MAX_URLS = 1000  # Google News sitemap limit
+
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+NEWS_NS = "http://www.google.com/schemas/sitemap-news/0.9"
+
+# (changefreq, priority) per kind of page
+PAGE_SETTINGS = {
+    'home': ('daily', '1.0'),
+    'error': ('monthly', '0.1'),
+    'page': ('monthly', '0.5'),
+    'article': ('weekly', '0.8'),
+    'category': ('weekly', '0.6')
+}
+
+def file_hash(path):
+    """Short SHA-256 of a file's bytes, or None if it doesn't exist"""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()[:16]
+    except FileNotFoundError:
+        return None
+
+def load_state():
+    """
+    Load {path: {"hash", "lastmod", "published"}} for every URL seen so far.
+
+    Hashes written by an older HASH_VERSION are dropped, so a change in how pages
+    are hashed re-baselines them instead of moving every lastmod.
+    """
+    try:
+        with open(STATE_PATH, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    urls = data.get('urls', {})
+    if data.get('version') != HASH_VERSION:
+        urls = {path: {key: value for key, value in entry.items() if key != 'hash'} for path, entry in urls.items()}
+    return urls
+
+def save_state(urls):
+    """Save the per-URL state, replacing the previous file atomically"""
+    tmp_path = f"{STATE_PATH}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"version": HASH_VERSION, "urls": urls}, f, indent=2, ensure_ascii=False, sort_keys=True)
+    os.replace(tmp_path, STATE_PATH)
+
+def page_hash(path, article):
+    """
+    Hash that decides whether a page changed.
+
+    Articles hash their content inputs (see rebuild.content_hash()), so template,
+    image markup or related-articles changes don't move their lastmod. Other pages,
+    and articles without a stored source, hash the served file.
+    """
+    digest = rebuild.content_hash(article) if article else None
+    return digest or file_hash(os.path.join(PROJECT_ROOT, path))
+
+def html_files(folder):
+    """Paths (relative to the project root, with /) of the .html files under a folder, sorted"""
+    paths = []
+    root_folder = os.path.join(PROJECT_ROOT, folder)
+    for root, dirs, files in os.walk(root_folder):
+        dirs.sort()
+        relative = os.path.relpath(root, PROJECT_ROOT).replace(os.sep, '/')
+        paths.extend(f'{relative}/{filename}' for filename in sorted(files) if filename.endswith('.html'))
+    return paths
+
+def collect_pages(articles):
+    """
+    List every page of the site in sitemap order.
+
+    Articles come from articles.json (newest first) rather than a directory listing.
+
+    Returns:
+        list: (path, kind, article or None) tuples
+    """
+    pages = [('index.html', 'home', None), ('404.html', 'error', None)]
+    pages.extend((path, 'page', None) for path in html_files('pages'))
+    for article in articles:
+        url = article.get('url') or f"articles/{article['id']}.html"
+        if os.path.exists(os.path.join(PROJECT_ROOT, url)):
+            pages.append((url, 'article', article))
+    pages.extend((path, 'category', None) for path in html_files('category'))
+    return pages
+
+def update_state(pages, state, now):
+    """
+    Refresh the state for the current pages.
+
+    A page's lastmod moves to today only when its page_hash() changes. Articles
+    seen for the first time start at their publication date, and get a
+    "published" timestamp for the news sitemap. Entries without a hash (see
+    load_state()) take the current one and keep their lastmod.
+
+    Returns:
+        dict: The state of the current pages only
+    """
+    today = now.strftime("%Y-%m-%d")
+    urls = {}
+    for path, kind, article in pages:
+        digest = page_hash(path, article)
+        entry = dict(state.get(path, {}))
+        if not entry:
+            published = parse_article_date(article.get('date')) if article else None
+            entry["lastmod"] = published.strftime("%Y-%m-%d") if published else today
+            if article:
+                # Only articles published after the state existed get an exact time
+                is_new = published is None or published.date() >= (now - timedelta(hours=NEWS_WINDOW_HOURS)).date()
+                entry["published"] = now.isoformat(timespec='seconds') if is_new else None
+        elif "hash" in entry and entry["hash"] != digest:
+            entry["lastmod"] = today
+        entry["hash"] = digest
+        urls[path] = entry
+    return urls
+
+def render_urlset(pages, urls):
+    """Render a <urlset> for the given pages"""
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', f'<urlset xmlns="{SITEMAP_NS}">']
+    for path, kind, _ in pages:
+        changefreq, priority = PAGE_SETTINGS[kind]
+        lines.append('  <url>')
+        lines.append(f'    <loc>{escape(f"{BASE_URL}/{path}")}</loc>')
+        lines.append(f'    <lastmod>{urls[path]["lastmod"]}</lastmod>')
+        lines.append(f'    <changefreq>{changefreq}</changefreq>')
+        lines.append(f'    <priority>{priority}</priority>')
+        lines.append('  </url>')
+    lines.append('</urlset>')
+    return '\n'.join(lines)
+
+def render_sitemap_index(sitemaps):
+    """Render a <sitemapindex> from (path, lastmod) pairs"""
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', f'<sitemapindex xmlns="{SITEMAP_NS}">']
+    for path, lastmod in sitemaps:
+        lines.append('  <sitemap>')
+        lines.append(f'    <loc>{BASE_URL}/{path}</loc>')
+        lines.append(f'    <lastmod>{lastmod}</lastmod>')
+        lines.append('  </sitemap>')
+    lines.append('</sitemapindex>')
+    return '\n'.join(lines)
+
+def render_news_sitemap(pages, urls, now):
+    """Render the Google News sitemap of the articles published in the last NEWS_WINDOW_HOURS"""
+    since = now - timedelta(hours=NEWS_WINDOW_HOURS)
+    recent = []
+    for path, kind, article in pages:
+        published = urls[path].get("published") if kind == 'article' else None
+        if published and datetime.fromisoformat(published) >= since:
+            recent.append((published, path, article))
+    recent.sort(key=lambda item: item[0], reverse=True)
+
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', f'<urlset xmlns="{SITEMAP_NS}" xmlns:news="{NEWS_NS}">']
+    for published, path, article in recent[:NEWS_MAX_URLS]:
+        lines.append('  <url>')
+        lines.append(f'    <loc>{escape(f"{BASE_URL}/{path}")}</loc>')
+        lines.append('    <news:news>')
+        lines.append('      <news:publication>')
+        lines.append(f'        <news:name>{SITE_NAME}</news:name>')
+        lines.append('        <news:language>en</news:language>')
+        lines.append('      </news:publication>')
+        lines.append(f'      <news:publication_date>{published}</news:publication_date>')
+        lines.append(f'      <news:title>{escape(article.get("title", ""))}</news:title>')
+        lines.append('    </news:news>')
+        lines.append('  </url>')
+    lines.append('</urlset>')
+    return '\n'.join(lines), len(recent[:NEWS_MAX_URLS])
+
+def article_month(article, entry):
+    """YYYY-MM an article is filed under in the per-month sitemaps"""
+    published = parse_article_date(article.get('date'))
+    if published:
+        return published.strftime("%Y-%m")
+    return entry["lastmod"][:7]
+
+def write_sharded(pages, urls):
+    """
+    Write sitemap.xml as an index of sitemaps/sitemap-pages.xml (everything but
+    articles) and one sitemaps/sitemap-YYYY-MM.xml per month of articles.
+
+    Returns:
+        set: Filenames written under sitemaps/
+    """
+    os.makedirs(SITEMAPS_DIR, exist_ok=True)
+    groups = {'pages': [page for page in pages if page[1] != 'article']}
+    for page in pages:
+        if page[1] == 'article':
+            groups.setdefault(article_month(page[2], urls[page[0]]), []).append(page)
+
+    index = []
+    filenames = set()
+    for name in sorted(groups, key=lambda name: (name != 'pages', name)):
+        filename = f'sitemap-{name}.xml'
+        filenames.add(filename)
+        html_generator.write_if_changed(os.path.join(SITEMAPS_DIR, filename), render_urlset(groups[name], urls))
+        lastmod = max(urls[path]["lastmod"] for path, _, _ in groups[name])
+        index.append((f'sitemaps/{filename}', lastmod))
+    index.append(('sitemap-news.xml', max(entry["lastmod"] for entry in urls.values())))
+
+    html_generator.write_if_changed(SITEMAP_PATH, render_sitemap_index(index))
+    return filenames
+
+def build_sitemaps(now=None):
+    """
+    Update sitemap.xml and sitemap-news.xml.
+
+    Files are only rewritten when their content changes, so a run without new or
+    changed pages leaves them untouched.
+
+    Returns:
+        bool: True on success
+    """
+    now = now or datetime.now(timezone.utc)
+    articles_path = os.path.join(PROJECT_ROOT, 'json', 'articles.json')
+    try:
+        with open(articles_path, 'r', encoding='utf-8') as f:
+            articles = json.load(f)
+    except Exception as e:
+        print(f"Error reading articles.json for sitemap: {e}")
+        return False
+
+    try:
+        pages = collect_pages(articles)
+        state = load_state()
+        urls = update_state(pages, state, now)
+        new_count = sum(1 for path in urls if path not in state)
+        changed_count = sum(1 for path in urls if path in state and urls[path]["lastmod"] != state[path].get("lastmod"))
+
+        if len(pages) > MAX_URLS_PER_SITEMAP:
+            keep = write_sharded(pages, urls)
+            layout = f"an index of {len(keep)} sitemaps"
+        else:
+            html_generator.write_if_changed(SITEMAP_PATH, render_urlset(pages, urls))
+            keep = set()
+            layout = "a single sitemap"
+
+        # Drop per-month sitemaps that are no longer listed
+        if os.path.isdir(SITEMAPS_DIR):
+            for filename in os.listdir(SITEMAPS_DIR):
+                if filename not in keep:
+                    os.remove(os.path.join(SITEMAPS_DIR, filename))
+            if not keep:
+                os.rmdir(SITEMAPS_DIR)
+
+        news_xml, news_count = render_news_sitemap(pages, urls, now)
+        html_generator.write_if_changed(NEWS_SITEMAP_PATH, news_xml)
+
+        if urls != state:
+            save_state(urls)
+        print(f"Updated sitemap.xml ({len(pages)} URLs as {layout}, {new_count} new, "
+              f"{changed_count} modified) and sitemap-news.xml ({news_count} recent articles)")
+        return True
+    except Exception as e:
+        print(f"Error generating sitemaps: {e}")
+        return False
@@ -0,0 +1,109 @@
+"""
+Page templates
+Renders the generated HTML pages from the Jinja2 templates in python/templates,
+with the head, nav and footer shared as partials. The environment is built once
+per process and compiled templates are cached on disk between runs.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, StrictUndefined
+
+# Get the directory where this script is located
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Get the project root directory (parent of python directory)
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+TEMPLATES_DIR = os.path.join(SCRIPT_DIR, 'templates')
+# Kept outside temp/ so html_generator.clear_temp_folder() doesn't wipe it
+BYTECODE_CACHE_DIR = os.path.join(PROJECT_ROOT, '.cache', 'templates')
+CATEGORIES_PATH = os.path.join(PROJECT_ROOT, 'json', 'categories.json')
+
+SITE_NAME = "OmniTrends"
+SITE_URL = "https://omnitrends.github.io"
+
+# Static pages linked from the nav and footer, in menu order
+INFO_PAGES = [
+    {"name": "About", "file": "about.html"},
+    {"name": "Contact", "file": "contact.html"},
+    {"name": "Privacy Policy", "file": "privacy.html"},
+    {"name": "Terms & Conditions", "file": "terms.html"},
+    {"name": "Disclaimer", "file": "disclaimer.html"}
+]
+
+_environment = None
+_lock = threading.Lock()
+
+def load_site_globals():
+    """Values every template can use: site name and URL, categories and static pages"""
+    try:
+        with open(CATEGORIES_PATH, 'r', encoding='utf-8') as f:
+            categories = json.load(f).get('categories', [])
+    except Exception as e:
+        print(f"Error reading categories.json for templates: {e}")
+        categories = []
+
+    return {
+        "site_name": SITE_NAME,
+        "site_url": SITE_URL,
+        "categories": [{"name": category['name'], "slug": category['slug']} for category in categories],
+        "info_pages": INFO_PAGES
+    }
+
+def get_environment():
+    """
+    Return the process-wide Jinja2 environment.
+
+    Templates are compiled on first use and kept in memory; the compiled bytecode
+    is also written to .cache/templates so the next process skips compilation.
+    Autoescaping is off because the context values are already HTML (rendered
+    markdown, related sections) or plain text inserted as the pages always had it.
+    """
+    global _environment
+    with _lock:
+        if _environment is None:
+            os.makedirs(BYTECODE_CACHE_DIR, exist_ok=True)
+            environment = Environment(
+                loader=FileSystemLoader(TEMPLATES_DIR),
+                bytecode_cache=FileSystemBytecodeCache(BYTECODE_CACHE_DIR),
+                autoescape=False,
+                auto_reload=False,
+                trim_blocks=True,
+                lstrip_blocks=True,
+                keep_trailing_newline=True,
+                undefined=StrictUndefined
+            )
+            environment.globals.update(load_site_globals())
+            _environment = environment
+        return _environment
+
+def render(template_name, context):
+    """
+    Render a template.
+
+    Args:
+        template_name (str): Path relative to python/templates, e.g. "article.html"
+        context (dict): Template variables
+
+    Returns:
+        str: The rendered page
+    """
+    return get_environment().get_template(template_name).render(context)
+
+def template_version():
+    """
+    Hash of every template file and the site-wide values, so callers can tell when
+    pages rendered earlier are out of date.
+    """
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(TEMPLATES_DIR):
+        dirs.sort()
+        for filename in sorted(files):
+            path = os.path.join(root, filename)
+            digest.update(os.path.relpath(path, TEMPLATES_DIR).encode('utf-8') + b'\0')
+            with open(path, 'rb') as f:
+                digest.update(f.read() + b'\0')
+    digest.update(json.dumps(get_environment().globals.get('categories'), sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()[:16]
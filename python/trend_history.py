@@ -0,0 +1,245 @@
+"""
+Trend history store
+Appends every scrape to a SQLite time series (rank, search volume and status per
+trend) so trajectories and velocities can be queried later without re-scraping
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+
+# Get the directory where this script is located
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Get the project root directory (parent of python directory)
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+# Kept outside temp/ so html_generator.clear_temp_folder() doesn't wipe it
+DEFAULT_HISTORY_PATH = os.path.join(PROJECT_ROOT, '.cache', 'trend_history.sqlite3')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scrapes (
+    id INTEGER PRIMARY KEY,
+    scraped_at INTEGER NOT NULL,
+    location TEXT,
+    timeframe TEXT
+);
+CREATE TABLE IF NOT EXISTS trends (
+    id INTEGER PRIMARY KEY,
+    name_key TEXT NOT NULL UNIQUE,
+    trend_name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS trend_points (
+    trend_id INTEGER NOT NULL REFERENCES trends (id),
+    scraped_at INTEGER NOT NULL,
+    scrape_id INTEGER NOT NULL REFERENCES scrapes (id),
+    rank INTEGER,
+    search_volume_numeric INTEGER NOT NULL,
+    active_status TEXT,
+    PRIMARY KEY (trend_id, scraped_at, scrape_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_trend_points_time ON trend_points (scraped_at);
+"""
+
+def normalize_trend_name(trend_name):
+    """Key used to match the same trend across scrapes (case, punctuation and spacing ignored)"""
+    return re.sub(r'\s+', ' ', re.sub(r'[^\w\s]', ' ', trend_name.lower())).strip()
+
+class TrendHistory:
+    """Append-only trend time series backed by SQLite"""
+
+    def __init__(self, path=DEFAULT_HISTORY_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+
+    def _trend_id(self, trend_name):
+        key = normalize_trend_name(trend_name)
+        self.conn.execute(
+            "INSERT OR IGNORE INTO trends (name_key, trend_name) VALUES (?, ?)", (key, trend_name)
+        )
+        return self.conn.execute("SELECT id FROM trends WHERE name_key = ?", (key,)).fetchone()[0]
+
+    def record_scrape(self, trends_data, location=None, timeframe=None, scraped_at=None):
+        """
+        Append one scrape to the history.
+
+        Args:
+            trends_data (list): Filtered trends with rank, trend_name, search_volume_numeric
+                and active_status
+            location (str): Location label of the scrape
+            timeframe (str): Timeframe label of the scrape
+            scraped_at (float): Unix timestamp of the scrape (default: now)
+
+        Returns:
+            int: Id of the recorded scrape
+        """
+        scraped_at = int(scraped_at if scraped_at is not None else time.time())
+        with self.lock:
+            cursor = self.conn.execute(
+                "INSERT INTO scrapes (scraped_at, location, timeframe) VALUES (?, ?, ?)",
+                (scraped_at, location, timeframe)
+            )
+            scrape_id = cursor.lastrowid
+
+            points = {}
+            for trend in trends_data:
+                trend_id = self._trend_id(trend['trend_name'])
+                # Names that normalize to the same key keep the best ranked row
+                if trend_id not in points:
+                    points[trend_id] = (
+                        trend_id, scraped_at, scrape_id, trend.get('rank'),
+                        trend.get('search_volume_numeric', 0), trend.get('active_status')
+                    )
+
+            self.conn.executemany(
+                """INSERT INTO trend_points
+                   (trend_id, scraped_at, scrape_id, rank, search_volume_numeric, active_status)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                points.values()
+            )
+            self.conn.commit()
+        return scrape_id
+
+    def volume_trajectory(self, trend_name, hours=None):
+        """
+        Return the recorded points for one trend, oldest first.
+
+        Args:
+            trend_name (str): Trend name (matched after normalization)
+            hours (float): Only return points from the last this many hours
+
+        Returns:
+            list: Dicts with scraped_at (Unix time), rank, search_volume_numeric and active_status
+        """
+        since = time.time() - hours * 3600 if hours else 0
+        with self.lock:
+            rows = self.conn.execute(
+                """SELECT p.scraped_at, p.rank, p.search_volume_numeric, p.active_status
+                   FROM trend_points p JOIN trends t ON t.id = p.trend_id
+                   WHERE t.name_key = ? AND p.scraped_at >= ?
+                   ORDER BY p.scraped_at""",
+                (normalize_trend_name(trend_name), since)
+            ).fetchall()
+        return [
+            {"scraped_at": scraped_at, "rank": rank, "search_volume_numeric": volume, "active_status": status}
+            for scraped_at, rank, volume, status in rows
+        ]
+
+    def trend_velocities(self, hours=24, now=None):
+        """
+        Volume change per hour for every trend seen in the last hours.
+
+        A trend's baseline is its first point in the window; trends that first
+        appeared inside the window rise from zero at that point.
+
+        Returns:
+            dict: name_key -> {"trend_name", "first_volume", "latest_volume", "velocity"}
+        """
+        now = now if now is not None else time.time()
+        since = now - hours * 3600
+        with self.lock:
+            rows = self.conn.execute(
+                """SELECT t.name_key, t.trend_name, p.scraped_at, p.search_volume_numeric,
+                          EXISTS (SELECT 1 FROM trend_points q WHERE q.trend_id = p.trend_id AND q.scraped_at < ?)
+                   FROM trend_points p JOIN trends t ON t.id = p.trend_id
+                   WHERE p.scraped_at >= ?
+                   ORDER BY t.name_key, p.scraped_at""",
+                (since, since)
+            ).fetchall()
+
+        velocities = {}
+        for name_key, trend_name, scraped_at, volume, seen_before in rows:
+            entry = velocities.get(name_key)
+            if entry is None:
+                entry = velocities[name_key] = {
+                    "trend_name": trend_name,
+                    "first_at": scraped_at,
+                    "first_volume": volume if seen_before else 0
+                }
+            entry["latest_volume"] = volume
+
+        for entry in velocities.values():
+            elapsed_hours = max((now - entry.pop("first_at")) / 3600, 1)
+            entry["velocity"] = (entry["latest_volume"] - entry["first_volume"]) / elapsed_hours
+        return velocities
+
+    def rising_trends(self, hours=24, limit=10):
+        """Return the trends whose volume rose fastest in the last hours, fastest first"""
+        velocities = self.trend_velocities(hours)
+        rising = [entry for entry in velocities.values() if entry["velocity"] > 0]
+        rising.sort(key=lambda entry: -entry["velocity"])
+        return rising[:limit]
+
+    def close(self):
+        """Close the underlying database"""
+        with self.lock:
+            self.conn.close()
+
+_history = None
+_history_lock = threading.Lock()
+
+def get_trend_history():
+    """
+    Return the process-wide trend history, or None when it is disabled.
+
+    Configured with TRENDS_HISTORY (set to 0 to disable) and TRENDS_HISTORY_PATH.
+    """
+    global _history
+    if os.getenv('TRENDS_HISTORY', '1') == '0':
+        return None
+    with _history_lock:
+        if _history is None:
+            try:
+                _history = TrendHistory(os.getenv('TRENDS_HISTORY_PATH', DEFAULT_HISTORY_PATH))
+            except Exception as e:
+                # A broken history store must never stop a scrape
+                print(f"Warning: trend history unavailable: {e}")
+                return None
+        return _history
+
+def record_trends(trends_data, location=None, timeframe=None):
+    """Append a scrape to the shared history, ignoring (but reporting) storage errors"""
+    history = get_trend_history()
+    if not history or not trends_data:
+        return None
+    try:
+        scrape_id = history.record_scrape(trends_data, location, timeframe)
+        print(f"Recorded {len(trends_data)} trends in trend history")
+        return scrape_id
+    except Exception as e:
+        print(f"Warning: could not record trend history: {e}")
+        return None
+
+def main():
+    """Print the trajectory of one trend, or the fastest rising trends"""
+    import argparse
+    from datetime import datetime
+
+    parser = argparse.ArgumentParser(description="Query the recorded trend history")
+    parser.add_argument('trend', nargs='?', help="show the volume trajectory of this trend")
+    parser.add_argument('--hours', type=float, default=24, help="look-back window in hours")
+    parser.add_argument('--limit', type=int, default=10, help="number of rising trends to show")
+    args = parser.parse_args()
+
+    history = TrendHistory(os.getenv('TRENDS_HISTORY_PATH', DEFAULT_HISTORY_PATH))
+    try:
+        if args.trend:
+            points = history.volume_trajectory(args.trend, args.hours)
+            print(f"Volume trajectory for '{args.trend}' (last {args.hours:g} hours): {len(points)} points")
+            for point in points:
+                scraped_at = datetime.fromtimestamp(point['scraped_at']).strftime('%Y-%m-%d %H:%M')
+                print(f"{scraped_at}  rank {point['rank']:<4} {point['search_volume_numeric']:>10}  {point['active_status']}")
+        else:
+            print(f"Trends rising fastest in the last {args.hours:g} hours:")
+            for entry in history.rising_trends(args.hours, args.limit):
+                print(f"{entry['trend_name']:<40} {entry['first_volume']:>10} -> {entry['latest_volume']:<10} {entry['velocity']:>10.0f}/h")
+    finally:
+        history.close()
+
+if __name__ == "__main__":
+    main()
@@ -14,12 +14,18 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, SessionNotCreatedException
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from driver_manager import get_chromedriver_path, invalidate_cached_driver
+import trend_history
 import json
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 import os
+import urllib.request
+import xml.etree.ElementTree as ET
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Get the directory where this script is located
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -32,51 +38,16 @@ if sys.platform == "win32":
     sys.stdout = codecs.getwriter("utf-8")(sys.stdout.detach())
     sys.stderr = codecs.getwriter("utf-8")(sys.stderr.detach())
 
-class GoogleTrendsScraper:
-    def __init__(self):
-        self.driver = None
-        self.setup_driver()
-    
-    def setup_driver(self):
-        """Setup Chrome driver with stealth options to avoid detection"""
-        chrome_options = Options()
-        
-        # Headless mode
-        chrome_options.add_argument("--headless")
-        
-        # Stealth options to avoid detection
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        
-        # User agent to appear as regular browser
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-        
-        # Additional stealth options
-        chrome_options.add_argument("--disable-extensions")
-        chrome_options.add_argument("--disable-plugins-discovery")
-        chrome_options.add_argument("--disable-web-security")
-        chrome_options.add_argument("--disable-features=VizDisplayCompositor")
-        chrome_options.add_argument("--window-size=1920,1080")
-        
-        try:
-            # Use webdriver-manager to automatically download and setup ChromeDriver
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            
-            # Execute script to remove webdriver property
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            
-        except Exception as e:
-            print(f"Error setting up Chrome driver: {e}")
-            print("Make sure Chrome browser is installed")
-            raise
+# Default slice, matching the original single-page scrape
+DEFAULT_GEO = "IN"
+DEFAULT_HOURS = 4
+
+class TrendsSource:
+    """Base class for trends backends; subclasses return rows shaped like the scraped table"""
     
-    def random_delay(self, min_seconds=1, max_seconds=3):
-        """Add random delay to mimic human behavior"""
-        time.sleep(random.uniform(min_seconds, max_seconds))
+    # Page the trends come from, used in the saved JSON metadata
+    location = "India"
+    timeframe = "Last 4 hours"
     
     def is_english_text(self, text):
         """Check if text is primarily in English"""
@@ -96,90 +67,6 @@ class GoogleTrendsScraper:
         # Consider text English if at least 70% of characters are English
         return (english_chars / total_chars) >= 0.7 if total_chars > 0 else False
     
-    def scrape_trends(self):
-        """Scrape Google Trends data for India in last 4 hours"""
-        url = "https://trends.google.com/trending?geo=IN&hours=4"
-        
-        try:
-            print("Loading Google Trends page...")
-            self.driver.get(url)
-            
-            # Wait for page to load and add random delay
-            self.random_delay(3, 5)
-            
-            # Wait for the table to be present
-            wait = WebDriverWait(self.driver, 20)
-            wait.until(EC.presence_of_element_located((By.XPATH, "//table/tbody[2]")))
-            
-            print("Page loaded successfully. Extracting trends data...")
-            
-            trends_data = []
-            
-            # Extract data for all 25 rows
-            for i in range(1, 26):
-                try:
-                    # XPath for trend name
-                    trend_xpath = f"/html/body/c-wiz/div/div[5]/div[1]/c-wiz/div/div[2]/div[1]/div[1]/div[1]/table/tbody[2]/tr[{i}]/td[2]/div[1]"
-                    
-                    # XPath for search volume
-                    volume_xpath = f"/html/body/c-wiz/div/div[5]/div[1]/c-wiz/div/div[2]/div[1]/div[1]/div[1]/table/tbody[2]/tr[{i}]/td[3]/div/div[1]"
-                    
-                    # XPath for active status
-                    status_xpath = f"/html/body/c-wiz/div/div[5]/div[1]/c-wiz/div/div[2]/div[1]/div[1]/div[1]/table/tbody[2]/tr[{i}]/td[4]/div[2]/div/div"
-                    
-                    # Extract trend name
-                    try:
-                        trend_element = self.driver.find_element(By.XPATH, trend_xpath)
-                        trend_name = trend_element.text.strip()
-                    except NoSuchElementException:
-                        trend_name = "N/A"
-                    
-                    # Extract search volume
-                    try:
-                        volume_element = self.driver.find_element(By.XPATH, volume_xpath)
-                        search_volume = volume_element.text.strip()
-                    except NoSuchElementException:
-                        search_volume = "N/A"
-                    
-                    # Extract active status
-                    try:
-                        status_element = self.driver.find_element(By.XPATH, status_xpath)
-                        active_status = status_element.text.strip()
-                        if not active_status:
-                            # Try to get class or other attributes that might indicate status
-                            active_status = status_element.get_attribute("class") or "Unknown"
-                    except NoSuchElementException:
-                        active_status = "N/A"
-                    
-                    # Only add if we have at least the trend name
-                    if trend_name and trend_name != "N/A":
-                        trend_data = {
-                            "rank": i,
-                            "trend_name": trend_name,
-                            "search_volume": search_volume,
-                            "active_status": active_status
-                        }
-                        trends_data.append(trend_data)
-                        print(f"Extracted trend {i}: {trend_name}")
-                    
-                    # Small delay between extractions
-                    self.random_delay(0.1, 0.3)
-                    
-                except Exception as e:
-                    print(f"Error extracting data for row {i}: {e}")
-                    continue
-            
-            # Filter for English trends with Active status
-            filtered_trends = self.filter_trends(trends_data)
-            return filtered_trends
-            
-        except TimeoutException:
-            print("Timeout waiting for page to load. The page structure might have changed.")
-            return []
-        except Exception as e:
-            print(f"Error scraping trends: {e}")
-            return []
-    
     def parse_search_volume(self, volume_str):
         """Parse search volume string to numeric value"""
         if not volume_str or volume_str == "N/A":
@@ -269,7 +156,7 @@ class GoogleTrendsScraper:
             return
         
         print("\n" + "="*80)
-        print("GOOGLE TRENDS - INDIA (Last 4 Hours)")
+        print(f"GOOGLE TRENDS - {self.location.upper()} ({self.timeframe})")
         print("FILTERED RESULTS: English Language + Active Status Only")
         print("SORTED BY: Search Volume (Descending)")
         print(f"Scraped on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -284,11 +171,8 @@ class GoogleTrendsScraper:
         print("-"*80)
         print(f"Total trends found: {len(trends_data)}")
     
-    def save_to_json(self, trends_data, filename="latest_trends.json"):
-        """Save trends data to JSON file in json folder"""
-        if not trends_data:
-            return
-        
+    def build_trends_payload(self, trends_data):
+        """Build the latest_trends.json payload from filtered trends data"""
         # Prepare data for JSON (remove internal numeric field, keep display format)
         json_trends = []
         for trend in trends_data:
@@ -302,13 +186,21 @@ class GoogleTrendsScraper:
         
         data_to_save = {
             "timestamp": datetime.now().isoformat(),
-            "location": "India",
-            "timeframe": "Last 4 hours",
+            "location": self.location,
+            "timeframe": self.timeframe,
             "filter_criteria": "English language + Active status only",
             "sort_order": "Descending by search volume",
             "total_filtered_trends": len(trends_data),
             "trends": json_trends
         }
+        return data_to_save
+    
+    def save_to_json(self, trends_data, filename="latest_trends.json"):
+        """Save trends data to JSON file in json folder"""
+        if not trends_data:
+            return
+        
+        data_to_save = self.build_trends_payload(trends_data)
         
         # Save to temp folder using absolute path
         temp_folder_path = os.path.join(PROJECT_ROOT, "temp")
@@ -321,27 +213,645 @@ class GoogleTrendsScraper:
         except Exception as e:
             print(f"Error saving to JSON: {e}")
     
+    def record_history(self, trends_data):
+        """Append filtered trends to the trend history store"""
+        return trend_history.record_trends(trends_data, self.location, self.timeframe)
+    
+    def scrape_trends(self, geo=None, hours=None):
+        """Return filtered trends (rank, trend_name, search_volume, active_status, ...)"""
+        raise NotImplementedError
+    
+    def scrape_slices(self, slices, max_workers=4):
+        """
+        Scrape several (geo, hours) slices.
+        
+        The base implementation scrapes them one after another; backends override
+        it to fan out over a bounded pool of workers.
+        
+        Returns:
+            list: (geo, hours, filtered trends) tuples in the order of slices
+        """
+        return [(geo, hours, self.scrape_trends(geo, hours)) for geo, hours in slices]
+    
+    def normalize_trend_name(self, trend_name):
+        """Key used to match the same trend across slices (case, punctuation and spacing ignored)"""
+        return trend_history.normalize_trend_name(trend_name)
+    
+    def merge_slices(self, slice_results):
+        """
+        Merge per-slice results into one ranked list, deduplicated by normalized trend name.
+        
+        Slices overlap (IN contains IN-MH, the 48h window contains the 4h one), so a
+        trend seen in several slices keeps its highest parsed volume rather than the sum.
+        """
+        merged = {}
+        
+        for geo, hours, trends_data in slice_results:
+            label = f"{geo}/{hours}h"
+            for trend in trends_data:
+                key = self.normalize_trend_name(trend['trend_name'])
+                if not key:
+                    continue
+                
+                existing = merged.get(key)
+                if existing is None:
+                    merged[key] = dict(trend, slices=[label])
+                    continue
+                
+                existing['slices'].append(label)
+                if trend['search_volume_numeric'] > existing['search_volume_numeric']:
+                    existing['search_volume'] = trend['search_volume']
+                    existing['search_volume_display'] = trend['search_volume_display']
+                    existing['search_volume_numeric'] = trend['search_volume_numeric']
+        
+        # Highest volume first; trends seen in more slices win ties
+        merged_trends = sorted(merged.values(), key=lambda x: (-x['search_volume_numeric'], -len(x['slices']), x['rank']))
+        for index, trend in enumerate(merged_trends, 1):
+            trend['rank'] = index
+        
+        total = sum(len(trends_data) for _, _, trends_data in slice_results)
+        print(f"\nMerged {total} trends from {len(slice_results)} slices into {len(merged_trends)} unique trends")
+        return merged_trends
+    
+    def scrape_multi(self, slices, max_workers=4):
+        """Scrape every slice in parallel and return the merged, deduplicated trends"""
+        geos = list(dict.fromkeys(geo for geo, _ in slices))
+        windows = list(dict.fromkeys(str(hours) for _, hours in slices))
+        self.location = f"India ({', '.join(geos)})"
+        self.timeframe = f"Last {'/'.join(windows)} hours"
+        
+        start = time.perf_counter()
+        slice_results = self.scrape_slices(slices, max_workers)
+        print(f"Scraped {len(slices)} slices in {time.perf_counter() - start:.2f}s")
+        return self.merge_slices(slice_results)
+    
+    def scrape(self, slices=None, max_workers=4):
+        """Scrape the default slice, or several slices merged when slices are given"""
+        if slices:
+            return self.scrape_multi(slices, max_workers)
+        return self.scrape_trends()
+    
+    def close(self):
+        """Release any resources held by the backend"""
+        pass
+
+class GoogleTrendsScraper(TrendsSource):
+    """Selenium backend that renders the Google Trends page in headless Chrome"""
+    
+    # Resources the trends table doesn't need, blocked in fast-load mode
+    BLOCKED_URL_PATTERNS = [
+        "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+        "*.woff", "*.woff2", "*.ttf", "*.otf",
+        "*.mp4", "*.webm", "*.mp3", "*.ogg"
+    ]
+    
+    def __init__(self, fast_load=True, expected_rows=25):
+        """
+        Args:
+            fast_load (bool): Use the "eager" page-load strategy, block images, fonts and
+                media, and stop waiting as soon as the table rows are present
+            expected_rows (int): Number of table rows that means the page is ready
+        """
+        self.driver = None
+        self.fast_load = fast_load
+        self.expected_rows = expected_rows
+        self.timings = {}
+        self.setup_driver()
+    
+    def setup_driver(self):
+        """Setup Chrome driver with stealth options to avoid detection"""
+        chrome_options = Options()
+        
+        # Headless mode
+        chrome_options.add_argument("--headless")
+        
+        # Stealth options to avoid detection
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        chrome_options.add_experimental_option('useAutomationExtension', False)
+        
+        # User agent to appear as regular browser
+        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+        
+        # Additional stealth options
+        chrome_options.add_argument("--disable-extensions")
+        chrome_options.add_argument("--disable-plugins-discovery")
+        chrome_options.add_argument("--disable-web-security")
+        chrome_options.add_argument("--disable-features=VizDisplayCompositor")
+        chrome_options.add_argument("--window-size=1920,1080")
+        
+        if self.fast_load:
+            # Hand control back at DOMContentLoaded instead of waiting for every subresource
+            chrome_options.page_load_strategy = 'eager'
+            chrome_options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        
+        try:
+            # Resolve ChromeDriver through the on-disk cache instead of checking versions every run
+            service = Service(get_chromedriver_path())
+            try:
+                self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            except SessionNotCreatedException as e:
+                # Usually Chrome has updated past the cached driver: resolve it again, once
+                print(f"Chrome rejected the cached ChromeDriver ({e.msg}), reinstalling it...")
+                invalidate_cached_driver()
+                service = Service(get_chromedriver_path(force_check=True))
+                self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            
+            # Execute script to remove webdriver property
+            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            
+            if self.fast_load:
+                self.block_heavy_resources()
+            
+        except Exception as e:
+            print(f"Error setting up Chrome driver: {e}")
+            print("Make sure Chrome browser is installed")
+            raise
+    
+    def ensure_driver(self):
+        """Restart the browser if a long-lived session has died"""
+        try:
+            if self.driver:
+                self.driver.execute_script("return 1")
+                return
+        except Exception as e:
+            print(f"Browser session lost ({e}), restarting Chrome...")
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+        self.setup_driver()
+    
+    def block_heavy_resources(self):
+        """Block images, fonts and media through the Chrome DevTools Protocol"""
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.BLOCKED_URL_PATTERNS})
+        except Exception as e:
+            print(f"Could not block page resources: {e}")
+    
+    def table_ready(self, driver):
+        """Wait condition: the trends table has its expected rows, or the page finished with some rows"""
+        state = driver.execute_script("""
+            const tbody = document.evaluate("//table/tbody[2]", document, null,
+                XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+            return {
+                rows: tbody ? tbody.querySelectorAll(":scope > tr").length : 0,
+                complete: document.readyState === "complete"
+            };
+        """)
+        rows = state.get('rows', 0)
+        return rows >= self.expected_rows or (state.get('complete') and rows > 0)
+    
+    def wait_for_table(self):
+        """Block until the trends table is ready to extract"""
+        wait = WebDriverWait(self.driver, 20, poll_frequency=0.1)
+        if self.fast_load:
+            wait.until(self.table_ready)
+        else:
+            # Wait for page to load and add random delay
+            self.random_delay(3, 5)
+            wait.until(EC.presence_of_element_located((By.XPATH, "//table/tbody[2]")))
+    
+    def report_timings(self):
+        """Print how long each scrape phase took"""
+        mode = "fast-load" if self.fast_load else "standard"
+        phases = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.timings.items())
+        print(f"Scrape timings ({mode}): {phases}")
+    
+    def random_delay(self, min_seconds=1, max_seconds=3):
+        """Add random delay to mimic human behavior"""
+        time.sleep(random.uniform(min_seconds, max_seconds))
+    
+    def trends_url(self, geo=DEFAULT_GEO, hours=DEFAULT_HOURS):
+        """URL of the trending page for one region and time window"""
+        return f"https://trends.google.com/trending?geo={geo}&hours={hours}"
+    
+    def extract_table(self):
+        """Pull the whole table in one round-trip, falling back to per-row XPath lookups"""
+        trends_data = self.extract_rows_bulk()
+        if not trends_data:
+            print("Bulk extraction found no rows, falling back to per-row XPath lookups...")
+            trends_data = self.extract_rows_xpath()
+        return trends_data
+    
+    def scrape_trends(self, geo=DEFAULT_GEO, hours=DEFAULT_HOURS):
+        """Scrape Google Trends data for one region and time window (India, last 4 hours by default)"""
+        url = self.trends_url(geo, hours)
+        
+        self.timings = {}
+        start = time.perf_counter()
+        
+        try:
+            self.ensure_driver()
+            
+            print("Loading Google Trends page...")
+            self.driver.get(url)
+            self.timings['page_load'] = time.perf_counter() - start
+            
+            # Wait for the table to be present
+            phase_start = time.perf_counter()
+            self.wait_for_table()
+            self.timings['table_wait'] = time.perf_counter() - phase_start
+            
+            print("Page loaded successfully. Extracting trends data...")
+            
+            phase_start = time.perf_counter()
+            trends_data = self.extract_table()
+            self.timings['extract'] = time.perf_counter() - phase_start
+            self.timings['total'] = time.perf_counter() - start
+            self.report_timings()
+            
+            # Filter for English trends with Active status
+            filtered_trends = self.filter_trends(trends_data)
+            return filtered_trends
+            
+        except TimeoutException:
+            print("Timeout waiting for page to load. The page structure might have changed.")
+            return []
+        except Exception as e:
+            print(f"Error scraping trends: {e}")
+            return []
+    
+    def scrape_slices(self, slices, max_workers=4):
+        """
+        Load up to max_workers slices at once, each in its own tab of the same browser.
+        
+        window.open() returns immediately, so the pages of a batch load concurrently
+        and are then read one tab at a time. Tabs opened this way don't get the CDP
+        URL blocking, but images stay disabled through the browser prefs.
+        """
+        self.ensure_driver()
+        main_handle = self.driver.current_window_handle
+        results = []
+        
+        for offset in range(0, len(slices), max_workers):
+            batch = slices[offset:offset + max_workers]
+            
+            tab_names = []
+            for index, (geo, hours) in enumerate(batch, offset):
+                tab_name = f"trends-slice-{index}"
+                self.driver.execute_script("window.open(arguments[0], arguments[1]);", self.trends_url(geo, hours), tab_name)
+                tab_names.append(tab_name)
+            print(f"Opened {len(batch)} tabs: {', '.join(f'{geo}/{hours}h' for geo, hours in batch)}")
+            
+            for tab_name, (geo, hours) in zip(tab_names, batch):
+                try:
+                    self.driver.switch_to.window(tab_name)
+                except Exception as e:
+                    print(f"Could not open tab for {geo}/{hours}h: {e}")
+                    results.append((geo, hours, []))
+                    continue
+                
+                try:
+                    self.wait_for_table()
+                    print(f"Extracting trends for {geo}/{hours}h...")
+                    results.append((geo, hours, self.filter_trends(self.extract_table())))
+                except TimeoutException:
+                    print(f"Timeout waiting for {geo}/{hours}h to load.")
+                    results.append((geo, hours, []))
+                except Exception as e:
+                    print(f"Error scraping {geo}/{hours}h: {e}")
+                    results.append((geo, hours, []))
+                finally:
+                    self.driver.close()
+                    self.driver.switch_to.window(main_handle)
+        
+        return results
+    
+    def extract_rows_xpath(self, row_count=25):
+        """Fallback extraction: look up each cell with its own absolute XPath"""
+        trends_data = []
+        
+        # Extract data for all rows
+        for i in range(1, row_count + 1):
+            try:
+                # XPath for trend name
+                trend_xpath = f"/html/body/c-wiz/div/div[5]/div[1]/c-wiz/div/div[2]/div[1]/div[1]/div[1]/table/tbody[2]/tr[{i}]/td[2]/div[1]"
+                
+                # XPath for search volume
+                volume_xpath = f"/html/body/c-wiz/div/div[5]/div[1]/c-wiz/div/div[2]/div[1]/div[1]/div[1]/table/tbody[2]/tr[{i}]/td[3]/div/div[1]"
+                
+                # XPath for active status
+                status_xpath = f"/html/body/c-wiz/div/div[5]/div[1]/c-wiz/div/div[2]/div[1]/div[1]/div[1]/table/tbody[2]/tr[{i}]/td[4]/div[2]/div/div"
+                
+                # Extract trend name
+                try:
+                    trend_element = self.driver.find_element(By.XPATH, trend_xpath)
+                    trend_name = trend_element.text.strip()
+                except NoSuchElementException:
+                    trend_name = "N/A"
+                
+                # Extract search volume
+                try:
+                    volume_element = self.driver.find_element(By.XPATH, volume_xpath)
+                    search_volume = volume_element.text.strip()
+                except NoSuchElementException:
+                    search_volume = "N/A"
+                
+                # Extract active status
+                try:
+                    status_element = self.driver.find_element(By.XPATH, status_xpath)
+                    active_status = status_element.text.strip()
+                    if not active_status:
+                        # Try to get class or other attributes that might indicate status
+                        active_status = status_element.get_attribute("class") or "Unknown"
+                except NoSuchElementException:
+                    active_status = "N/A"
+                
+                # Only add if we have at least the trend name
+                if trend_name and trend_name != "N/A":
+                    trend_data = {
+                        "rank": i,
+                        "trend_name": trend_name,
+                        "search_volume": search_volume,
+                        "active_status": active_status
+                    }
+                    trends_data.append(trend_data)
+                    print(f"Extracted trend {i}: {trend_name}")
+                
+                # Small delay between extractions
+                self.random_delay(0.1, 0.3)
+                
+            except Exception as e:
+                print(f"Error extracting data for row {i}: {e}")
+                continue
+        
+        return trends_data
+    
+    def extract_rows_bulk(self, row_count=25):
+        """Extract every trends table row in a single execute_script call"""
+        script = """
+            const limit = arguments[0];
+            const tbody = document.evaluate("//table/tbody[2]", document, null,
+                XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+            if (!tbody) return [];
+            const pick = (row, path) => document.evaluate(path, row, null,
+                XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+            const text = node => (node && node.innerText || "").trim();
+            return Array.from(tbody.querySelectorAll(":scope > tr")).slice(0, limit).map(row => {
+                const trend = pick(row, "td[2]/div[1]");
+                const volume = pick(row, "td[3]/div/div[1]");
+                const status = pick(row, "td[4]/div[2]/div/div");
+                return {
+                    trend_name: trend ? text(trend) : "N/A",
+                    search_volume: volume ? text(volume) : "N/A",
+                    active_status: status ? (text(status) || status.getAttribute("class") || "Unknown") : "N/A"
+                };
+            });
+        """
+        
+        try:
+            rows = self.driver.execute_script(script, row_count) or []
+        except Exception as e:
+            print(f"Error during bulk extraction: {e}")
+            return []
+        
+        trends_data = []
+        for i, row in enumerate(rows, 1):
+            trend_name = row.get('trend_name') or "N/A"
+            # Only add if we have at least the trend name
+            if trend_name != "N/A":
+                trends_data.append({
+                    "rank": i,
+                    "trend_name": trend_name,
+                    "search_volume": row.get('search_volume') or "N/A",
+                    "active_status": row.get('active_status') or "N/A"
+                })
+                print(f"Extracted trend {i}: {trend_name}")
+        
+        return trends_data
+    
     def close(self):
         """Close the browser driver"""
         if self.driver:
             self.driver.quit()
 
+class RssTrendsSource(TrendsSource):
+    """Lightweight backend that reads the Google Trends RSS feed over plain HTTP"""
+    
+    FEED_URL = "https://trends.google.com/trending/rss?geo={geo}"
+    
+    def __init__(self, geo=DEFAULT_GEO, hours=DEFAULT_HOURS, fetch=None, timeout=30):
+        """
+        Args:
+            geo (str): Google Trends region code
+            hours (int): Only keep trends that started within this many hours
+            fetch (callable): Optional function taking a region code and returning the
+                feed XML, e.g. to replay a recorded fixture response offline
+            timeout (int): HTTP timeout in seconds
+        """
+        self.geo = geo
+        self.hours = hours
+        self.fetch = fetch or self.fetch_feed
+        self.timeout = timeout
+    
+    def fetch_feed(self, geo=None):
+        """Download the RSS feed for a region and return its XML text"""
+        request = urllib.request.Request(
+            self.FEED_URL.format(geo=geo or self.geo),
+            headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"}
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return response.read().decode('utf-8')
+    
+    def parse_feed(self, xml_text, now=None, hours=None):
+        """
+        Convert feed XML into rows shaped like the scraped trends table.
+        
+        Every feed item is a currently trending search, so it is marked Active;
+        items that started before the window (hours, default: the configured one)
+        are dropped.
+        """
+        hours = self.hours if hours is None else hours
+        now = now or datetime.now(timezone.utc)
+        cutoff = now - timedelta(hours=hours) if hours else None
+        
+        root = ET.fromstring(xml_text)
+        trends_data = []
+        
+        for item in root.iter('item'):
+            fields = {}
+            for child in item:
+                # Strip the ht: namespace so the tag names don't depend on the feed version
+                fields[child.tag.rsplit('}', 1)[-1]] = (child.text or '').strip()
+            
+            trend_name = fields.get('title', '')
+            if not trend_name:
+                continue
+            
+            if cutoff and fields.get('pubDate'):
+                try:
+                    if parsedate_to_datetime(fields['pubDate']) < cutoff:
+                        continue
+                except (TypeError, ValueError):
+                    pass
+            
+            trends_data.append({
+                "rank": len(trends_data) + 1,
+                "trend_name": trend_name,
+                "search_volume": fields.get('approx_traffic') or "N/A",
+                "active_status": "Active"
+            })
+        
+        return trends_data
+    
+    def scrape_trends(self, geo=None, hours=None):
+        """Fetch the RSS feed and return filtered trends"""
+        try:
+            print("Fetching Google Trends RSS feed...")
+            trends_data = self.parse_feed(self.fetch(geo or self.geo), hours=hours)
+            print(f"Fetched {len(trends_data)} trends from RSS feed")
+        except Exception as e:
+            print(f"Error fetching trends feed: {e}")
+            return []
+        
+        return self.filter_trends(trends_data)
+    
+    def scrape_slices(self, slices, max_workers=4):
+        """Fetch each region's feed once on a pool of HTTP workers and cut every time window from it"""
+        geos = list(dict.fromkeys(geo for geo, _ in slices))
+        feeds = {}
+        
+        print(f"Fetching Google Trends RSS feeds for {', '.join(geos)}...")
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(self.fetch, geo): geo for geo in geos}
+            for future in as_completed(futures):
+                geo = futures[future]
+                try:
+                    feeds[geo] = future.result()
+                except Exception as e:
+                    print(f"Error fetching trends feed for {geo}: {e}")
+        
+        results = []
+        for geo, hours in slices:
+            if geo not in feeds:
+                results.append((geo, hours, []))
+                continue
+            try:
+                trends_data = self.parse_feed(feeds[geo], hours=hours)
+            except Exception as e:
+                print(f"Error parsing trends feed for {geo}: {e}")
+                results.append((geo, hours, []))
+                continue
+            print(f"Fetched {len(trends_data)} trends for {geo}/{hours}h")
+            results.append((geo, hours, self.filter_trends(trends_data)))
+        
+        return results
+
+def create_trends_source(backend="selenium", **kwargs):
+    """
+    Create a trends backend by name.
+    
+    Args:
+        backend (str): "rss" or "selenium"
+        
+    Returns:
+        TrendsSource: The backend instance
+    """
+    if backend == "rss":
+        return RssTrendsSource(**kwargs)
+    if backend == "selenium":
+        return GoogleTrendsScraper(**kwargs)
+    raise ValueError(f"Unknown trends backend: {backend}")
+
+def parse_slices(geos=None, hours=None):
+    """
+    Build (geo, hours) slices from comma-separated lists.
+    
+    Args:
+        geos (str): Region codes, e.g. "IN,IN-MH,IN-DL" (default: TRENDS_GEOS)
+        hours (str): Time windows in hours, e.g. "4,24,48" (default: TRENDS_HOURS)
+        
+    Returns:
+        list: Every geo/hours combination, or None when only the default slice is wanted
+    """
+    geos = geos or os.getenv('TRENDS_GEOS')
+    hours = hours or os.getenv('TRENDS_HOURS')
+    if not geos and not hours:
+        return None
+    
+    geo_list = [geo.strip() for geo in (geos or DEFAULT_GEO).split(',') if geo.strip()]
+    hours_list = [int(value) for value in str(hours or DEFAULT_HOURS).split(',') if value.strip()]
+    return [(geo, window) for geo in geo_list for window in hours_list]
+
+def fetch_trends(backend=None, fixture=None, fast_load=True, slices=None, max_workers=4):
+    """
+    Fetch filtered trends, falling back to Selenium when the RSS backend returns nothing.
+    
+    Args:
+        backend (str): "auto", "rss" or "selenium" (default: TRENDS_BACKEND or "auto")
+        fixture (str): Path to a recorded RSS response to parse instead of fetching
+        fast_load (bool): Use the Selenium backend's fast-load mode
+        slices (list): (geo, hours) slices to scrape in parallel and merge; None for
+            the default India / last 4 hours page
+        max_workers (int): Maximum number of concurrent HTTP workers or browser tabs
+        
+    Returns:
+        tuple: (source used, filtered trends list); the caller must close the source
+    """
+    backend = backend or os.getenv('TRENDS_BACKEND', 'auto')
+    
+    if fixture:
+        def read_fixture(geo=None):
+            with open(fixture, 'r', encoding='utf-8') as f:
+                return f.read()
+        # Recorded responses are replayed as-is, without the recency window or slices
+        source = RssTrendsSource(hours=None, fetch=read_fixture)
+        return source, source.scrape_trends()
+    
+    if backend in ("auto", "rss"):
+        source = create_trends_source("rss")
+        trends_data = source.scrape(slices, max_workers)
+        if trends_data or backend == "rss":
+            return source, trends_data
+        print("RSS backend returned no trends, falling back to Selenium...")
+    
+    source = create_trends_source("selenium", fast_load=fast_load)
+    return source, source.scrape(slices, max_workers)
+
 def main():
     """Main function to run the Google Trends scraper"""
+    parser = argparse.ArgumentParser(description="Fetch Google Trends for India")
+    parser.add_argument('--backend', choices=['auto', 'rss', 'selenium'], default=None,
+                        help="trends backend (default: TRENDS_BACKEND or auto)")
+    parser.add_argument('--fixture', help="parse a recorded RSS response instead of fetching")
+    parser.add_argument('--no-fast-load', action='store_true',
+                        help="load the full page (images, fonts) and use the fixed delays in the Selenium backend")
+    parser.add_argument('--watch', type=float, metavar='MINUTES',
+                        help="keep the same browser session open and re-scrape every MINUTES")
+    parser.add_argument('--geo', help="comma-separated region codes to scrape in parallel, e.g. IN,IN-MH,IN-DL (default: TRENDS_GEOS or IN)")
+    parser.add_argument('--hours', help="comma-separated time windows, e.g. 4,24,48 (default: TRENDS_HOURS or 4)")
+    parser.add_argument('--workers', type=int, default=4,
+                        help="maximum concurrent HTTP workers or browser tabs when scraping several slices")
+    args = parser.parse_args()
+    
+    slices = parse_slices(args.geo, args.hours)
+    
     scraper = None
     
     try:
         print("Starting Google Trends Scraper for India...")
-        scraper = GoogleTrendsScraper()
-        
-        # Scrape trends data
-        trends_data = scraper.scrape_trends()
+        scraper, trends_data = fetch_trends(args.backend, args.fixture, fast_load=not args.no_fast_load,
+                                            slices=slices, max_workers=args.workers)
         
-        # Display results
-        scraper.display_results(trends_data)
-        
-        # Save to JSON file
-        scraper.save_to_json(trends_data)
+        while True:
+            # Display results
+            scraper.display_results(trends_data)
+            
+            # Save to JSON file
+            scraper.save_to_json(trends_data)
+            scraper.record_history(trends_data)
+            
+            if not args.watch:
+                break
+            
+            # Re-scrape with the warm browser instead of paying Chrome's cold start again
+            print(f"\nNext scrape in {args.watch:g} minutes (Ctrl+C to stop)...")
+            time.sleep(args.watch * 60)
+            trends_data = scraper.scrape(slices, args.workers)
         
     except KeyboardInterrupt:
         print("\nScraping interrupted by user.")
@@ -0,0 +1,87 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+import checkpoints
+import pipeline
+
+
+def start_run(runs_dir, run_key, started_at=None):
+    checkpoint = checkpoints.RunCheckpoint(run_key, runs_dir)
+    if started_at:
+        checkpoint.manifest["started_at"] = started_at.isoformat()
+    checkpoint.write_json('record.json', {"id": run_key, "keyword": run_key.replace('-', ' ')})
+    checkpoint.write_text('content.md', "# Title\n\nBody")
+    checkpoint.mark_complete('content', checkpoints.hash_inputs(run_key))
+    return checkpoint
+
+
+def use_runs_dir(monkeypatch, runs_dir):
+    real = checkpoints.find_incomplete_runs
+    monkeypatch.setattr(checkpoints, 'find_incomplete_runs', lambda: real(str(runs_dir)))
+
+
+def test_new_run_records_first_attempt(tmp_path):
+    checkpoint = start_run(str(tmp_path), 'gold-price-today')
+
+    with open(checkpoint.manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    assert manifest["attempts"] == 1
+    assert datetime.fromisoformat(manifest["started_at"]) <= datetime.now()
+
+
+def test_resume_counts_attempts(tmp_path, monkeypatch):
+    start_run(str(tmp_path), 'gold-price-today')
+    use_runs_dir(monkeypatch, tmp_path)
+
+    drafts = pipeline.resume_drafts(1)
+
+    assert [draft.article_id for draft in drafts] == ['gold-price-today']
+    assert drafts[0].keyword == 'gold price today'
+    assert checkpoints.RunCheckpoint('gold-price-today', str(tmp_path)).attempts == 2
+
+
+def test_run_is_dropped_after_max_attempts(tmp_path, monkeypatch, capsys):
+    checkpoint = start_run(str(tmp_path), 'blocked-image')
+    checkpoint.mark_failed('image', 'abc', "prompt blocked")
+    use_runs_dir(monkeypatch, tmp_path)
+
+    for _ in range(checkpoints.MAX_ATTEMPTS - 1):
+        assert len(pipeline.resume_drafts(1)) == 1
+    assert pipeline.resume_drafts(1) == []
+
+    assert not os.path.exists(checkpoint.run_dir)
+    output = capsys.readouterr().out
+    assert f"Giving up on unfinished article run blocked-image ({checkpoints.MAX_ATTEMPTS} attempts)" in output
+    assert "image: prompt blocked" in output
+
+
+def test_dropped_run_frees_the_slot_for_the_next_one(tmp_path, monkeypatch):
+    stuck = start_run(str(tmp_path), 'stuck')
+    stuck.manifest["attempts"] = checkpoints.MAX_ATTEMPTS
+    stuck._save()
+    start_run(str(tmp_path), 'fresh')
+    use_runs_dir(monkeypatch, tmp_path)
+
+    assert [draft.article_id for draft in pipeline.resume_drafts(1)] == ['fresh']
+
+
+def test_expired_run_is_dropped(tmp_path):
+    old = start_run(str(tmp_path), 'old-run', started_at=datetime.now() - timedelta(hours=checkpoints.RUN_TTL_HOURS + 1))
+    start_run(str(tmp_path), 'recent-run')
+
+    runs = checkpoints.find_incomplete_runs(str(tmp_path))
+
+    assert [run.run_key for run in runs] == ['recent-run']
+    assert not os.path.exists(old.run_dir)
+
+
+def test_run_without_started_at_uses_manifest_mtime(tmp_path):
+    checkpoint = start_run(str(tmp_path), 'legacy-run')
+    del checkpoint.manifest["started_at"]
+    del checkpoint.manifest["attempts"]
+    checkpoint._save()
+    day_ago = (datetime.now() - timedelta(hours=checkpoints.RUN_TTL_HOURS + 1)).timestamp()
+    os.utime(checkpoint.manifest_path, (day_ago, day_ago))
+
+    assert checkpoints.find_incomplete_runs(str(tmp_path)) == []
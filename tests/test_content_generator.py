@@ -0,0 +1,52 @@
+import content_generator
+
+# A structured reply as the model sends it without response_schema: fenced, with raw
+# newlines (and a tab) inside the Markdown content string
+FENCED_REPLY = '''Here is the article:
+```json
+{
+  "title": "Gold Prices Drop: What It Means for Buyers",
+  "category": "Finance",
+  "excerpt": "Gold prices fell sharply today.",
+  "content": "## Why prices fell
+
+Gold slipped 2% on Monday.
+
+- Stronger dollar
+-\tLower demand
+
+> Analysts expect a rebound."
+}
+```'''
+
+
+def test_parse_structured_article_accepts_raw_newlines_in_content():
+    fields = content_generator.parse_structured_article(FENCED_REPLY)
+
+    assert fields['title'] == "Gold Prices Drop: What It Means for Buyers"
+    assert fields['category'] == "Finance"
+    assert fields['excerpt'] == "Gold prices fell sharply today."
+    assert fields['content'].startswith("## Why prices fell\n\nGold slipped 2% on Monday.")
+    assert "-\tLower demand" in fields['content']
+    assert fields['content'].endswith("> Analysts expect a rebound.")
+
+
+def test_parse_structured_article_rejects_non_json():
+    assert content_generator.parse_structured_article("Sorry, I can't help with that.") == {}
+    assert content_generator.parse_structured_article('{"title": "unterminated') == {}
+
+
+def test_validate_article_fields_requires_keyword_in_title_and_excerpt():
+    keyword = "gold prices"
+    content = " ".join(["Gold prices moved today."] * content_generator.KEYWORD_COUNT_TARGET)
+    fields = {
+        'title': "Gold Prices Drop: What It Means for Buyers",
+        'category': "Finance",
+        'excerpt': "Gold prices fell sharply today.",
+        'content': content,
+    }
+    assert content_generator.validate_article_fields(keyword, fields) == []
+
+    fields['title'] = "Bullion Slides: What It Means for Buyers"
+    fields['excerpt'] = "The yellow metal fell sharply today."
+    assert content_generator.validate_article_fields(keyword, fields) == ['title', 'excerpt']
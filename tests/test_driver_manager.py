@@ -0,0 +1,135 @@
+import json
+
+import pytest
+from selenium.common.exceptions import SessionNotCreatedException
+
+import driver_manager
+import trends_check
+
+
+@pytest.fixture
+def driver_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(driver_manager, 'DRIVER_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(driver_manager, 'DRIVER_METADATA_PATH', str(tmp_path / 'chromedriver.json'))
+    monkeypatch.delenv('CHROMEDRIVER_PATH', raising=False)
+    monkeypatch.delenv('CHROMEDRIVER_VERSION', raising=False)
+    return tmp_path
+
+
+@pytest.fixture
+def fake_install(driver_cache, monkeypatch):
+    """Stand-in for ChromeDriverManager that 'downloads' a new binary per install"""
+    installs = []
+
+    class FakeManager:
+        def __init__(self, driver_version=None, cache_manager=None):
+            self.cache_manager = cache_manager
+
+        def install(self):
+            path = driver_cache / f"chromedriver-{len(installs) + 1}"
+            path.write_text('')
+            installs.append(self.cache_manager)
+            return str(path)
+
+    monkeypatch.setattr(driver_manager, 'ChromeDriverManager', FakeManager)
+    monkeypatch.setattr(driver_manager, 'driver_version', lambda path: '139.0.7258.154')
+    return installs
+
+
+def read_metadata(driver_cache):
+    return json.loads((driver_cache / 'chromedriver.json').read_text())
+
+
+def test_resolved_version_is_stored_without_a_pin(driver_cache, fake_install):
+    path = driver_manager.get_chromedriver_path()
+
+    metadata = read_metadata(driver_cache)
+    assert metadata['path'] == path
+    assert metadata['version'] == '139.0.7258.154'
+    assert metadata['pinned_version'] is None
+
+
+def test_cached_driver_is_reused_within_ttl(driver_cache, fake_install):
+    first = driver_manager.get_chromedriver_path()
+
+    assert driver_manager.get_chromedriver_path() == first
+    assert len(fake_install) == 1
+
+
+def test_cached_driver_of_another_version_is_not_reused(driver_cache, fake_install, monkeypatch):
+    driver_manager.get_chromedriver_path()
+    monkeypatch.setenv('CHROMEDRIVER_VERSION', '140')
+
+    driver_manager.get_chromedriver_path()
+
+    assert len(fake_install) == 2
+
+
+def test_pinned_major_version_matches_resolved_version(driver_cache, fake_install, monkeypatch):
+    monkeypatch.setenv('CHROMEDRIVER_VERSION', '139')
+    driver_manager.get_chromedriver_path()
+
+    driver_manager.get_chromedriver_path()
+
+    assert len(fake_install) == 1
+    assert read_metadata(driver_cache)['pinned_version'] == '139'
+
+
+def test_force_check_bypasses_both_caches(driver_cache, fake_install):
+    first = driver_manager.get_chromedriver_path()
+
+    second = driver_manager.get_chromedriver_path(force_check=True)
+
+    assert second != first
+    assert fake_install[-1]._cache_valid_days_range == 0
+
+
+def test_invalidate_forgets_cached_driver(driver_cache, fake_install):
+    driver_manager.get_chromedriver_path()
+
+    driver_manager.invalidate_cached_driver()
+    driver_manager.invalidate_cached_driver()
+
+    assert not (driver_cache / 'chromedriver.json').exists()
+
+
+class FakeDriver:
+    def execute_script(self, script):
+        return None
+
+
+def test_session_failure_reinstalls_driver_and_retries_once(monkeypatch):
+    calls = []
+    resolved = []
+
+    def chrome(service=None, options=None):
+        calls.append(service.path)
+        if len(calls) == 1:
+            raise SessionNotCreatedException("This version of ChromeDriver only supports Chrome version 138")
+        return FakeDriver()
+
+    def get_path(force_check=False):
+        resolved.append(force_check)
+        return '/drivers/new' if force_check else '/drivers/cached'
+
+    monkeypatch.setattr(trends_check.webdriver, 'Chrome', chrome)
+    monkeypatch.setattr(trends_check, 'get_chromedriver_path', get_path)
+    monkeypatch.setattr(trends_check, 'invalidate_cached_driver', lambda: resolved.append('invalidated'))
+
+    scraper = trends_check.GoogleTrendsScraper(fast_load=False)
+
+    assert isinstance(scraper.driver, FakeDriver)
+    assert calls == ['/drivers/cached', '/drivers/new']
+    assert resolved == [False, 'invalidated', True]
+
+
+def test_session_failure_after_reinstall_is_raised(monkeypatch):
+    def chrome(service=None, options=None):
+        raise SessionNotCreatedException("Chrome failed to start")
+
+    monkeypatch.setattr(trends_check.webdriver, 'Chrome', chrome)
+    monkeypatch.setattr(trends_check, 'get_chromedriver_path', lambda force_check=False: '/drivers/cached')
+    monkeypatch.setattr(trends_check, 'invalidate_cached_driver', lambda: None)
+
+    with pytest.raises(SessionNotCreatedException):
+        trends_check.GoogleTrendsScraper(fast_load=False)
@@ -0,0 +1,136 @@
+import asyncio
+
+import pytest
+
+import content_generator
+import gemini_client
+
+
+class FakeAsyncClient:
+    def __init__(self):
+        self.closed = False
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakeClient:
+    def __init__(self):
+        self.aio = FakeAsyncClient()
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def created(monkeypatch):
+    """Clients made by gemini_client, in creation order"""
+    clients = []
+
+    def create_client():
+        clients.append(FakeClient())
+        return clients[-1]
+
+    gemini_client.close()
+    monkeypatch.setattr(gemini_client, '_create_client', create_client)
+    yield clients
+    gemini_client.close()
+
+
+async def current_client():
+    # Yield once so closes scheduled on this loop get to run
+    await asyncio.sleep(0)
+    return gemini_client.get_async_client()
+
+
+def test_run_coroutine_reuses_one_async_client(created):
+    first = gemini_client.run_coroutine(current_client())
+    second = gemini_client.run_coroutine(current_client())
+
+    assert first is second
+    assert len(created) == 1
+
+
+def test_sync_wrappers_share_the_async_client(created, monkeypatch):
+    async def fake_generate(client, model, prompt, config=None):
+        return f"title from {id(client)}"
+
+    monkeypatch.setattr(content_generator, 'generate_text_async', fake_generate)
+
+    titles = {content_generator.generate_article_title(keyword) for keyword in ('gold rate', 'iphone 17')}
+
+    assert len(created) == 1
+    assert titles == {f"title from {id(created[0].aio)}"}
+
+
+def test_client_from_another_loop_closes_the_previous_one(created):
+    first = gemini_client.run_coroutine(current_client())
+
+    async def on_new_loop():
+        client = gemini_client.get_async_client()
+        await asyncio.sleep(0)
+        return client
+
+    second = asyncio.run(on_new_loop())
+
+    assert second is not first
+    assert first.closed
+    assert not second.closed
+
+
+def test_close_releases_clients_and_loop(created):
+    async_client = gemini_client.run_coroutine(current_client())
+    loop = gemini_client._loop
+
+    gemini_client.close()
+
+    assert async_client.closed
+    assert loop.is_closed()
+    assert gemini_client.get_client() is not None
+    assert len(created) == 2
+
+
+class DictCache:
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def put(self, key, value):
+        self.values[key] = value
+
+
+class NoLimit:
+    def wait(self, tokens=0):
+        pass
+
+
+def image_client(calls):
+    class Part:
+        def __init__(self, text=None, data=None):
+            self.text = text
+            self.inline_data = type('InlineData', (), {'data': data})() if data is not None else None
+
+    class Models:
+        def generate_content(self, model=None, contents=None, config=None):
+            calls.append(contents)
+            content = type('Content', (), {'parts': [Part(text='Here you go'), Part(data=b'PNG bytes')]})()
+            return type('Response', (), {'candidates': [type('Candidate', (), {'content': content})()]})()
+
+    return type('Client', (), {'models': Models()})()
+
+
+def test_generate_image_data_goes_through_the_response_cache(monkeypatch):
+    calls = []
+    cache = DictCache()
+    monkeypatch.setattr(gemini_client, 'get_response_cache', lambda: cache)
+    monkeypatch.setattr(gemini_client, 'get_rate_limiter', NoLimit)
+    client = image_client(calls)
+
+    first = gemini_client.generate_image_data(client, 'image-model', 'a gold bar')
+    second = gemini_client.generate_image_data(client, 'image-model', 'a gold bar')
+
+    assert first == second == b'PNG bytes'
+    assert calls == ['a gold bar']
@@ -0,0 +1,150 @@
+import json
+
+import pytest
+
+import html_generator
+
+
+def test_pages_are_cut_from_the_oldest_end():
+    records = list(range(20, 0, -1))  # newest first
+
+    pages = html_generator.paginate_from_oldest(records, 9)
+
+    assert pages == [[20, 19], list(range(18, 9, -1)), list(range(9, 0, -1))]
+
+
+def test_publishing_only_changes_the_first_page():
+    before = html_generator.paginate_from_oldest(list(range(20, 0, -1)), 9)
+
+    after = html_generator.paginate_from_oldest(list(range(21, 0, -1)), 9)
+
+    assert after[0] == [21, 20, 19]
+    assert after[1:] == before[1:]
+
+
+def test_full_pages_stay_full():
+    assert html_generator.paginate_from_oldest(list(range(18, 0, -1)), 9) == [list(range(18, 9, -1)), list(range(9, 0, -1))]
+    assert html_generator.paginate_from_oldest([], 9) == []
+
+
+ARTICLE = {
+    "id": 'gold-rate-today', "title": 'Gold rate today', "excerpt": 'Gold fell.', "category": 'Finance',
+    "date": '30 August 2025', "url": 'articles/gold-rate-today.html', "image": 'gold-rate-today.webp',
+    "image_width": 1200, "image_height": 630, "image_widths": [320, 1200], "image_formats": ['webp']
+}
+
+
+def test_cards_are_lazy_by_default():
+    card = html_generator.render_article_card(ARTICLE)
+
+    assert 'loading="lazy"' in card
+    assert 'fetchpriority' not in card
+
+
+def test_above_the_fold_card_loads_eagerly_with_high_priority():
+    card = html_generator.render_article_card(ARTICLE, base_path='', lazy=False, fetchpriority='high')
+
+    assert 'loading=' not in card
+    assert 'fetchpriority="high"' in card
+
+
+def test_landing_page_holds_the_newest_page_and_archive_counts_from_the_oldest():
+    records = list(range(20, 0, -1))  # newest first
+
+    landing, archive = html_generator.split_listing(records, 9)
+
+    assert landing == list(range(20, 11, -1))
+    assert archive == [list(range(9, 0, -1)), list(range(18, 9, -1))]
+
+
+def test_page_entirely_on_the_landing_page_is_not_archived():
+    assert html_generator.split_listing(list(range(18, 0, -1)), 9)[1] == [list(range(9, 0, -1))]
+    assert html_generator.split_listing(list(range(9, 0, -1)), 9) == (list(range(9, 0, -1)), [])
+    assert html_generator.split_listing([], 9) == ([], [])
+
+
+def site_article(number):
+    return dict(ARTICLE, id=f'sports-{number}', title=f'Sports story {number}', category='Sports',
+                url=f'articles/sports-{number}.html', image=f'sports-{number}.webp')
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    """A project root with index.html, one category page and json/ data"""
+    (tmp_path / 'json').mkdir()
+    (tmp_path / 'category').mkdir()
+    page = '<html><head><title>{} - OmniTrends</title></head><body><div class="articles-grid"></div></body></html>'
+    (tmp_path / 'index.html').write_text(page.format('Home'), encoding='utf-8')
+    (tmp_path / 'category' / 'sports.html').write_text(page.format('Sports'), encoding='utf-8')
+    (tmp_path / 'json' / 'categories.json').write_text(
+        json.dumps({"categories": [{"name": 'Sports', "slug": 'sports'}]}), encoding='utf-8')
+    monkeypatch.setattr(html_generator, 'PROJECT_ROOT', str(tmp_path))
+    monkeypatch.setattr(html_generator.article_store, 'load_featured_ids', lambda: [])
+
+    def publish(count):
+        articles = [site_article(number) for number in range(count, 0, -1)]
+        (tmp_path / 'json' / 'articles.json').write_text(json.dumps(articles), encoding='utf-8')
+        assert html_generator.generate_listing_pages()
+
+    return tmp_path, publish
+
+
+def test_landing_page_always_shows_a_full_page(site):
+    root, publish = site
+
+    publish(127)
+
+    landing = (root / 'category' / 'sports.html').read_text(encoding='utf-8')
+    assert landing.count('class="article-card"') == 9
+    assert 'Sports story 127' in landing
+    assert len(list((root / 'category' / 'sports' / 'page').iterdir())) == 14
+
+
+def test_publishing_leaves_older_archive_pages_byte_identical(site):
+    root, publish = site
+    pages_dir = root / 'category' / 'sports' / 'page'
+
+    for count in (126, 127, 128):
+        publish(count)
+        before = {path.name: path.read_bytes() for path in pages_dir.iterdir()}
+
+        publish(count + 1)
+
+        after = {path.name: path.read_bytes() for path in pages_dir.iterdir()}
+        changed = {name for name in after if before.get(name) != after[name]}
+        assert len(changed) <= 1
+        assert all(before[name] == after[name] for name in before)
+
+
+@pytest.fixture
+def related_site(tmp_path, monkeypatch):
+    """A project root with two related articles and their pages"""
+    (tmp_path / 'json').mkdir()
+    (tmp_path / 'articles').mkdir()
+    monkeypatch.setattr(html_generator, 'PROJECT_ROOT', str(tmp_path))
+    monkeypatch.setattr(html_generator, 'RELATED_INDEX_PATH', str(tmp_path / 'json' / 'related.json'))
+    articles = [
+        dict(ARTICLE, id='gold-rate-today', title='Gold rate today in Mumbai', url='articles/gold-rate-today.html'),
+        dict(ARTICLE, id='gold-rate-tomorrow', title='Gold rate tomorrow in Mumbai', url='articles/gold-rate-tomorrow.html')
+    ]
+    for article in articles:
+        (tmp_path / 'articles' / f"{article['id']}.html").write_text('<main></main>', encoding='utf-8')
+
+    def publish(articles):
+        (tmp_path / 'json' / 'articles.json').write_text(json.dumps(articles), encoding='utf-8')
+        assert html_generator.update_related_articles()
+
+    publish(articles)
+    return tmp_path, articles, publish
+
+
+def test_related_cards_follow_edits_to_related_articles(related_site):
+    root, articles, publish = related_site
+    page = root / 'articles' / 'gold-rate-today.html'
+    assert 'Gold rate tomorrow in Mumbai' in page.read_text(encoding='utf-8')
+
+    articles[1]['title'] = 'Gold rate tomorrow in Delhi'
+    publish(articles)
+
+    assert 'Gold rate tomorrow in Delhi' in page.read_text(encoding='utf-8')
+    assert json.loads((root / 'json' / 'related.json').read_text(encoding='utf-8'))['related'] == [[1], [0]]
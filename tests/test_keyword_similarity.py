@@ -0,0 +1,123 @@
+import json
+import os
+from datetime import datetime
+
+import pytest
+
+import keyword_similarity
+import related_articles
+
+# Keywords, titles and dates of the published articles the thresholds were calibrated on
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), 'fixtures', 'articles_2025_08.json')
+
+# Same story: a trend like the first should be skipped when an article has the second keyword
+POSITIVE_PAIRS = [
+    ('gold price today', 'gold prices drop'),
+    ('flash floods uttarakhand', 'uttarakhand flash floods'),
+    ('weather chennai', 'chennai weather'),
+    ('south africa vs australia', 'australia vs south africa'),
+    ('man city vs tottenham', 'man city vs tottenham timeline'),
+    ('aus vs sa live', 'aus vs sa'),
+    ('nsdl share price', 'nsdl share price today live'),
+    ('nifty 50', 'nifty'),
+    ('neet pg 2025', 'nbems neet pg 2025'),
+    ('rcd mallorca vs fc barcelona timeline', 'mallorca vs barcelona'),
+    ('severe rainfall alert', 'extreme rainfall alert'),
+    ('pm kisan samman nidhi', 'pm kisan'),
+    ('west indies vs pakistan', 'west indies cricket team vs pakistan national cricket team match scorecard'),
+    ('coolie movie review', 'coolie movie reviews'),
+]
+
+# Different stories that character n-grams alone score as similar
+NEGATIVE_PAIRS = [
+    ('india vs pakistan', 'west indies vs pakistan'),
+    ('india vs pakistan', 'pakistan vs west indies'),
+    ('ind vs eng', 'india vs eng'),
+    ('barcelona vs como', 'barcelona'),
+    ('netherlands women vs ireland women', 'germany women vs ireland women'),
+    ('kenya vs papua new guinea', 'jersey vs papua new guinea'),
+    ('arsenal vs athletic club', 'liverpool vs athletic club'),
+    ('south africa vs guinea', 'south africa vs uganda'),
+    ('nsdl share price', 'bse share price'),
+    ('maruti share price', 'bse share price'),
+    ('gold price today', 'nsdl share price today live'),
+    ('trump tariffs india', 'trump'),
+    ('coolie movie reviews', 'coolie movie box office collection'),
+    ('sensex nifty stock market', 'sensex'),
+    ('weather today', 'chennai weather'),
+]
+
+
+def load_articles():
+    with open(FIXTURE_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def build_index(now):
+    return keyword_similarity.build_similarity_index(
+        [(article['id'], article['keyword'], article['title'], related_articles.parse_article_date(article['date']))
+         for article in load_articles()],
+        now=datetime.strptime(now, "%d %B %Y")
+    )
+
+
+@pytest.fixture(scope='module')
+def index():
+    return build_index("31 August 2025")
+
+
+@pytest.mark.parametrize('trend, keyword', POSITIVE_PAIRS)
+def test_known_duplicates_reach_threshold(index, trend, keyword):
+    assert index.similarity(trend, keyword) >= keyword_similarity.DEFAULT_THRESHOLD
+
+
+@pytest.mark.parametrize('trend, keyword', NEGATIVE_PAIRS)
+def test_known_different_stories_stay_below_threshold(index, trend, keyword):
+    assert index.similarity(trend, keyword) < keyword_similarity.DEFAULT_THRESHOLD
+
+
+def test_fixture_sides_ignore_filler_and_headline_tail():
+    assert keyword_similarity.fixture_sides(
+        'pakistan national cricket team vs united arab emirates national cricket team match scorecard'
+    ) == (frozenset({'pakistan'}), frozenset({'united', 'arab', 'emirates'}))
+    assert keyword_similarity.fixture_sides('West Indies vs Pakistan: Indian Fans Rush to Stream Live!') == (
+        frozenset({'west', 'indies'}), frozenset({'pakistan'}))
+    assert keyword_similarity.fixture_sides('gold price today') is None
+
+
+@pytest.mark.parametrize('now, trend', [
+    ("31 August 2025", 'india vs pakistan'),
+    ("31 August 2025", 'ind vs eng'),
+    ("14 August 2025", 'gold price today'),
+    ("31 August 2025", 'movie review rating'),
+])
+def test_new_stories_are_not_duplicates(now, trend):
+    assert build_index(now).find_duplicate(trend) is None
+
+
+@pytest.mark.parametrize('now, trend, article_id', [
+    ("14 August 2025", 'gold prices drop', 'gold-prices-india-drop-seize-this-festive-season-opportunity'),
+    ("6 August 2025", 'uttarakhand flash floods', 'uttarakhand-flash-floods-cloudburst-unleashes-deadly-fury'),
+    ("31 August 2025", 'pak vs uae match scorecard', 'pak-vs-uae-match-scorecard-asia-cup-impact-rocks-india'),
+    ("9 August 2025", 'pakistan vs west indies', 'west-indies-vs-pakistan-indian-fans-rush-to-stream-live'),
+])
+def test_recent_duplicates_are_found(now, trend, article_id):
+    match = build_index(now).find_duplicate(trend)
+    assert match is not None and match[0] == article_id
+
+
+def test_matches_against_old_articles_decay():
+    assert build_index("6 August 2025").find_duplicate('uttarakhand flash floods') is not None
+    assert build_index("20 August 2025").find_duplicate('uttarakhand flash floods') is None
+    # A rematch a week after the last article on the fixture is a new story
+    assert build_index("1 September 2025").find_duplicate('australia vs south africa') is None
+
+
+def test_titles_use_their_own_threshold():
+    # Matched through the title "Shubman Gill Crowned Man of the Series IND vs ENG!" with keywords ruled out
+    index = build_index("5 August 2025")
+    trend = 'shubman gill man of the series'
+    assert keyword_similarity.TITLE_THRESHOLD > keyword_similarity.DEFAULT_THRESHOLD
+
+    match = index.find_duplicate(trend, threshold=1.01)
+    assert match is not None and match[0] == 'shubman-gill-crowned-man-of-the-series-ind-vs-eng'
@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+import html_generator
+import rebuild
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    """A project root with one published article and its markdown source"""
+    for folder in ('json', 'articles', 'content'):
+        (tmp_path / folder).mkdir()
+    monkeypatch.setattr(rebuild, 'ARTICLES_PATH', str(tmp_path / 'json' / 'articles.json'))
+    monkeypatch.setattr(rebuild, 'ARTICLES_DIR', str(tmp_path / 'articles'))
+    monkeypatch.setattr(rebuild, 'MANIFEST_PATH', str(tmp_path / 'rebuild_manifest.json'))
+    monkeypatch.setattr(html_generator, 'CONTENT_DIR', str(tmp_path / 'content'))
+    monkeypatch.setattr(html_generator, 'RELATED_INDEX_PATH', str(tmp_path / 'json' / 'related.json'))
+
+    article = {"id": 'gold-rate-today', "title": 'Gold rate today', "excerpt": 'Gold fell.', "keyword": 'gold rate',
+               "category": 'Finance', "date": '14 August 2025', "image_width": 1200, "image_height": 630,
+               "image_widths": [320, 1200], "image_formats": ['webp']}
+    (tmp_path / 'json' / 'articles.json').write_text(json.dumps([article]), encoding='utf-8')
+    (tmp_path / 'content' / 'gold-rate-today.md').write_text('Gold fell 2% on Monday.', encoding='utf-8')
+    return tmp_path
+
+
+def rebuilt_count(capsys):
+    assert rebuild.rebuild_articles(max_workers=1)
+    return capsys.readouterr().out.split('Rebuilt ', 1)[1].split(' of', 1)[0]
+
+
+def test_unchanged_inputs_are_skipped(site, capsys):
+    assert rebuilt_count(capsys) == '1'
+    assert rebuilt_count(capsys) == '0'
+
+
+def test_python_markup_changes_rebuild_pages(site, capsys, monkeypatch):
+    rebuilt_count(capsys)
+
+    monkeypatch.setattr(html_generator, 'ARTICLE_IMAGE_SIZES', "(max-width: 900px) 100vw, 900px")
+
+    assert rebuilt_count(capsys) == '1'
+    page = (site / 'articles' / 'gold-rate-today.html').read_text(encoding='utf-8')
+    assert "(max-width: 900px) 100vw, 900px" in page
+
+
+def test_body_of_a_page_without_source_is_kept_outside_html(site, capsys):
+    rebuilt_count(capsys)
+    (site / 'content' / 'gold-rate-today.md').unlink()
+
+    assert rebuild.load_article_source('gold-rate-today')[0] == 'html'
+
+    assert [path.name for path in (site / 'content').iterdir()] == ['gold-rate-today.body']
+    assert rebuilt_count(capsys) == '1'
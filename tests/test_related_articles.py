@@ -0,0 +1,53 @@
+import related_articles
+
+
+def article(article_id, title, category='Sports', date='20 August 2025'):
+    return {"id": article_id, "keyword": '', "title": title, "category": category, "date": date}
+
+
+ARTICLES = [
+    article('asia-cup-india-squad', "Asia Cup India squad announced"),
+    article('asia-cup-schedule', "Asia Cup schedule and venues"),
+    article('asia-cup-tickets', "Asia Cup tickets go on sale"),
+    article('gold-rate-today', "Gold rate today in Mumbai", category='Finance'),
+    article('silver-rate-today', "Silver rate today in Mumbai", category='Finance'),
+    article('us-open-final', "US Open final preview"),
+]
+
+
+def test_related_articles_share_topic_words():
+    graph = related_articles.compute_related_graph(ARTICLES)
+
+    assert graph['asia-cup-schedule'] == ['asia-cup-india-squad', 'asia-cup-tickets']
+    assert graph['gold-rate-today'] == ['silver-rate-today']
+
+
+def test_category_and_recency_alone_do_not_relate_articles():
+    # Same category, published the same day, but about something else entirely
+    graph = related_articles.compute_related_graph(ARTICLES)
+
+    assert 'us-open-final' not in graph['asia-cup-schedule']
+    assert graph['us-open-final'] == []
+
+
+def test_ties_go_to_the_smaller_id():
+    articles = [
+        article('b-cricket-news', "Cricket news"),
+        article('c-cricket-news', "Cricket news"),
+        article('a-cricket-news', "Cricket news"),
+    ]
+
+    graph = related_articles.compute_related_graph(articles, top_k=1)
+
+    assert graph['c-cricket-news'] == ['a-cricket-news']
+    assert graph['a-cricket-news'] == ['b-cricket-news']
+
+
+def test_publishing_an_unrelated_article_leaves_other_pages_alone():
+    before = related_articles.compute_related_graph(ARTICLES)
+
+    after = related_articles.compute_related_graph(
+        ARTICLES + [article('weather-tomorrow', "Heavy rain alert for Delhi", date='30 August 2025')])
+
+    assert after['weather-tomorrow'] == []
+    assert {key: after[key] for key in before} == before
@@ -0,0 +1,81 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+import html_generator
+import rebuild
+import sitemaps
+
+PUBLISHED = datetime(2025, 8, 14, 9, 0, tzinfo=timezone.utc)
+LATER = datetime(2025, 9, 1, 9, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    """A project root with one published article and its markdown source"""
+    for folder in ('json', 'articles', 'content'):
+        (tmp_path / folder).mkdir()
+    monkeypatch.setattr(sitemaps, 'PROJECT_ROOT', str(tmp_path))
+    monkeypatch.setattr(sitemaps, 'STATE_PATH', str(tmp_path / 'json' / 'sitemap_state.json'))
+    monkeypatch.setattr(sitemaps, 'SITEMAP_PATH', str(tmp_path / 'sitemap.xml'))
+    monkeypatch.setattr(sitemaps, 'NEWS_SITEMAP_PATH', str(tmp_path / 'sitemap-news.xml'))
+    monkeypatch.setattr(sitemaps, 'SITEMAPS_DIR', str(tmp_path / 'sitemaps'))
+    monkeypatch.setattr(html_generator, 'CONTENT_DIR', str(tmp_path / 'content'))
+    monkeypatch.setattr(rebuild, 'ARTICLES_DIR', str(tmp_path / 'articles'))
+
+    article = {"id": 'gold-rate-today', "title": 'Gold rate today', "excerpt": 'Gold fell.', "keyword": 'gold rate',
+               "category": 'Finance', "date": '14 August 2025', "url": 'articles/gold-rate-today.html'}
+    (tmp_path / 'json' / 'articles.json').write_text(json.dumps([article]), encoding='utf-8')
+    (tmp_path / 'index.html').write_text('<html>home</html>', encoding='utf-8')
+    (tmp_path / 'articles' / 'gold-rate-today.html').write_text('<html><img src="a.webp"></html>', encoding='utf-8')
+    (tmp_path / 'content' / 'gold-rate-today.md').write_text('Gold fell 2% on Monday.', encoding='utf-8')
+    assert sitemaps.build_sitemaps(now=PUBLISHED)
+    return tmp_path
+
+
+def article_lastmod(root):
+    state = json.loads((root / 'json' / 'sitemap_state.json').read_text(encoding='utf-8'))
+    return state['urls']['articles/gold-rate-today.html']['lastmod']
+
+
+def test_markup_changes_keep_lastmod(site):
+    (site / 'articles' / 'gold-rate-today.html').write_text(
+        '<html><img src="a.webp" srcset="a-320w.webp 320w" loading="lazy"></html>', encoding='utf-8')
+
+    assert sitemaps.build_sitemaps(now=LATER)
+
+    assert article_lastmod(site) == '2025-08-14'
+    assert '<lastmod>2025-08-14</lastmod>' in (site / 'sitemap.xml').read_text(encoding='utf-8')
+
+
+def test_image_metadata_keeps_lastmod(site):
+    articles_path = site / 'json' / 'articles.json'
+    articles = json.loads(articles_path.read_text(encoding='utf-8'))
+    articles[0].update(image_width=1200, image_height=630, image_widths=[320, 1200], image_formats=['webp'])
+    articles_path.write_text(json.dumps(articles), encoding='utf-8')
+
+    assert sitemaps.build_sitemaps(now=LATER)
+
+    assert article_lastmod(site) == '2025-08-14'
+
+
+def test_content_changes_move_lastmod(site):
+    (site / 'content' / 'gold-rate-today.md').write_text('Gold fell 3% on Monday.', encoding='utf-8')
+
+    assert sitemaps.build_sitemaps(now=LATER)
+
+    assert article_lastmod(site) == '2025-09-01'
+
+
+def test_state_from_an_older_hash_version_is_rebaselined(site):
+    state_path = site / 'json' / 'sitemap_state.json'
+    state = json.loads(state_path.read_text(encoding='utf-8'))
+    for entry in state['urls'].values():
+        entry['hash'] = 'served-file-hash'
+    state_path.write_text(json.dumps({"urls": state['urls']}), encoding='utf-8')
+
+    assert sitemaps.build_sitemaps(now=LATER)
+
+    assert article_lastmod(site) == '2025-08-14'
+    assert json.loads(state_path.read_text(encoding='utf-8'))['version'] == sitemaps.HASH_VERSION
@@ -0,0 +1,108 @@
+import os
+from datetime import datetime, timezone
+
+import pytest
+
+import trends_check
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), 'fixtures', 'trends_rss_IN.xml')
+RSS_SOURCE = trends_check.RssTrendsSource
+# When the fixture feed was served
+NOW = datetime(2025, 9, 14, 19, 0, tzinfo=timezone.utc)
+
+
+def read_fixture(geo=None):
+    with open(FIXTURE_PATH, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def failing_fetch(geo=None):
+    raise OSError("feed unavailable")
+
+
+def names(trends):
+    return [trend['trend_name'] for trend in trends]
+
+
+def test_parse_feed_reads_every_item():
+    rows = trends_check.RssTrendsSource(hours=None, fetch=read_fixture).parse_feed(read_fixture(), now=NOW)
+
+    assert names(rows) == ['india vs pakistan', 'gold rate today', 'एशिया कप', 'iphone 17 pro max',
+                           'bigg boss 19', 'weather tomorrow']
+    assert rows[0] == {"rank": 1, "trend_name": 'india vs pakistan', "search_volume": '200000+', "active_status": "Active"}
+
+
+@pytest.mark.parametrize('hours, expected', [
+    (4, ['india vs pakistan', 'gold rate today', 'एशिया कप']),
+    (24, ['india vs pakistan', 'gold rate today', 'एशिया कप', 'iphone 17 pro max', 'bigg boss 19']),
+    (48, ['india vs pakistan', 'gold rate today', 'एशिया कप', 'iphone 17 pro max', 'bigg boss 19']),
+])
+def test_parse_feed_applies_hours_cutoff(hours, expected):
+    source = trends_check.RssTrendsSource(hours=hours, fetch=read_fixture)
+
+    assert names(source.parse_feed(read_fixture(), now=NOW)) == expected
+
+
+def test_approx_traffic_feeds_filter_trends():
+    source = trends_check.RssTrendsSource(hours=None, fetch=read_fixture)
+
+    trends = source.scrape_trends()
+
+    # Non-English trends are dropped and the rest re-ranked by approx_traffic
+    assert names(trends) == ['india vs pakistan', 'iphone 17 pro max', 'gold rate today', 'bigg boss 19',
+                             'weather tomorrow']
+    assert [trend['search_volume_numeric'] for trend in trends] == [200000, 50000, 20000, 5000, 2000]
+    assert [trend['rank'] for trend in trends] == [1, 2, 3, 4, 5]
+
+
+def test_scrape_slices_fetches_each_region_once():
+    fetched = []
+
+    def fetch(geo=None):
+        fetched.append(geo)
+        return read_fixture()
+
+    source = trends_check.RssTrendsSource(fetch=fetch)
+    results = source.scrape_slices([('IN', 4), ('IN', 24)])
+
+    assert fetched == ['IN']
+    assert [(geo, hours) for geo, hours, _ in results] == [('IN', 4), ('IN', 24)]
+
+
+def test_fetch_trends_replays_fixture_file():
+    source, trends = trends_check.fetch_trends(fixture=FIXTURE_PATH)
+
+    assert isinstance(source, trends_check.RssTrendsSource)
+    assert len(trends) == 5
+
+
+def failing_rss_source(**kwargs):
+    return RSS_SOURCE(fetch=failing_fetch, **kwargs)
+
+
+class StubSeleniumScraper(trends_check.TrendsSource):
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+    def scrape_trends(self, geo=None, hours=None):
+        return [{"rank": 1, "trend_name": 'from selenium', "search_volume": '1000+', "active_status": "Active"}]
+
+
+def test_auto_backend_falls_back_to_selenium_when_rss_fails(monkeypatch):
+    monkeypatch.setattr(trends_check, 'RssTrendsSource', failing_rss_source)
+    monkeypatch.setattr(trends_check, 'GoogleTrendsScraper', StubSeleniumScraper)
+
+    source, trends = trends_check.fetch_trends(backend='auto')
+
+    assert isinstance(source, StubSeleniumScraper)
+    assert names(trends) == ['from selenium']
+
+
+def test_rss_backend_does_not_fall_back(monkeypatch):
+    monkeypatch.setattr(trends_check, 'RssTrendsSource', failing_rss_source)
+    monkeypatch.setattr(trends_check, 'GoogleTrendsScraper', StubSeleniumScraper)
+
+    source, trends = trends_check.fetch_trends(backend='rss')
+
+    assert not isinstance(source, StubSeleniumScraper)
+    assert trends == []